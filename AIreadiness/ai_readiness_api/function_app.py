@@ -5,39 +5,50 @@ import os
 import azure.functions as func
 from azure.kusto.data import KustoClient, KustoConnectionStringBuilder
 
+from kusto_pool import KustoClientPool
+from token_cache import token_provider
+
 # ---------------- ADX CONFIG ----------------
 
 ADX_CLUSTER = os.getenv("ADX_CLUSTER", "https://aix-dts.eastus2.kusto.windows.net")
 ADX_DB = os.getenv("ADX_DB", "aixdb")
+ADX_SCOPE = "https://kusto.kusto.windows.net/.default"
 
 
 app = func.FunctionApp(http_auth_level=func.AuthLevel.ANONYMOUS)
 
 
-def get_kusto_client() -> KustoClient:
+def _build_kusto_client(cluster_uri: str) -> KustoClient:
     """
-    Build a KustoClient using Azure CLI authentication.
-    Make sure you've run `az login` in this shell.
+    Build a KustoClient using the shared cached token (see token_cache.py).
+    DefaultAzureCredential falls back to your `az login` session when running locally.
     """
-    kcsb = KustoConnectionStringBuilder.with_az_cli_authentication(ADX_CLUSTER)
+    kcsb = KustoConnectionStringBuilder.with_token_provider(
+        cluster_uri, token_provider(ADX_SCOPE)
+    )
     return KustoClient(kcsb)
 
 
+# Built on first use, then shared by every request on this worker (see kusto_pool.py).
+_kusto_pool = KustoClientPool(_build_kusto_client)
+
+
+def get_kusto_client() -> KustoClient:
+    return _kusto_pool.get(ADX_CLUSTER)
+
+
 @app.route(route="ai_readiness_latest", methods=["GET"])
 def ai_readiness_latest(req: func.HttpRequest) -> func.HttpResponse:
     logging.info("ai_readiness_latest HTTP trigger called")
 
     query = """
     ai_readiness_scores
-    | summarize arg_max(timestamp, *) by customer, participant_name
+    | top 1 by timestamp desc, ingestion_time() desc
     | project timestamp, customer, participant_name, total_105, percent, level, maturity
-    | order by timestamp desc
-    | take 1
     """
 
     try:
-        client = get_kusto_client()
-        response = client.execute(ADX_DB, query)
+        response = _kusto_pool.execute(ADX_CLUSTER, ADX_DB, query)
 
         # primary_results is a LIST of tables – take the first one
         table = response.primary_results[0]
@@ -0,0 +1,119 @@
+# kusto_pool.py — lazily built, thread-safe KustoClient cache keyed by cluster URI
+# KustoClient is thread-safe and keeps its own HTTP session, so one client per cluster is shared
+# by every worker thread. A client is thrown away and rebuilt after an auth or connection failure.
+#
+# The same file is deployed with AIreadiness/ai_readiness_api; keep the copies identical
+# (scoring_orchestrator/tests/test_shared_copies.py checks them).
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# factory(cluster_uri) -> KustoClient
+ClientFactory = Callable[[str], Any]
+
+_REBUILD_STATUS = (401, 403)
+_REBUILD_ERROR_NAMES = (
+    "KustoAuthenticationError",
+    "KustoClientInvalidConnectionStringException",
+    "ConnectionError",          # requests / builtin
+    "ConnectTimeout",
+    "ChunkedEncodingError",
+    "ProtocolError",
+)
+
+
+def _needs_rebuild(ex: BaseException) -> bool:
+    """Auth and transport failures poison a client; query/semantic errors don't."""
+    for cls in type(ex).__mro__:
+        if cls.__name__ in _REBUILD_ERROR_NAMES:
+            return True
+    http_response = getattr(ex, "http_response", None)
+    status = getattr(http_response, "status_code", None)
+    return status in _REBUILD_STATUS
+
+
+class KustoClientPool:
+    def __init__(self, factory: ClientFactory):
+        self._factory = factory
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._stats = {"builds": 0, "hits": 0, "rebuilds": 0}
+
+    def get(self, cluster_uri: str) -> Any:
+        client = self._clients.get(cluster_uri)
+        if client is not None:
+            with self._lock:
+                self._stats["hits"] += 1
+            return client
+        with self._lock:
+            client = self._clients.get(cluster_uri)
+            if client is None:
+                client = self._factory(cluster_uri)
+                self._clients[cluster_uri] = client
+                self._stats["builds"] += 1
+            else:
+                self._stats["hits"] += 1
+            return client
+
+    def invalidate(self, cluster_uri: str, client: Optional[Any] = None) -> None:
+        """Drop the cached client (only if it is still `client`, when given)."""
+        with self._lock:
+            current = self._clients.get(cluster_uri)
+            if current is None or (client is not None and current is not client):
+                return
+            del self._clients[cluster_uri]
+            self._stats["rebuilds"] += 1
+        close = getattr(current, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                logging.debug("KustoClient close failed", exc_info=True)
+
+    def execute(self, cluster_uri: str, database: str, query: str, properties: Any = None) -> Any:
+        """Run a query on the pooled client; rebuild and retry once if the client went bad."""
+        client = self.get(cluster_uri)
+        try:
+            return client.execute_query(database, query, properties=properties)
+        except Exception as ex:
+            if not _needs_rebuild(ex):
+                raise
+            logging.warning("Rebuilding KustoClient for %s after %s", cluster_uri, type(ex).__name__)
+            self.invalidate(cluster_uri, client)
+        return self.get(cluster_uri).execute_query(database, query, properties=properties)
+
+    def execute_mgmt(self, cluster_uri: str, database: str, command: str, properties: Any = None) -> Any:
+        """Run a management (.show ...) command on the pooled client; same rebuild-once rule."""
+        client = self.get(cluster_uri)
+        try:
+            return client.execute_mgmt(database, command, properties=properties)
+        except Exception as ex:
+            if not _needs_rebuild(ex):
+                raise
+            logging.warning("Rebuilding KustoClient for %s after %s", cluster_uri, type(ex).__name__)
+            self.invalidate(cluster_uri, client)
+        return self.get(cluster_uri).execute_mgmt(database, command, properties=properties)
+
+    def execute_streaming(self, cluster_uri: str, database: str, query: str, properties: Any = None) -> Any:
+        """Open a streaming query (rows are parsed as they arrive) on the pooled client.
+
+        Only opening the stream is retried after a rebuild; a failure while iterating rows is the
+        caller's, since some rows may already have been consumed. properties goes by keyword: the
+        SDK's third positional parameter here is `timeout`.
+        """
+        client = self.get(cluster_uri)
+        try:
+            return client.execute_streaming_query(database, query, properties=properties)
+        except Exception as ex:
+            if not _needs_rebuild(ex):
+                raise
+            logging.warning("Rebuilding KustoClient for %s after %s", cluster_uri, type(ex).__name__)
+            self.invalidate(cluster_uri, client)
+        return self.get(cluster_uri).execute_streaming_query(database, query, properties=properties)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["clusters"] = list(self._clients)
+        return out
@@ -3,9 +3,10 @@ import os
 import json
 
 import azure.functions as func
-from azure.identity import DefaultAzureCredential
 from azure.kusto.data import KustoClient, KustoConnectionStringBuilder
 
+from .token_cache import token_provider
+
 # Configure these via local.settings.json or env vars if you want
 ADX_CLUSTER = os.environ.get("ADX_CLUSTER", "https://aix-dts.eastus2.kusto.windows.net")
 ADX_DB = os.environ.get("ADX_DB", "aixdb")
@@ -14,11 +15,10 @@ ADX_SCOPE = "https://kusto.kusto.windows.net/.default"
 
 def get_kusto_client() -> KustoClient:
     # Uses your local Azure login (Azure CLI / VS Code) when running locally,
-    # and Managed Identity when deployed.
-    credential = DefaultAzureCredential(exclude_interactive_browser_credential=False)
-    token = credential.get_token(ADX_SCOPE).token
-    kcsb = KustoConnectionStringBuilder.with_aad_token_authorization(
-        ADX_CLUSTER, token
+    # and Managed Identity when deployed. The credential and token are cached per
+    # process and refreshed before expiry (see token_cache.py).
+    kcsb = KustoConnectionStringBuilder.with_token_provider(
+        ADX_CLUSTER, token_provider(ADX_SCOPE)
     )
     return KustoClient(kcsb)
 
@@ -31,10 +31,8 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
 
         query = """
         ai_readiness_scores
-        | summarize arg_max(timestamp, *) by customer, participant_name
+        | top 1 by timestamp desc, ingestion_time() desc
         | project timestamp, customer, participant_name, total_105, percent, level, maturity
-        | order by timestamp desc
-        | take 1
         """
 
         result = client.execute(ADX_DB, query)
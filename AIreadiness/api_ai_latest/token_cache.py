@@ -0,0 +1,185 @@
+# token_cache.py — process-wide AAD token cache for the ADX function apps
+# One DefaultAzureCredential per process, one cached token per scope. Tokens are refreshed by a
+# background thread TOKEN_REFRESH_MARGIN_S before they expire, and concurrent callers that find
+# no usable token share a single fetch (single-flight) instead of hitting AAD in parallel.
+#
+# The same file is deployed with AIreadiness/ai_readiness_api and AIreadiness/api_ai_latest;
+# keep the copies identical (scoring_orchestrator/tests/test_shared_copies.py checks them).
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# ---------------- Config ----------------
+TOKEN_REFRESH_MARGIN_S = float(os.environ.get("TOKEN_REFRESH_MARGIN_S", "300"))  # refresh this early
+TOKEN_MIN_VALIDITY_S   = float(os.environ.get("TOKEN_MIN_VALIDITY_S", "30"))     # never hand out tokens closer to expiry
+TOKEN_RETRY_BACKOFF_S  = float(os.environ.get("TOKEN_RETRY_BACKOFF_S", "15"))    # after a failed background refresh
+
+
+def _default_credential() -> Any:
+    # Imported here so apps that never need a token (ping, cache reads) don't load azure.identity.
+    from azure.identity import DefaultAzureCredential
+
+    return DefaultAzureCredential()
+
+
+class _Entry:
+    __slots__ = ("token", "expires_on", "lock", "next_attempt")
+
+    def __init__(self):
+        self.token: Optional[str] = None
+        self.expires_on = 0.0
+        self.lock = threading.Lock()  # held by whoever is fetching this scope
+        self.next_attempt = 0.0
+
+
+class TokenManager:
+    def __init__(
+        self,
+        credential_factory: Callable[[], Any] = _default_credential,
+        refresh_margin_s: float = TOKEN_REFRESH_MARGIN_S,
+        min_validity_s: float = TOKEN_MIN_VALIDITY_S,
+    ):
+        self._credential_factory = credential_factory
+        self._credential: Any = None
+        self._cred_lock = threading.Lock()
+        self.refresh_margin_s = refresh_margin_s
+        self.min_validity_s = min_validity_s
+
+        self._entries: Dict[str, _Entry] = {}
+        self._entries_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "fetches": 0,
+            "coalesced": 0,
+            "background_refreshes": 0,
+            "failures": 0,
+        }
+
+    # ---------------- Public API ----------------
+    def get_token(self, scope: str) -> str:
+        e = self._entry(scope)
+        if self._usable(e):
+            self._count("hits")
+            return e.token  # type: ignore[return-value]
+
+        # Single-flight: the first caller fetches, the rest block on the lock and reuse its result.
+        with e.lock:
+            if self._usable(e):
+                self._count("coalesced")
+                return e.token  # type: ignore[return-value]
+            self._fetch(scope, e)
+        self._ensure_refresher()
+        return e.token  # type: ignore[return-value]
+
+    def provider(self, scope: str) -> Callable[[], str]:
+        """Zero-arg callable suitable for KustoConnectionStringBuilder.with_token_provider."""
+        return lambda: self.get_token(scope)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            out: Dict[str, Any] = dict(self._stats)
+        now = time.time()
+        with self._entries_lock:
+            out["scopes"] = {
+                scope: {"expires_in_s": round(e.expires_on - now, 1) if e.token else None}
+                for scope, e in self._entries.items()
+            }
+        return out
+
+    # ---------------- Internals ----------------
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _entry(self, scope: str) -> _Entry:
+        e = self._entries.get(scope)
+        if e is None:
+            with self._entries_lock:
+                e = self._entries.setdefault(scope, _Entry())
+        return e
+
+    def _usable(self, e: _Entry) -> bool:
+        return e.token is not None and time.time() < e.expires_on - self.min_validity_s
+
+    def _get_credential(self) -> Any:
+        if self._credential is None:
+            with self._cred_lock:
+                if self._credential is None:
+                    self._credential = self._credential_factory()
+        return self._credential
+
+    def _fetch(self, scope: str, e: _Entry) -> None:
+        """Caller must hold e.lock."""
+        try:
+            tok = self._get_credential().get_token(scope)
+        except Exception:
+            self._count("failures")
+            raise
+        e.token = tok.token
+        e.expires_on = float(tok.expires_on)
+        e.next_attempt = 0.0
+        self._count("fetches")
+        self._wake.set()
+
+    # ---------------- Background refresher ----------------
+    def _ensure_refresher(self) -> None:
+        if self._thread is None:
+            with self._cred_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._refresh_loop, name="aad-token-refresher", daemon=True
+                    )
+                    self._thread.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            now = time.time()
+            with self._entries_lock:
+                items = list(self._entries.items())
+            next_due = now + 3600.0
+            for scope, e in items:
+                if e.token is None:
+                    continue
+                due = max(e.expires_on - self.refresh_margin_s, e.next_attempt)
+                if due > now:
+                    next_due = min(next_due, due)
+                    continue
+                # Skip if a foreground caller is already fetching this scope.
+                if not e.lock.acquire(blocking=False):
+                    continue
+                try:
+                    self._fetch(scope, e)
+                    self._count("background_refreshes")
+                except Exception:
+                    logging.warning("Background token refresh failed for %s", scope, exc_info=True)
+                    e.next_attempt = time.time() + TOKEN_RETRY_BACKOFF_S
+                    next_due = min(next_due, e.next_attempt)
+                finally:
+                    e.lock.release()
+                if e.token is not None:
+                    next_due = min(next_due, e.expires_on - self.refresh_margin_s)
+            self._wake.clear()
+            self._wake.wait(max(1.0, next_due - time.time()))
+
+
+# ---------------- Process-wide instance ----------------
+_manager = TokenManager()
+
+
+def get_token(scope: str) -> str:
+    return _manager.get_token(scope)
+
+
+def token_provider(scope: str) -> Callable[[], str]:
+    return _manager.provider(scope)
+
+
+def stats() -> Dict[str, Any]:
+    return _manager.stats()
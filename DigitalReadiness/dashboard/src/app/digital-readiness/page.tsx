@@ -2,7 +2,10 @@
 
 import { useEffect, useState } from "react";
 import { useSearchParams } from "next/navigation";
-import { fetchDigitalReadiness } from "@/lib/fetchDigitalReadiness";
+import {
+  digitalReadinessEventsUrl,
+  fetchDigitalReadiness,
+} from "@/lib/fetchDigitalReadiness";
 
 type DigitalReadinessData = {
   score: number;          // raw 0–140
@@ -42,6 +45,7 @@ export default function DigitalReadinessPage() {
   useEffect(() => {
     let cancelled = false;
     let intervalId: ReturnType<typeof setInterval> | null = null;
+    let events: EventSource | null = null;
     let firstLoad = true;
 
     async function loadOnce() {
@@ -55,7 +59,10 @@ export default function DigitalReadinessPage() {
         // them as "no filter" (return latest overall).
         const res = await fetchDigitalReadiness(customerFilter, participantFilter);
         if (!cancelled) {
-          setData(res);
+          // Most polls revalidate to the same record; keep the old object so nothing re-renders.
+          setData((prev) =>
+            prev && JSON.stringify(prev) === JSON.stringify(res) ? prev : res
+          );
           setError(null);
         }
       } catch (e: any) {
@@ -73,11 +80,32 @@ export default function DigitalReadinessPage() {
     // initial fetch
     loadOnce();
 
-    // poll every 30 seconds for live updates
-    intervalId = setInterval(loadOnce, 30_000);
+    // Live updates are pushed over SSE; EventSource reconnects (with Last-Event-ID) after each
+    // held response on its own. If the stream can't be opened at all, poll every 30 seconds.
+    if (typeof EventSource !== "undefined") {
+      events = new EventSource(digitalReadinessEventsUrl(customerFilter, participantFilter));
+      events.addEventListener("score", (ev) => {
+        if (cancelled) return;
+        const { participant, ...rest } = JSON.parse((ev as MessageEvent).data);
+        setData({ ...rest, participant_name: participant });
+        setError(null);
+      });
+      events.addEventListener("reset", () => {
+        loadOnce();
+      });
+      events.onerror = () => {
+        if (!cancelled && events?.readyState === EventSource.CLOSED && !intervalId) {
+          events = null;
+          intervalId = setInterval(loadOnce, 30_000);
+        }
+      };
+    } else {
+      intervalId = setInterval(loadOnce, 30_000);
+    }
 
     return () => {
       cancelled = true;
+      if (events) events.close();
       if (intervalId) clearInterval(intervalId);
     };
   }, [customerFilter, participantFilter]);
@@ -212,7 +240,7 @@ export default function DigitalReadinessPage() {
         )}
         {!loading && !error && (
           <p className="mt-2 text-[10px] text-slate-400">
-            Live: auto-refreshing every 30 seconds
+            Live: updates as new scores arrive
             {displayCustomer !== "—" && ` (showing latest for ${displayCustomer} / ${displayParticipant})`}.
           </p>
         )}
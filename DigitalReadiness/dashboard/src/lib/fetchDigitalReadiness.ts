@@ -21,8 +21,10 @@ export async function fetchDigitalReadiness(
 
   const url = `${API_BASE}/digital_readiness_latest_live?${params.toString()}`;
 
+  // "no-cache": the browser keeps the last body and revalidates it with If-None-Match on every
+  // poll; an unchanged score comes back as a bodiless 304 that fetch() surfaces as the cached 200.
   const res = await fetch(url, {
-    cache: "no-store",
+    cache: "no-cache",
   });
 
   if (!res.ok) {
@@ -32,3 +34,13 @@ export async function fetchDigitalReadiness(
   return res.json();
 }
 
+
+// Server-sent events for accepted Digital Readiness rows matching the filters. Each "score" event
+// carries the same fields as the latest_live payload plus customer / participant; a "reset" event
+// means updates may have been missed and the latest record should be refetched.
+export function digitalReadinessEventsUrl(customer: string, participant: string): string {
+  const params = new URLSearchParams();
+  if (customer) params.set("customer", customer);
+  if (participant) params.set("participant", participant);
+  return `${API_BASE}/events/digital_readiness?${params.toString()}`;
+}
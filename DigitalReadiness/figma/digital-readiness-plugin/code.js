@@ -17,6 +17,16 @@ figma.showUI(__html__, { width: 420, height: 430 });
 
 var liveTimer = null;
 
+// Live mode long-polls /api/events/digital_readiness: the request is held until a matching row
+// is accepted, so updates land within a second and an idle plugin costs no ADX queries. Bumping
+// liveSession stops the running loop. Backends without the events route fall back to polling.
+var liveSession = 0;
+var LIVE_POLL_MS = 30000;
+
+// Last response per URL, so live polling can revalidate with If-None-Match and reuse the body
+// on 304 Not Modified instead of downloading it again.
+var lastResponses = {};
+
 function safeNumber(value, fallback) {
   return (value === null || value === undefined || isNaN(Number(value)))
     ? fallback
@@ -31,11 +41,23 @@ async function fetchDigitalReadiness(apiBase, customer, participant) {
     "?customer=" + encodeURIComponent(customer) +
     "&participant=" + encodeURIComponent(participant);
 
-  var res = await fetch(url);
+  var cached = lastResponses[url];
+  var headers = {};
+  if (cached && cached.etag) {
+    headers["If-None-Match"] = cached.etag;
+  }
+
+  var res = await fetch(url, { headers: headers });
+  if (res.status === 304 && cached) {
+    return cached.data;
+  }
   if (!res.ok) {
     throw new Error("HTTP " + res.status + " from digital_readiness_latest_live");
   }
-  return await res.json();
+  var data = await res.json();
+  var etag = res.headers.get("ETag");
+  lastResponses[url] = etag ? { etag: etag, data: data } : undefined;
+  return data;
 }
 
 function findTextByName(node, name) {
@@ -86,7 +108,7 @@ async function updateFrameFromData(frame, data) {
   if (updatedNode) updatedNode.characters = updatedText;
 }
 
-async function runOnce(apiBase, customer, participant) {
+function selectedFrame() {
   if (figma.currentPage.selection.length !== 1) {
     throw new Error("Select exactly one frame that contains the Digital* text layers.");
   }
@@ -100,11 +122,74 @@ async function runOnce(apiBase, customer, participant) {
   ) {
     throw new Error("Selection must be a frame / group / component.");
   }
+  return node;
+}
 
+async function runOnce(apiBase, customer, participant) {
+  var node = selectedFrame();
   var data = await fetchDigitalReadiness(apiBase, customer, participant);
   await updateFrameFromData(node, data);
 }
 
+function sleep(ms) {
+  return new Promise(function (resolve) { setTimeout(resolve, ms); });
+}
+
+function reportLiveError(err) {
+  figma.ui.postMessage({
+    type: "status",
+    text: "Live refresh failed: " + err.message,
+    error: true,
+    live: true
+  });
+}
+
+function startPolling(apiBase, customer, participant) {
+  liveTimer = setInterval(function () {
+    runOnce(apiBase, customer, participant).catch(reportLiveError);
+  }, LIVE_POLL_MS);
+}
+
+async function liveLoop(session, apiBase, customer, participant) {
+  var base = apiBase.replace(/\/+$/, "");
+  var lastEventId = "";
+  var failures = 0;
+
+  while (session === liveSession) {
+    var url =
+      base +
+      "/api/events/digital_readiness" +
+      "?customer=" + encodeURIComponent(customer) +
+      "&participant=" + encodeURIComponent(participant) +
+      "&last_event_id=" + encodeURIComponent(lastEventId);
+    try {
+      var res = await fetch(url);
+      if (session !== liveSession) return;
+      if (res.status === 404) {
+        startPolling(apiBase, customer, participant);
+        return;
+      }
+      if (!res.ok) {
+        throw new Error("HTTP " + res.status + " from events");
+      }
+      var body = await res.json();
+      failures = 0;
+      lastEventId = body.last_event_id || "";
+      if (body.reset) {
+        // Updates may have been missed (server restart / other instance): refetch once.
+        await runOnce(apiBase, customer, participant);
+      } else if (body.events && body.events.length) {
+        await updateFrameFromData(selectedFrame(), body.events[body.events.length - 1]);
+      }
+    } catch (err) {
+      if (session !== liveSession) return;
+      reportLiveError(err);
+      failures += 1;
+      await sleep(Math.min(LIVE_POLL_MS, 1000 * Math.pow(2, failures)));
+    }
+  }
+}
+
 // Listen to UI
 figma.ui.onmessage = async function (msg) {
   if (msg.type === "apply-digital-readiness") {
@@ -113,7 +198,8 @@ figma.ui.onmessage = async function (msg) {
     var apiBase = msg.apiBase;
     var live = !!msg.live;
 
-    // Clear existing timer if any
+    // Stop any running live loop / fallback timer
+    liveSession += 1;
     if (liveTimer) {
       clearInterval(liveTimer);
       liveTimer = null;
@@ -122,24 +208,15 @@ figma.ui.onmessage = async function (msg) {
     try {
       await runOnce(apiBase, customer, participant);
 
-      // Live auto-refresh every 30 seconds while plugin is open
+      // Live updates pushed by the backend while plugin is open
       if (live) {
-        liveTimer = setInterval(function () {
-          runOnce(apiBase, customer, participant).catch(function (err) {
-            figma.ui.postMessage({
-              type: "status",
-              text: "Live refresh failed: " + err.message,
-              error: true,
-              live: true
-            });
-          });
-        }, 30000); // 30 seconds
+        liveLoop(liveSession, apiBase, customer, participant);
       }
 
       figma.ui.postMessage({
         type: "status",
         text: live
-          ? "Fetched successfully – live auto-refresh is ON (30s)."
+          ? "Fetched successfully – live updates are ON."
           : "Fetched successfully ✔",
         error: false,
         live: live
@@ -157,6 +234,7 @@ figma.ui.onmessage = async function (msg) {
 
 // Clean up timer when plugin window closes
 figma.on("close", function () {
+  liveSession += 1;
   if (liveTimer) clearInterval(liveTimer);
 });
 
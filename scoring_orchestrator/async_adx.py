@@ -0,0 +1,145 @@
+# async_adx.py — async HTTP/2 transport to the ADX ingest and data endpoints
+# Used by the *_async routes: one httpx.AsyncClient per event loop multiplexes many in-flight
+# ingest POSTs / REST queries over a few HTTP/2 connections, and blocking SDK work (AAD token
+# fetches) runs on a small bounded executor instead of the event loop.
+
+import asyncio
+import functools
+import importlib.util
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+import json_codec
+
+if TYPE_CHECKING:
+    import httpx
+
+# ---------------- Config ----------------
+ASYNC_HTTP2               = os.environ.get("ASYNC_HTTP2", "1") != "0"
+ASYNC_MAX_CONNECTIONS     = int(os.environ.get("ASYNC_MAX_CONNECTIONS", "20"))
+ASYNC_CONNECT_TIMEOUT     = float(os.environ.get("ASYNC_CONNECT_TIMEOUT", "3.05"))
+ASYNC_READ_TIMEOUT        = float(os.environ.get("ASYNC_READ_TIMEOUT", "30"))
+ASYNC_BLOCKING_WORKERS    = int(os.environ.get("ASYNC_BLOCKING_WORKERS", "8"))
+
+
+class AdxHttpError(Exception):
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"ADX returned {status_code}: {text[:500]}")
+        self.status_code = status_code
+        self.text = text
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None  # looked up, not imported
+
+
+# ---------------- Bounded executor for blocking calls ----------------
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=ASYNC_BLOCKING_WORKERS, thread_name_prefix="adx-blocking"
+                )
+    return _executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(fn, *args))
+
+
+# ---------------- Client (one per event loop) ----------------
+_client: "Optional[httpx.AsyncClient]" = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_stats = {"requests": 0, "errors": 0, "http2_responses": 0}
+
+
+def _get_client() -> "httpx.AsyncClient":
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        import httpx  # first async request only; keeps httpx/h2 off the cold-start path
+
+        http2 = ASYNC_HTTP2 and _http2_available()
+        if ASYNC_HTTP2 and not http2:
+            logging.warning("h2 not installed; async ADX transport falling back to HTTP/1.1")
+        _client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=ASYNC_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(ASYNC_READ_TIMEOUT, connect=ASYNC_CONNECT_TIMEOUT),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def _send(url: str, body: bytes, headers: Dict[str, str]) -> "httpx.Response":
+    _stats["requests"] += 1
+    try:
+        resp = await _get_client().post(url, content=body, headers=headers)
+    except Exception:
+        _stats["errors"] += 1
+        raise
+    if resp.http_version == "HTTP/2":
+        _stats["http2_responses"] += 1
+    return resp
+
+
+async def post(url: str, body: bytes, headers: Dict[str, str]) -> Tuple[int, str]:
+    resp = await _send(url, body, headers)
+    return resp.status_code, resp.text
+
+
+async def query(
+    data_uri: str,
+    database: str,
+    csl: str,
+    token: str,
+    parameters: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, Any]]:
+    """Run a KQL query over the v1 REST endpoint and return the primary table as dicts."""
+    properties = {"Parameters": parameters or {}}
+    body = json_codec.dumps(
+        {"db": database, "csl": csl, "properties": json_codec.dumps(properties).decode("utf-8")}
+    )
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json; charset=utf-8",
+        "Accept": "application/json",
+    }
+    resp = await _send(f"{data_uri}/v1/rest/query", body, headers)
+    if resp.status_code != 200:
+        raise AdxHttpError(resp.status_code, resp.text)
+
+    tables = json_codec.loads(resp.content).get("Tables") or []
+    if not tables:
+        return []
+    primary = tables[0]
+    cols = [c["ColumnName"] for c in primary.get("Columns", [])]
+    return [dict(zip(cols, r)) for r in primary.get("Rows", [])]
+
+
+async def aclose() -> None:
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+def stats() -> Dict[str, Any]:
+    out: Dict[str, Any] = dict(_stats)
+    out["http2_enabled"] = ASYNC_HTTP2 and _http2_available()
+    out["max_connections"] = ASYNC_MAX_CONNECTIONS
+    out["blocking_workers"] = ASYNC_BLOCKING_WORKERS
+    return out
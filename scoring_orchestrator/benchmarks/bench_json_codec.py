@@ -0,0 +1,189 @@
+# bench_json_codec.py — per-request JSON cost of every function_app.py route: old path vs json_codec
+# Usage (from scoring_orchestrator/):  python benchmarks/bench_json_codec.py [iterations]
+#   JSON_CODEC=stdlib python benchmarks/bench_json_codec.py   # measure the fallback backend
+# "old" is what the routes did before json_codec: req.get_json() (decode to str, then json.loads),
+# json.dumps(row) + "\n" then .encode(), json.dumps(payload) for responses, resp.json() for queries.
+# CPU is process time per request; "peak KiB" is the tracemalloc high-water mark of one request.
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_codec  # noqa: E402
+
+
+# ---------------- Payloads ----------------
+def _aix_body() -> Dict[str, Any]:
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(here, "test.json"), "r") as f:
+        return json.load(f)
+
+
+def _flat_body(n_answers: int, total_key: str, total: int) -> Dict[str, Any]:
+    return {
+        "timestamp": "2025-11-06T11:15:00Z",
+        "session_id": "sess-001",
+        "customer": "Contoso",
+        "industry": "Manufacturing",
+        "participant_name": "Alex Morgan",
+        "participant_role": "CTO",
+        "org": "Contoso HQ",
+        "answers": [4] * n_answers,
+        total_key: total,
+        "percent": 80.0,
+        "level": 4,
+        "maturity": "Advanced",
+        "notes": "Demo push from curl",
+    }
+
+
+def _row(body: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(body, received_at_utc="2025-11-06T11:15:01Z")
+
+
+def _query_response(rows: int) -> bytes:
+    cols = ["customer", "participant_name", "timestamp", "total_140", "percent", "level", "maturity"]
+    return json.dumps({
+        "Tables": [{
+            "TableName": "Table_0",
+            "Columns": [{"ColumnName": c, "DataType": "String"} for c in cols],
+            "Rows": [["Contoso", f"p{i}", "2025-11-06T11:15:00Z", 112, 80.0, 4, "Advanced"] for i in range(rows)],
+        }]
+    }).encode("utf-8")
+
+
+def _stats_payload() -> Dict[str, Any]:
+    stage = {"count": 1000, "avg_ms": 0.042, "max_ms": 1.5}
+    return {
+        "transport": {"requests": 1000, "errors": 0, "pool_size": 10},
+        "batcher": {"batches": 120, "rows": 1000, "pending": 0},
+        "pipelines": {
+            t: {"requests": {"sync": 1000}, "status": {"200": 1000},
+                "stages": {s: stage for s in ("parse", "validate", "build", "encode", "ingest", "total")}}
+            for t in ("AIX", "AI_READINESS", "DIGITAL_READINESS")
+        },
+    }
+
+
+def _dead_letters_payload() -> Dict[str, Any]:
+    entry = {"id": 1, "table": "aix_scores_v2", "rows": 1, "attempts": 3, "state": "parked",
+             "last_error": "ADX ingest error: 503", "next_attempt_at": 1730891700.0}
+    return {"entries": [dict(entry, id=i) for i in range(100)], "stats": {"pending": 0, "parked": 100}}
+
+
+# ---------------- Workloads (old, new) per route ----------------
+def _single(body: Dict[str, Any]) -> Tuple[Callable[[], Any], Callable[[], Any]]:
+    raw = json.dumps(body).encode("utf-8")
+
+    def old():
+        parsed = json.loads(raw.decode("utf-8"))
+        return (json.dumps(_row(parsed)) + "\n").encode("utf-8")
+
+    def new():
+        parsed = json_codec.loads(raw)
+        return json_codec.dumps_line(_row(parsed))
+
+    return old, new
+
+
+def _bulk(body: Dict[str, Any], n: int) -> Tuple[Callable[[], Any], Callable[[], Any]]:
+    raw = b"\n".join(json.dumps(dict(body, session_id=f"s{i}")).encode("utf-8") for i in range(n))
+
+    def old():
+        items = [json.loads(line) for line in raw.splitlines() if line.strip()]
+        return b"".join((json.dumps(_row(it)) + "\n").encode("utf-8") for it in items)
+
+    def new():
+        items = [json_codec.loads(line) for line in raw.splitlines() if line.strip()]
+        return b"".join(json_codec.dumps_line(_row(it)) for it in items)
+
+    return old, new
+
+
+def _response(payload: Dict[str, Any]) -> Tuple[Callable[[], Any], Callable[[], Any]]:
+    def old():
+        return json.dumps(payload).encode("utf-8")  # func.HttpResponse encodes str bodies
+
+    def new():
+        return json_codec.dumps(payload)
+
+    return old, new
+
+
+def _query(raw: bytes) -> Tuple[Callable[[], Any], Callable[[], Any]]:
+    def old():
+        tables = json.loads(raw.decode("utf-8"))["Tables"]  # httpx Response.json()
+        return json.dumps({"rows": len(tables[0]["Rows"])}).encode("utf-8")
+
+    def new():
+        tables = json_codec.loads(raw)["Tables"]
+        return json_codec.dumps({"rows": len(tables[0]["Rows"])})
+
+    return old, new
+
+
+def _workloads() -> List[Tuple[str, Tuple[Callable[[], Any], Callable[[], Any]]]]:
+    aix = _aix_body()
+    ai = _flat_body(21, "total_105", 84)
+    digital = _flat_body(28, "total_140", 112)
+    tech = {"score": 420, "max": 500, "level": "Leading", "timestamp": "2025-11-06T11:15:00Z"}
+    dial = {"score": 112, "max": 140, "percent": 80.0, "level": 4, "maturity": "Advanced",
+            "timestamp": "2025-11-06T11:15:00Z"}
+    return [
+        ("score_and_push[_async]", _single(aix)),
+        ("ai_readiness_score_and_push", _single(ai)),
+        ("digital_readiness_score_and_push", _single(digital)),
+        ("*_bulk (1000 NDJSON rows)", _bulk(digital, 1000)),
+        ("tech_health_latest_live", _response(tech)),
+        ("digital_readiness_latest_live", _response(dial)),
+        ("*_latest_live_async (1 row query)", _query(_query_response(1))),
+        ("*_latest_live_async (500 rows)", _query(_query_response(500))),
+        ("ingest_stats", _response(_stats_payload())),
+        ("dead_letters (100 entries)", _response(_dead_letters_payload())),
+    ]
+
+
+def _cpu_us(fn: Callable[[], Any], iterations: int) -> float:
+    best = float("inf")
+    for _ in range(3):
+        started = time.process_time()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.process_time() - started) / iterations * 1e6)
+    return best
+
+
+def _peak_kib(fn: Callable[[], Any]) -> float:
+    fn()  # warm caches outside the trace
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return (peak - base) / 1024.0
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"json_codec backend: {json_codec.BACKEND}")
+    print(f"{'route':<36}{'old us':>10}{'new us':>10}{'speedup':>9}{'old KiB':>10}{'new KiB':>10}")
+    for name, (old, new) in _workloads():
+        big = "bulk" in name or "500" in name
+        if "bulk" not in name:
+            assert json.loads(old()) == json.loads(new())  # same document, only the encoding path differs
+        n = max(1, iterations // 100) if big else iterations
+        old_us, new_us = _cpu_us(old, n), _cpu_us(new, n)
+        print(
+            f"{name:<36}{old_us:>10.1f}{new_us:>10.1f}{old_us / new_us:>8.2f}x"
+            f"{_peak_kib(old):>10.1f}{_peak_kib(new):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
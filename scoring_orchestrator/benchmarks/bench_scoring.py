@@ -0,0 +1,49 @@
+# bench_scoring.py — scoring.py: per-row Python scoring vs one vectorised NumPy batch
+# Usage (from scoring_orchestrator/, with numpy installed):  python benchmarks/bench_scoring.py [rows]
+# Checks that both paths agree row for row, then prints rows/s for each track.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scoring  # noqa: E402
+
+
+def _rate(fn, rows: int) -> float:
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return rows / best
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(7)
+    print(f"{'track':<20}{'loop rows/s':>14}{'batch rows/s':>14}{'speedup':>9}")
+    for track in scoring.TRACKS.values():
+        answers = [[rng.randint(track.answer_min, track.answer_max) for _ in range(track.answers)]
+                   for _ in range(rows)]
+        loop = [scoring.score_answers(track, a) for a in answers]
+        batch = scoring.score_batch(track, answers)
+        assert [s.total for s in loop] == batch["total"].tolist()
+        assert [s.level for s in loop] == batch["level"].tolist()
+        assert [s.maturity for s in loop] == batch["maturity"].tolist()
+        loop_rate = _rate(lambda: [scoring.score_answers(track, a) for a in answers], rows)
+        batch_rate = _rate(lambda: scoring.score_batch(track, answers), rows)
+        print(f"{track.name:<20}{loop_rate:>14,.0f}{batch_rate:>14,.0f}{batch_rate / loop_rate:>8.1f}x")
+
+    domains = [[{"score": rng.uniform(0, 5)} for _ in range(rng.randint(3, 8))] for _ in range(rows)]
+    flat = [[d["score"] for d in ds] for ds in domains]
+    assert [scoring.score_aix(ds) for ds in domains] == scoring.score_aix_batch(flat)["overall_score_500"].tolist()
+    loop_rate = _rate(lambda: [scoring.score_aix(ds) for ds in domains], rows)
+    batch_rate = _rate(lambda: scoring.score_aix_batch(flat), rows)
+    print(f"{'AIX':<20}{loop_rate:>14,.0f}{batch_rate:>14,.0f}{batch_rate / loop_rate:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# bench_startup.py — cold-start cost of function_app.py: import time, first request per route,
+# and which heavy modules each step pulls in.
+# Usage (from scoring_orchestrator/, with requirements.txt installed):
+#   python benchmarks/bench_startup.py                 # KUSTO_* unset: no network, dev responses
+#   python benchmarks/bench_startup.py --keep-env      # use the current KUSTO_* / credentials
+#   python benchmarks/bench_startup.py --importtime    # also print the top -X importtime entries
+# Every measurement runs in a fresh interpreter, so each route really is the first request.
+
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules worth reporting when they show up in sys.modules.
+HEAVY_PREFIXES = (
+    "azure.kusto",
+    "azure.identity",
+    "msal",
+    "requests",
+    "urllib3",
+    "httpx",
+    "h2",
+    "orjson",
+    "sqlite3",
+)
+
+# (function name, method, body); bodies are only sent to POST routes.
+ROUTES = [
+    ("ping", "GET", None),
+    ("tech_health_latest", "GET", None),
+    ("ingest_stats", "GET", None),
+    ("health", "GET", None),
+    ("tech_health_latest_live", "GET", None),
+    ("score_and_push", "POST", "test.json"),
+]
+
+_CHILD = r'''
+import json, os, sys, time
+sys.path.insert(0, {here!r})
+os.chdir({here!r})
+HEAVY = {heavy!r}
+
+def heavy():
+    return sorted(m for m in list(sys.modules) if any(m == p or m.startswith(p + ".") for p in HEAVY))
+
+t0 = time.perf_counter()
+import function_app
+import_ms = (time.perf_counter() - t0) * 1000
+after_import = set(heavy())
+out = {{"import_ms": import_ms, "modules": len(sys.modules), "heavy": sorted(after_import)}}
+
+route = {route!r}
+if route:
+    import azure.functions as func
+    handler = None
+    for f in function_app.app.get_functions():
+        if f.get_function_name() == route:
+            handler = f.get_user_function()
+    body = b""
+    if {body!r}:
+        with open({body!r}, "rb") as fh:
+            body = fh.read()
+    req = func.HttpRequest(method={method!r}, url="/api/" + route, headers={{}}, params={{}},
+                           route_params={{}}, body=body)
+    t0 = time.perf_counter()
+    try:
+        resp = handler(req)
+        status = resp.status_code
+    except Exception as e:
+        status = "error: %s" % e
+    out["route_ms"] = (time.perf_counter() - t0) * 1000
+    out["status"] = status
+    out["route_heavy"] = sorted(set(heavy()) - after_import)
+print("BENCH " + json.dumps(out))
+'''
+
+
+def _run_child(route: str = "", method: str = "GET", body: str = "", keep_env: bool = False) -> Dict[str, Any]:
+    env = dict(os.environ)
+    if not keep_env:
+        for k in ("KUSTO_INGEST_URI", "KUSTO_DATA_URI"):
+            env.pop(k, None)
+    code = _CHILD.format(here=HERE, heavy=HEAVY_PREFIXES, route=route, method=method, body=body or "")
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, cwd=HERE)
+    for line in proc.stdout.splitlines():
+        if line.startswith("BENCH "):
+            return json.loads(line[6:])
+    raise RuntimeError(f"child failed for {route or 'import'}:\n{proc.stderr[-2000:]}")
+
+
+def _importtime(top: int = 15) -> List[str]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import function_app"],
+        capture_output=True, text=True, cwd=HERE,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    rows.sort(reverse=True)
+    return [f"{us / 1000:8.1f} ms  {name}" for us, name in rows[:top]]
+
+
+def main() -> None:
+    keep_env = "--keep-env" in sys.argv
+    runs = [_run_child(keep_env=keep_env) for _ in range(5)]
+    best = min(runs, key=lambda r: r["import_ms"])
+    print(f"import function_app: best {best['import_ms']:.1f} ms of {len(runs)} "
+          f"(median {sorted(r['import_ms'] for r in runs)[len(runs) // 2]:.1f} ms), "
+          f"{best['modules']} modules")
+    print(f"  heavy modules at import: {', '.join(best['heavy']) or 'none'}")
+    print()
+    print(f"{'first request':<28}{'status':>8}{'ms':>10}  heavy modules loaded by the request")
+    for route, method, body in ROUTES:
+        r = _run_child(route, method, body or "", keep_env)
+        loaded = ", ".join(r["route_heavy"]) or "-"
+        print(f"{route:<28}{str(r['status']):>8}{r['route_ms']:>10.1f}  {loaded}")
+    if "--importtime" in sys.argv:
+        print()
+        print("slowest imports (cumulative):")
+        for line in _importtime():
+            print("  " + line)
+
+
+if __name__ == "__main__":
+    main()
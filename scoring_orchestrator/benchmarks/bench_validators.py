@@ -0,0 +1,158 @@
+# bench_validators.py — hand-written validators vs. the schema-compiled ones in schemas.py
+# Usage (from scoring_orchestrator/):  python benchmarks/bench_validators.py [iterations]
+# The legacy functions are the pre-schemas.py copies from function_app.py, kept here as the baseline.
+
+import copy
+import json
+import os
+import sys
+import timeit
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schemas import SchemaRegistry  # noqa: E402
+
+# ---------------- Legacy validators (baseline) ----------------
+def _validate(payload: Dict[str, Any]) -> None:
+    # timestamp is OPTIONAL now (server will enforce)
+    required = [
+        "session_id",
+        "assessment_type",
+        "customer",
+        "industry",
+        "participant_name",
+        "participant_role",
+        "org",
+        "domains",
+        "overall_score_500",
+        "notes",
+    ]
+    missing = [k for k in required if k not in payload]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    if not isinstance(payload["domains"], list):
+        raise ValueError("domains must be an array")
+    for d in payload["domains"]:
+        if not isinstance(d, dict) or "name" not in d or "score" not in d:
+            raise ValueError("each domain must be an object with 'name' and 'score'")
+
+
+def _validate_ai_readiness(body: Dict[str, Any]) -> None:
+    required = [
+        "timestamp",
+        "session_id",
+        "customer",
+        "industry",
+        "participant_name",
+        "participant_role",
+        "org",
+        "answers",
+        "total_105",
+        "percent",
+        "level",
+        "maturity",
+        "notes",
+    ]
+    missing = [k for k in required if k not in body]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    if not isinstance(body["answers"], list):
+        raise ValueError("answers must be an array")
+
+
+def _validate_digital(body: Dict[str, Any]) -> None:
+    required = [
+        "timestamp",
+        "session_id",
+        "customer",
+        "industry",
+        "participant_name",
+        "participant_role",
+        "org",
+        "answers",
+        "total_140",
+        "percent",
+        "level",
+        "maturity",
+        "notes",
+    ]
+    missing = [k for k in required if k not in body]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+
+    answers = body.get("answers")
+    if not isinstance(answers, list):
+        raise ValueError("answers must be an array")
+    if len(answers) != 28:
+        raise ValueError("answers must contain exactly 28 values")
+    for v in answers:
+        if not isinstance(v, int) or v < 1 or v > 5:
+            raise ValueError("each answer must be an integer between 1 and 5")
+
+
+# ---------------- Payloads ----------------
+def _payloads() -> Dict[str, Dict[str, Any]]:
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(here, "test.json"), "r") as f:
+        aix = json.load(f)
+    flat = {
+        "timestamp": "2025-11-06T11:15:00Z",
+        "session_id": "sess-001",
+        "customer": "Contoso",
+        "industry": "Manufacturing",
+        "participant_name": "Alex Morgan",
+        "participant_role": "CTO",
+        "org": "Contoso HQ",
+        "percent": 71.4,
+        "level": 4,
+        "maturity": "Advanced",
+        "notes": "",
+    }
+    ai = dict(flat, answers=[4] * 21, total_105=84)
+    digital = dict(flat, answers=[4] * 28, total_140=112)
+    return {"aix": aix, "ai": ai, "digital": digital}
+
+
+def _invalid(payload: Dict[str, Any]) -> Dict[str, Any]:
+    bad = copy.deepcopy(payload)
+    bad.pop("customer")
+    bad.pop("notes")
+    if "answers" in bad:
+        bad["answers"][-1] = 9
+    return bad
+
+
+def _time(fn, payload, iterations: int) -> float:
+    def call():
+        try:
+            fn(payload)
+        except ValueError:
+            pass
+
+    return min(timeit.repeat(call, number=iterations, repeat=5)) / iterations * 1e9
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    registry = SchemaRegistry()
+    cases = [
+        ("aix", _validate, registry.validator("score_and_push")),
+        ("ai", _validate_ai_readiness, registry.validator("ai_readiness_score_and_push")),
+        ("digital", _validate_digital, registry.validator("digital_readiness_score_and_push")),
+    ]
+    payloads = _payloads()
+    print(f"{'payload':<18}{'legacy ns':>12}{'compiled ns':>14}{'ratio':>8}")
+    for name, legacy, compiled in cases:
+        for label, payload in (("valid", payloads[name]), ("invalid", _invalid(payloads[name]))):
+            old_ns = _time(legacy, payload, iterations)
+            new_ns = _time(compiled, payload, iterations)
+            print(f"{name + ' ' + label:<18}{old_ns:>12.0f}{new_ns:>14.0f}{old_ns / new_ns:>8.2f}")
+        try:
+            compiled(_invalid(payloads[name]))
+        except ValueError as e:
+            print(f"  compiled errors: {e}")
+
+
+if __name__ == "__main__":
+    main()
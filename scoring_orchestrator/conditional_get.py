@@ -0,0 +1,65 @@
+# conditional_get.py — ETag / Last-Modified validators and 304 decisions for the latest-score routes
+# The ETag is strong: a hash of the exact response bytes. Last-Modified is the record's own
+# timestamp, not the time it was served. If-None-Match wins over If-Modified-Since (RFC 9110
+# 13.2.2). Bodies come out of the latest index / store / live cache, so a poll answered with 304
+# never needs an ADX query when the server already has the current record.
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+# Let browsers keep the body but revalidate on every poll (they send If-None-Match themselves).
+CACHE_CONTROL = "no-cache"
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def _parse_timestamp(ts: str) -> Optional[datetime]:
+    if not ts:
+        return None
+    try:
+        dt = datetime.fromisoformat(ts.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def validator_headers(body: bytes, timestamp: str) -> Dict[str, str]:
+    headers = {"ETag": etag_for(body), "Cache-Control": CACHE_CONTROL}
+    modified = _parse_timestamp(timestamp)
+    if modified is not None:
+        headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+    return headers
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires: W/"x" matches "x".
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(request_headers: Mapping[str, str], validators: Mapping[str, str]) -> bool:
+    """True when the client's cached copy (If-None-Match / If-Modified-Since) is still current."""
+    if_none_match = request_headers.get("If-None-Match") or request_headers.get("if-none-match")
+    if if_none_match:
+        return _etag_matches(if_none_match, validators["ETag"])
+    since = request_headers.get("If-Modified-Since") or request_headers.get("if-modified-since")
+    last_modified = validators.get("Last-Modified")
+    if not since or not last_modified:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(since)
+    except (TypeError, ValueError):
+        return False
@@ -0,0 +1,368 @@
+# dead_letter.py — bounded dead-letter store + replay worker for failed ADX ingests
+# Rows whose ingest POST failed are kept (with table, mapping, status and error) in a small SQLite
+# file. A background worker replays them in multi-line batches with exponential backoff + full
+# jitter, honours Retry-After / throttling responses, and parks rows after too many attempts.
+# A batch ADX rejects with a 4xx is split in halves and retried, so one malformed row is parked on
+# its own instead of taking its batch with it.
+# Operators list / requeue / purge entries through the dead_letters route in function_app.py.
+# Rows are keyed by a hash of (table, row): adding a row that is already stored is a no-op, so a
+# row reported failed twice (e.g. by a retried request) is replayed once.
+# The default file is instance-local (/tmp/dead_letter/<WEBSITE_INSTANCE_ID>.db): /home is an SMB
+# share, where SQLite WAL locking is unreliable and every scaled-out instance would replay the same
+# rows. Each instance keeps and replays its own dead letters.
+
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# ---------------- Config ----------------
+DEAD_LETTER_PATH          = os.environ.get(
+    "DEAD_LETTER_PATH",
+    os.path.join("/tmp", "dead_letter", os.environ.get("WEBSITE_INSTANCE_ID", "local") + ".db"),
+)
+DEAD_LETTER_MAX_ROWS      = int(os.environ.get("DEAD_LETTER_MAX_ROWS", "50000"))
+DEAD_LETTER_MAX_ATTEMPTS  = int(os.environ.get("DEAD_LETTER_MAX_ATTEMPTS", "8"))
+DEAD_LETTER_BASE_DELAY_S  = float(os.environ.get("DEAD_LETTER_BASE_DELAY_S", "5"))
+DEAD_LETTER_MAX_DELAY_S   = float(os.environ.get("DEAD_LETTER_MAX_DELAY_S", "900"))
+DEAD_LETTER_REPLAY_BATCH  = int(os.environ.get("DEAD_LETTER_REPLAY_BATCH", "500"))
+DEAD_LETTER_IDLE_POLL_S   = float(os.environ.get("DEAD_LETTER_IDLE_POLL_S", "30"))
+
+# send(table, mapping, body) -> (http_status, response_text, retry_after_seconds | None)
+ReplaySendFn = Callable[[str, str, bytes], Tuple[int, str, Optional[float]]]
+
+STATE_PENDING = "pending"   # waiting for (re)play
+STATE_PARKED  = "parked"    # gave up after DEAD_LETTER_MAX_ATTEMPTS; requeue manually
+
+_THROTTLE_STATUS = (429, 503)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dead_letters (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name    TEXT    NOT NULL,
+    mapping       TEXT    NOT NULL,
+    row_json      TEXT    NOT NULL,
+    row_key       TEXT,
+    error         TEXT,
+    status_code   INTEGER,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    state         TEXT    NOT NULL DEFAULT 'pending',
+    next_attempt  REAL    NOT NULL DEFAULT 0,
+    created_at    REAL    NOT NULL,
+    updated_at    REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_dead_letters_due ON dead_letters (state, next_attempt);
+"""
+# Files from before row_key get the column added; their existing rows keep a NULL key.
+_ROW_KEY_INDEX = "CREATE UNIQUE INDEX IF NOT EXISTS ux_dead_letters_row ON dead_letters (row_key)"
+
+
+def row_key(table: str, row_json: str) -> str:
+    return hashlib.blake2b(f"{table}\n{row_json}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After in delta-seconds form; HTTP-date values are ignored."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempts: int) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2^attempts))."""
+    ceiling = min(DEAD_LETTER_MAX_DELAY_S, DEAD_LETTER_BASE_DELAY_S * (2 ** attempts))
+    return random.uniform(0, ceiling)
+
+
+class DeadLetterStore:
+    def __init__(self, path: str, send: ReplaySendFn, max_rows: int = DEAD_LETTER_MAX_ROWS):
+        self.path = path
+        self._send = send
+        self.max_rows = max_rows
+        self._conn: "Optional[sqlite3.Connection]" = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._throttled_until = 0.0
+
+        self._stats = {
+            "added": 0,
+            "duplicates": 0,
+            "dropped": 0,
+            "replayed_rows": 0,
+            "replay_batches": 0,
+            "replay_failures": 0,
+            "throttled": 0,
+            "parked": 0,
+            "replay_splits": 0,
+        }
+        self._replay_log: Deque[Tuple[float, int]] = deque(maxlen=256)  # (finished_at, rows)
+
+    # ---------------- Lifecycle ----------------
+    def _db(self) -> "sqlite3.Connection":
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            import sqlite3  # opened on first use; keeps sqlite3 off the cold-start import path
+
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if "row_key" not in {c[1] for c in conn.execute("PRAGMA table_info(dead_letters)")}:
+                conn.execute("ALTER TABLE dead_letters ADD COLUMN row_key TEXT")
+            conn.execute(_ROW_KEY_INDEX)
+            self._conn = conn
+        return self._conn
+
+    def start(self) -> None:
+        with self._lock:
+            self._db()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._replay_loop, name="adx-dead-letter-replay", daemon=True
+                )
+                self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ---------------- Producer side ----------------
+    def add(
+        self,
+        table: str,
+        mapping: str,
+        lines: Sequence[bytes],
+        error: str,
+        status_code: Optional[int] = None,
+    ) -> None:
+        """Store failed newline-terminated JSON rows for replay; rows already stored are skipped."""
+        if not lines:
+            return
+        now = time.time()
+        first_try = now + backoff_delay(0)
+        records = []
+        for line in lines:
+            row_json = line.decode("utf-8").rstrip("\n")
+            records.append(
+                (table, mapping, row_json, row_key(table, row_json), error[:2000], status_code, first_try, now, now)
+            )
+        with self._lock:
+            db = self._db()
+            with db:
+                before = db.total_changes
+                db.executemany(
+                    "INSERT OR IGNORE INTO dead_letters (table_name, mapping, row_json, row_key, error,"
+                    " status_code, next_attempt, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    records,
+                )
+                added = db.total_changes - before
+                # Bounded: drop the oldest entries beyond max_rows.
+                (count,) = db.execute("SELECT COUNT(*) FROM dead_letters").fetchone()
+                excess = count - self.max_rows
+                if excess > 0:
+                    db.execute(
+                        "DELETE FROM dead_letters WHERE id IN "
+                        "(SELECT id FROM dead_letters ORDER BY id LIMIT ?)",
+                        (excess,),
+                    )
+                    self._stats["dropped"] += excess
+                    logging.warning("Dead-letter store full; dropped %d oldest rows", excess)
+            self._stats["added"] += added
+            self._stats["duplicates"] += len(records) - added
+        self._wake.set()
+
+    # ---------------- Operator API ----------------
+    def list(
+        self,
+        state: Optional[str] = None,
+        table: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        where, args = self._filters(None, state, table)
+        with self._lock:
+            cur = self._db().execute(
+                "SELECT id, table_name, mapping, row_json, error, status_code, attempts, state,"
+                f" next_attempt, created_at, updated_at FROM dead_letters{where}"
+                " ORDER BY id LIMIT ? OFFSET ?",
+                (*args, max(1, min(limit, 1000)), max(0, offset)),
+            )
+            cols = [d[0] for d in cur.description]
+            return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    def requeue(self, ids: Optional[Sequence[int]] = None, state: Optional[str] = None) -> int:
+        where, args = self._filters(ids, state, None)
+        with self._lock:
+            db = self._db()
+            with db:
+                n = db.execute(
+                    "UPDATE dead_letters SET state = ?, attempts = 0, next_attempt = 0,"
+                    f" updated_at = ?{where}",
+                    (STATE_PENDING, time.time(), *args),
+                ).rowcount
+        self._throttled_until = 0.0
+        self._wake.set()
+        return n
+
+    def purge(self, ids: Optional[Sequence[int]] = None, state: Optional[str] = None) -> int:
+        where, args = self._filters(ids, state, None)
+        with self._lock:
+            db = self._db()
+            with db:
+                return db.execute(f"DELETE FROM dead_letters{where}", args).rowcount
+
+    @staticmethod
+    def _filters(
+        ids: Optional[Sequence[int]], state: Optional[str], table: Optional[str]
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        clauses: List[str] = []
+        args: List[Any] = []
+        if ids:
+            clauses.append(f"id IN ({','.join('?' for _ in ids)})")
+            args.extend(int(i) for i in ids)
+        if state:
+            clauses.append("state = ?")
+            args.append(state)
+        if table:
+            clauses.append("table_name = ?")
+            args.append(table)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), tuple(args)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_state = dict(
+                self._db().execute(
+                    "SELECT state, COUNT(*) FROM dead_letters GROUP BY state"
+                ).fetchall()
+            )
+            out: Dict[str, Any] = dict(self._stats)
+            window = list(self._replay_log)
+        out["entries"] = by_state
+        out["throttled_for_s"] = round(max(0.0, self._throttled_until - time.time()), 1)
+        # Replay throughput over the recent window of successful batches.
+        if len(window) >= 2:
+            span = window[-1][0] - window[0][0]
+            rows = sum(n for _, n in window[1:])
+            out["replay_rows_per_s"] = round(rows / span, 2) if span > 0 else None
+        return out
+
+    # ---------------- Replay worker ----------------
+    def _due_batch(self) -> Tuple[List[Tuple[Any, ...]], Optional[float]]:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            rows = db.execute(
+                "SELECT id, table_name, mapping, row_json, attempts FROM dead_letters"
+                " WHERE state = ? AND next_attempt <= ? ORDER BY id LIMIT ?",
+                (STATE_PENDING, now, DEAD_LETTER_REPLAY_BATCH),
+            ).fetchall()
+            nxt = None
+            if not rows:
+                (nxt,) = db.execute(
+                    "SELECT MIN(next_attempt) FROM dead_letters WHERE state = ?",
+                    (STATE_PENDING,),
+                ).fetchone()
+        return rows, nxt
+
+    def _replay_loop(self) -> None:
+        while not self._closed:
+            pause = self._throttled_until - time.time()
+            if pause > 0:
+                self._wake.wait(pause)
+                self._wake.clear()
+                continue
+            try:
+                rows, nxt = self._due_batch()
+            except Exception:
+                logging.exception("Dead-letter replay query failed")
+                rows, nxt = [], None
+            if not rows:
+                wait = DEAD_LETTER_IDLE_POLL_S if nxt is None else min(
+                    DEAD_LETTER_IDLE_POLL_S, max(0.05, nxt - time.time())
+                )
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+
+            groups: Dict[Tuple[str, str], List[Tuple[Any, ...]]] = {}
+            for r in rows:
+                groups.setdefault((r[1], r[2]), []).append(r)
+            for (table, mapping), items in groups.items():
+                if not self._replay_group(table, mapping, items):
+                    break  # throttled: stop hammering the cluster until the pause expires
+
+    def _replay_group(self, table: str, mapping: str, items: List[Tuple[Any, ...]]) -> bool:
+        body = "".join(r[3] + "\n" for r in items).encode("utf-8")
+        ids = [r[0] for r in items]
+        retry_after: Optional[float] = None
+        try:
+            status, text, retry_after = self._send(table, mapping, body)
+            error = None if status in (200, 202) else f"ADX ingest error {status}: {text}"
+        except Exception as ex:
+            status, error = None, f"Exception: {ex}"
+
+        now = time.time()
+        if error is None:
+            with self._lock:
+                db = self._db()
+                with db:
+                    db.execute(
+                        f"DELETE FROM dead_letters WHERE id IN ({','.join('?' for _ in ids)})", ids
+                    )
+                self._stats["replayed_rows"] += len(ids)
+                self._stats["replay_batches"] += 1
+                self._replay_log.append((now, len(ids)))
+            return True
+
+        throttled = status in _THROTTLE_STATUS or retry_after is not None
+        if not throttled and status is not None and 400 <= status < 500 and len(items) > 1:
+            # ADX rejected the body: most likely one bad row. Split so only that row is charged.
+            self._stats["replay_splits"] += 1
+            mid = len(items) // 2
+            return self._replay_group(table, mapping, items[:mid]) and self._replay_group(
+                table, mapping, items[mid:]
+            )
+        updates = []
+        parked = 0
+        for r in items:
+            attempts = r[4] + 1
+            if attempts >= DEAD_LETTER_MAX_ATTEMPTS:
+                updates.append((STATE_PARKED, attempts, now, error[:2000], status, now, r[0]))
+                parked += 1
+            else:
+                delay = retry_after if retry_after is not None else backoff_delay(attempts)
+                updates.append((STATE_PENDING, attempts, now + delay, error[:2000], status, now, r[0]))
+        with self._lock:
+            db = self._db()
+            with db:
+                db.executemany(
+                    "UPDATE dead_letters SET state = ?, attempts = ?, next_attempt = ?, error = ?,"
+                    " status_code = ?, updated_at = ? WHERE id = ?",
+                    updates,
+                )
+            self._stats["replay_failures"] += 1
+            self._stats["parked"] += parked
+            if throttled:
+                self._stats["throttled"] += 1
+                self._throttled_until = now + (
+                    retry_after if retry_after is not None else backoff_delay(items[0][4] + 1)
+                )
+        logging.warning("Dead-letter replay failed (%s, %d rows): %s", table, len(ids), error[:500])
+        return not throttled
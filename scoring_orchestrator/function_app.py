@@ -1,20 +1,45 @@
 # function_app.py — Azure Functions (Python) with ADX ingest + live query + health
 # PERMANENT TIMESTAMP FIX: server enforces UTC "now" if client/agent sends missing/stale/future times.
 
-import json
+import atexit
+import functools
+import inspect
 import logging
 import os
-from typing import Any, Dict
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FuturesTimeout
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 
 import azure.functions as func
-import requests
-from azure.identity import DefaultAzureCredential
-from azure.kusto.data import (
-    KustoClient,
-    KustoConnectionStringBuilder,
-    ClientRequestProperties,
-)
+
+# Cold start: the Kusto SDK, azure-identity, requests and httpx are imported by the first call that
+# needs them (live queries, health, ingest), never by ping or the cache-read routes.
+if TYPE_CHECKING:
+    from azure.kusto.data import ClientRequestProperties, KustoClient
+
+import async_adx
+import conditional_get
+import ingest_gzip
+import ingest_transport
+import json_codec
+import ndjson_export
+import scoring
+import token_cache
+from dead_letter import DEAD_LETTER_PATH, DeadLetterStore, parse_retry_after
+from idempotency import CachedResponse, IdempotencyStore
+from ingest_batcher import INGEST_BATCH_MAX_BYTES, IngestBatcher
+from ingest_spool import INGEST_SPOOL_DIR, IngestSpool
+from kusto_pool import KustoClientPool
+from latest_index import LATEST_INDEX_MAX_AGE_S, LatestIndex
+from latest_store import LatestStore
+from latest_views import SHOW_VIEWS_COMMAND, ViewCatalog, latest_rank
+from live_cache import LiveCache
+from live_events import LIVE_EVENTS_HOLD_S, EventHub, TooManySubscribers
+from lookup_keys import key_fields, kql_key_match, kql_legacy_key, normalize_key
+from pipelines import AssessmentPipeline, PipelineRegistry, PipelineStats, StageClock
+from schemas import SchemaRegistry
 
 # ---------------- App (one instance only) ----------------
 app = func.FunctionApp(http_auth_level=func.AuthLevel.FUNCTION)
@@ -38,8 +63,14 @@ DIGITAL_ADX_MAPPING = os.environ.get("DIGITAL_ADX_MAPPING", "digital_readiness_s
 KUSTO_INGEST_SCOPE = "https://ingest.kusto.windows.net/.default"
 KUSTO_DATA_SCOPE   = "https://kusto.kusto.windows.net/.default"
 
-LATEST_CACHE_PATH  = "/tmp/tech_health_latest.json"
-_cred = DefaultAzureCredential()
+# Server-side scoring (scoring.py): totals / percent / level / maturity are recomputed from answers.
+# AIX overall_score_500 and Digital level / maturity are stored as sent; the server's values are only
+# compared, until the AIX formula and the Digital bands are confirmed. SERVER_SCORING=0 stores the
+# client's values as before.
+SERVER_SCORING = os.environ.get("SERVER_SCORING", "1") != "0"
+
+# Durable spool: single-row ingest answers 202 + receipt once the row is fsynced locally.
+INGEST_SPOOL_ENABLED = os.environ.get("INGEST_SPOOL", "1") != "0"
 
 # ---------------- Timestamp guard helpers (PERMANENT FIX) ----------------
 MAX_SKEW_PAST   = timedelta(hours=24)    # older than 24h -> override to now
@@ -73,68 +104,333 @@ def _safe_event_time(ts: str | None) -> str:
 
 # ---------------- Kusto helpers ----------------
 def _get_ingest_token() -> str:
-    return _cred.get_token(KUSTO_INGEST_SCOPE).token
+    # cached per scope + refreshed in the background (see token_cache.py)
+    return token_cache.get_token(KUSTO_INGEST_SCOPE)
+
+
+def _build_kusto_client(cluster_uri: str) -> "KustoClient":
+    from azure.kusto.data import KustoClient, KustoConnectionStringBuilder
+
+    _tp = token_cache.token_provider(KUSTO_DATA_SCOPE)
+    kcsb = KustoConnectionStringBuilder.with_token_provider(cluster_uri, _tp)
+    return KustoClient(kcsb)
 
 
-def _kusto_query_client() -> KustoClient:
+# One client per cluster, shared across worker threads and rebuilt after auth/connection errors.
+_kusto_pool = KustoClientPool(_build_kusto_client)
+
+
+def _kusto_query_client() -> "KustoClient":
     if not KUSTO_DATA_URI:
         raise RuntimeError("KUSTO_DATA_URI is not set")
+    return _kusto_pool.get(KUSTO_DATA_URI)
 
-    def _tp():
-        return _cred.get_token(KUSTO_DATA_SCOPE).token
 
-    kcsb = KustoConnectionStringBuilder.with_token_provider(KUSTO_DATA_URI, _tp)
-    return KustoClient(kcsb)
+def _kusto_execute(query: str, props: "ClientRequestProperties | None" = None):
+    if not KUSTO_DATA_URI:
+        raise RuntimeError("KUSTO_DATA_URI is not set")
+    return _kusto_pool.execute(KUSTO_DATA_URI, ADX_DB, query, props)
+
+# ---------------- Ingest helpers ----------------
+# Upper bound a handler waits for its row's batch: max batching delay + one full POST.
+INGEST_WAIT_TIMEOUT = (
+    ingest_transport.INGEST_CONNECT_TIMEOUT + ingest_transport.INGEST_READ_TIMEOUT + 5
+)
+
+
+def _ingest_url(table: str, mapping: str) -> str:
+    return (
+        f"{KUSTO_INGEST_URI}/v1/rest/ingest/{ADX_DB}/{table}"
+        f"?streamFormat=json&mappingName={mapping}"
+    )
+
+
+def _ingest_headers(token: str) -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json; charset=utf-8",
+    }
+
+
+def _encode_ingest(table: str, body: bytes, token: str) -> Tuple[bytes, Dict[str, str]]:
+    """Final body + headers for an ingest POST (gzip when enabled for the table)."""
+    body, extra = ingest_gzip.maybe_compress(table, body)
+    headers = _ingest_headers(token)
+    headers.update(extra)
+    return body, headers
+
+
+def _send_ingest(table: str, mapping: str, body: bytes) -> Tuple[int, str]:
+    body, headers = _encode_ingest(table, body, _get_ingest_token())
+    resp = ingest_transport.post(_ingest_url(table, mapping), body, headers)
+    return resp.status_code, resp.text
+
+
+def _send_ingest_replay(table: str, mapping: str, body: bytes) -> Tuple[int, str, Optional[float]]:
+    """Like _send_ingest, but also surfaces Retry-After so replay can honour throttling."""
+    body, headers = _encode_ingest(table, body, _get_ingest_token())
+    resp = ingest_transport.post(_ingest_url(table, mapping), body, headers)
+    return resp.status_code, resp.text, parse_retry_after(resp.headers.get("Retry-After"))
+
+
+# Failed rows land here instead of being dropped; a background worker replays them.
+_dead_letter = DeadLetterStore(DEAD_LETTER_PATH, _send_ingest_replay)
+atexit.register(_dead_letter.close)
+
+
+def _dead_letter_rows(
+    table: str, mapping: str, lines: List[bytes], error: str, status_code: Optional[int] = None
+) -> None:
+    try:
+        _dead_letter.add(table, mapping, lines, error, status_code)
+    except Exception:
+        logging.exception("Failed to dead-letter %d rows for %s", len(lines), table)
+
+
+# One batcher per process; rows for the same (table, mapping) share a multi-line POST.
+_batcher = IngestBatcher(_send_ingest)
+atexit.register(_batcher.close)
+
+# Write-ahead spool drained in the background; unsent rows are recovered on restart.
+_spool = IngestSpool(INGEST_SPOOL_DIR, _send_ingest, on_failed=_dead_letter.add)
+atexit.register(_spool.close)
+
+
+def _start_ingest_workers() -> None:
+    """Dead-letter replay + spool recovery. Runs off the import path so a cold start doesn't wait
+    on SQLite or a spool scan; an early _spool.append() blocks on the spool lock until recovery ends."""
+    try:
+        _dead_letter.start()
+    except Exception:
+        logging.exception("Dead-letter store failed to start")
+    if INGEST_SPOOL_ENABLED:
+        try:
+            _spool.start()
+        except Exception:
+            logging.exception("Ingest spool recovery failed")
+
+
+if KUSTO_INGEST_URI:
+    threading.Thread(target=_start_ingest_workers, name="ingest-workers-start", daemon=True).start()
+
+
+def _spool_accept(table: str, mapping: str, event_bytes: bytes) -> func.HttpResponse | None:
+    """Spool the row and answer 202 + receipt; None means fall back to direct ingest."""
+    if not INGEST_SPOOL_ENABLED:
+        return None
+    try:
+        receipt_id = _spool.append(table, mapping, event_bytes)
+    except Exception:
+        logging.exception("Ingest spool append failed; ingesting directly")
+        return None
+    return func.HttpResponse(
+        json_codec.dumps({"status": "accepted", "receipt_id": receipt_id}),
+        status_code=202,
+        mimetype="application/json",
+    )
+
+
+async def _ingest_async(table: str, mapping: str, event_bytes: bytes, label: str) -> func.HttpResponse:
+    """Async ingest: one multiplexed HTTP/2 POST, token fetch off the event loop."""
+    try:
+        token = await async_adx.run_blocking(_get_ingest_token)
+        body, headers = _encode_ingest(table, event_bytes, token)
+        status, text = await async_adx.post(_ingest_url(table, mapping), body, headers)
+    except Exception as e:
+        logging.exception("%singest exception (async)", label)
+        _dead_letter_rows(table, mapping, [event_bytes], f"Exception: {e}")
+        return func.HttpResponse(f"Exception: {e}", status_code=500)
+    if status not in (200, 202):
+        logging.error("%sADX ingest failed: %s %s", label, status, text)
+        _dead_letter_rows(table, mapping, [event_bytes], text, status)
+        return func.HttpResponse(f"{label}ADX ingest error: {text}", status_code=502)
+    return func.HttpResponse("Accepted", status_code=200)
+
+# ---------------- Live query helpers (shared by sync + async routes) ----------------
+# Latest-record query templates: {source} is the table or its <table>_latest materialized view,
+# {time_expr} the datetime to order by (see latest_views.py and _latest_query below). The filters
+# compare the normalised key columns (lookup_keys.py) with exact equality, falling back to the
+# display values for rows ingested before the key columns existed. Ties on the event time (a row
+# and its rescore.py correction) go to the row ingested last.
+_CUSTOMER_MATCH = kql_key_match("customer_key", "customer", "p_customer")
+_PARTICIPANT_MATCH = kql_key_match("participant_key", "participant_name", "p_participant")
+TECH_HEALTH_LIVE_QUERY = """
+declare query_parameters(p_customer:string = "", p_participant:string = "");
+{source}
+| where (p_customer == "" or {customer_match})
+| where (p_participant == "" or {participant_match})
+| where isnotempty({time_column})
+| top 1 by {time_expr} desc, ingestion_time() desc
+| project overall_score_500, timestamp_utc
+"""
+
+DIGITAL_LIVE_QUERY = """
+declare query_parameters(p_customer:string = "", p_participant:string = "");
+{source}
+| where (p_customer == "" or {customer_match})
+| where (p_participant == "" or {participant_match})
+| where isnotempty({time_column})
+| top 1 by {time_expr} desc, ingestion_time() desc
+| project customer,
+          participant_name,
+          timestamp,
+          total_140,
+          percent,
+          level,
+          maturity
+"""
+
+AI_LIVE_QUERY = """
+declare query_parameters(p_customer:string = "", p_participant:string = "");
+{source}
+| where (p_customer == "" or {customer_match})
+| where (p_participant == "" or {participant_match})
+| where isnotempty({time_column})
+| top 1 by {time_expr} desc, ingestion_time() desc
+| project customer,
+          participant_name,
+          timestamp,
+          total_105,
+          percent,
+          level,
+          maturity
+"""
+
+
+def _live_params(req: func.HttpRequest) -> Dict[str, str]:
+    return {
+        "p_customer": normalize_key(req.params.get("customer")),
+        "p_participant": normalize_key(req.params.get("participant")),
+    }
+
+
+def _query_rows(query: str, params: Dict[str, str]) -> list:
+    from azure.kusto.data import ClientRequestProperties
+
+    props = ClientRequestProperties()
+    for name, value in params.items():
+        props.set_parameter(name, value)
+    resp = _kusto_execute(query, props)
+    table = resp.primary_results[0] if resp.primary_results else None
+    if not table or table.rows_count == 0:
+        return []
+    return table.rows  # DataRows, indexable by column name
+
+
+async def _query_rows_async(query: str, params: Dict[str, str]) -> list:
+    if not KUSTO_DATA_URI:
+        raise RuntimeError("KUSTO_DATA_URI is not set")
+    token = await async_adx.run_blocking(token_cache.get_token, KUSTO_DATA_SCOPE)
+    return await async_adx.query(KUSTO_DATA_URI, ADX_DB, query, token, params)
+
+
+def _list_latest_views() -> list:
+    if not KUSTO_DATA_URI:
+        raise RuntimeError("KUSTO_DATA_URI is not set")
+    resp = _kusto_pool.execute_mgmt(KUSTO_DATA_URI, ADX_DB, SHOW_VIEWS_COMMAND)
+    table = resp.primary_results[0] if resp.primary_results else None
+    return [row["Name"] for row in table] if table else []
+
+
+# Healthy <table>_latest materialized views, re-listed every ADX_VIEW_REFRESH_S in the background.
+_latest_views = ViewCatalog(_list_latest_views)
+
+
+# Polled *_latest_live answers, keyed by (assessment type, customer, participant); shared by sync +
+# async twins. Consulted only when the latest index (below) has no answer.
+_live_cache = LiveCache()
+
+
+def _live_response(req: func.HttpRequest, body: bytes, outcome: str) -> func.HttpResponse:
+    """200 with ETag / Last-Modified (from the record timestamp), or 304 if the client is current."""
+    try:
+        timestamp = str(json_codec.loads(body).get("timestamp") or "")
+    except (ValueError, AttributeError):
+        timestamp = ""
+    headers = conditional_get.validator_headers(body, timestamp)
+    headers["X-Cache"] = outcome
+    if conditional_get.not_modified(req.headers, headers):
+        return func.HttpResponse(status_code=304, headers=headers)
+    return func.HttpResponse(
+        body,
+        mimetype="application/json",
+        status_code=200,
+        headers=headers,
+    )
+
+
+def _tech_health_payload(rows: list) -> Dict[str, Any]:
+    if not rows:
+        return {"score": 0, "max": 500, "level": "", "timestamp": ""}
+    row0 = rows[0]
+    score = int((row0["overall_score_500"] or 0))
+    ts = str(row0["timestamp_utc"])
+    return {"score": score, "max": 500, "level": _level_from_score(score), "timestamp": ts}
+
+
+def _readiness_payload(track: scoring.Track, rows: list) -> Dict[str, Any]:
+    if not rows:
+        return {
+            "score": 0,
+            "max": track.max_total,
+            "percent": 0.0,
+            "level": 0,
+            "maturity": "",
+            "timestamp": "",
+        }
+    row0 = rows[0]
+    return {
+        "score": int(row0[track.total_field] or 0),  # 0–105 / 0–140
+        "max": track.max_total,
+        "percent": float(row0["percent"] or 0.0),    # 0–100
+        "level": int(row0["level"] or 0),            # 1–5
+        "maturity": str(row0["maturity"] or ""),     # Not Started / Initial / Developing / Advanced / Leading
+        "timestamp": str(row0["timestamp"]),
+    }
+
+
+def _digital_payload(rows: list) -> Dict[str, Any]:
+    return _readiness_payload(scoring.DIGITAL_READINESS, rows)
+
+
+def _ai_payload(rows: list) -> Dict[str, Any]:
+    return _readiness_payload(scoring.AI_READINESS, rows)
+
+# Request validators compiled from score_and_push.openapi.json (see schemas.py). They raise
+# SchemaValidationError (a ValueError) listing every problem, so existing handlers are unchanged.
+_schemas = SchemaRegistry()
+_validate = _schemas.validator("score_and_push")
+_validate_ai_readiness = _schemas.validator("ai_readiness_score_and_push")
+_validate_digital = _schemas.validator("digital_readiness_score_and_push")
+
 
 # ---------------- Domain helpers ----------------
 def _level_from_score(score: float) -> str:
-    if score >= 401:
-        return "Leading"
-    if score >= 301:
-        return "Advanced"
-    if score >= 201:
-        return "Developing"
-    if score >= 101:
-        return "Initial"
-    return "Not Started"
-
-
-def _validate(payload: Dict[str, Any]) -> None:
-    # timestamp is OPTIONAL now (server will enforce)
-    required = [
-        "session_id",
-        "assessment_type",
-        "customer",
-        "industry",
-        "participant_name",
-        "participant_role",
-        "org",
-        "domains",
-        "overall_score_500",
-        "notes",
-    ]
-    missing = [k for k in required if k not in payload]
-    if missing:
-        raise ValueError(f"Missing fields: {', '.join(missing)}")
-    if not isinstance(payload["domains"], list):
-        raise ValueError("domains must be an array")
-    for d in payload["domains"]:
-        if not isinstance(d, dict) or "name" not in d or "score" not in d:
-            raise ValueError("each domain must be an object with 'name' and 'score'")
-
-
-def _write_latest_cache(body: Dict[str, Any]) -> None:
-    score = float(body.get("overall_score_500", 0) or 0)
-    # for cache we also use server-enforced time, not raw client time
-    ts = _safe_event_time(body.get("timestamp"))
-    latest = {
-        "score": int(score),
-        "max": 500,
-        "level": _level_from_score(score),
-        "timestamp": ts,
-    }
-    with open(LATEST_CACHE_PATH, "w") as f:
-        json.dump(latest, f)
+    return scoring.aix_maturity(score)  # table-driven: 101 / 201 / 301 / 401
+
+
+def _aix_score(body: Dict[str, Any]) -> float:
+    """The client's overall_score_500; the provisional server formula is only compared with it."""
+    client = float(body.get("overall_score_500") or 0)
+    if SERVER_SCORING:
+        server = scoring.score_aix(body["domains"])
+        if client != server:
+            scoring.note_mismatch(AIX_TYPE, "overall_score_500", client, server)
+    return client
+
+
+def _scored_fields(track: scoring.Track, body: Dict[str, Any]) -> Dict[str, Any]:
+    """total_N / percent / level / maturity for an AI or Digital row."""
+    if not SERVER_SCORING:
+        return {f: body.get(f) for f in (track.total_field, "percent", "level", "maturity")}
+    s = scoring.score_answers(track, body["answers"])
+    fields = {track.total_field: s.total, "percent": s.percent, "level": s.level, "maturity": s.maturity}
+    for name, value in fields.items():
+        if name in body and body[name] != value:
+            scoring.note_mismatch(track.name, name, body[name], value)
+    if track.bands_provisional:
+        fields["level"], fields["maturity"] = body["level"], body["maturity"]
+    return fields
 
 
 def _build_row(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -152,38 +448,16 @@ def _build_row(payload: Dict[str, Any]) -> Dict[str, Any]:
         "customer": payload["customer"],
         "industry": payload.get("industry", "") or "",
         "participant_name": payload["participant_name"],
+        **key_fields(payload["customer"], payload["participant_name"]),
         "participant_role": payload["participant_role"],
         "org": payload["org"],
         "domains": payload["domains"],
-        "overall_score_500": payload.get("overall_score_500"),
+        "overall_score_500": _aix_score(payload),
         "notes": payload.get("notes", ""),
         "received_at_utc": _utc_now_iso(),
     }
 
 # --------- AI Readiness helpers (simple flat row) ---------
-def _validate_ai_readiness(body: Dict[str, Any]) -> None:
-    required = [
-        "timestamp",
-        "session_id",
-        "customer",
-        "industry",
-        "participant_name",
-        "participant_role",
-        "org",
-        "answers",
-        "total_105",
-        "percent",
-        "level",
-        "maturity",
-        "notes",
-    ]
-    missing = [k for k in required if k not in body]
-    if missing:
-        raise ValueError(f"Missing fields: {', '.join(missing)}")
-    if not isinstance(body["answers"], list):
-        raise ValueError("answers must be an array")
-
-
 def _build_ai_row(body: Dict[str, Any]) -> Dict[str, Any]:
     utc_iso = _safe_event_time(body.get("timestamp"))
     return {
@@ -192,48 +466,16 @@ def _build_ai_row(body: Dict[str, Any]) -> Dict[str, Any]:
         "customer": body["customer"],
         "industry": body.get("industry", "") or "",
         "participant_name": body["participant_name"],
+        **key_fields(body["customer"], body["participant_name"]),
         "participant_role": body["participant_role"],
         "org": body["org"],
         "answers": body["answers"],
-        "total_105": body["total_105"],
-        "percent": body["percent"],
-        "level": body["level"],
-        "maturity": body["maturity"],
+        **_scored_fields(scoring.AI_READINESS, body),
         "notes": body.get("notes", ""),
         "received_at_utc": _utc_now_iso(),
     }
 
 # --------- Digital Readiness helpers (flat row, max 140) ---------
-def _validate_digital(body: Dict[str, Any]) -> None:
-    required = [
-        "timestamp",
-        "session_id",
-        "customer",
-        "industry",
-        "participant_name",
-        "participant_role",
-        "org",
-        "answers",
-        "total_140",
-        "percent",
-        "level",
-        "maturity",
-        "notes",
-    ]
-    missing = [k for k in required if k not in body]
-    if missing:
-        raise ValueError(f"Missing fields: {', '.join(missing)}")
-
-    answers = body.get("answers")
-    if not isinstance(answers, list):
-        raise ValueError("answers must be an array")
-    if len(answers) != 28:
-        raise ValueError("answers must contain exactly 28 values")
-    for v in answers:
-        if not isinstance(v, int) or v < 1 or v > 5:
-            raise ValueError("each answer must be an integer between 1 and 5")
-
-
 def _build_digital_row(body: Dict[str, Any]) -> Dict[str, Any]:
     utc_iso = _safe_event_time(body.get("timestamp"))
     return {
@@ -242,16 +484,639 @@ def _build_digital_row(body: Dict[str, Any]) -> Dict[str, Any]:
         "customer": body["customer"],
         "industry": body.get("industry", "") or "",
         "participant_name": body["participant_name"],
+        **key_fields(body["customer"], body["participant_name"]),
         "participant_role": body["participant_role"],
         "org": body["org"],
         "answers": body["answers"],
-        "total_140": body["total_140"],
-        "percent": body["percent"],
-        "level": body["level"],
-        "maturity": body["maturity"],
+        **_scored_fields(scoring.DIGITAL_READINESS, body),
         "notes": body.get("notes", ""),
     }
 
+# ---------------- Idempotency (retries of the same session_id) ----------------
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+# Assessment-type tags used to scope idempotency keys per track.
+AIX_TYPE     = "AIX"
+AI_TYPE      = "AI_READINESS"
+DIGITAL_TYPE = "DIGITAL_READINESS"
+
+_idempotency = IdempotencyStore()
+
+
+def _idempotency_key(assessment_type: str, header_key: str | None, body: Any) -> str | None:
+    if header_key:
+        return f"{assessment_type}:key:{header_key.strip()}"
+    if isinstance(body, dict) and body.get("session_id"):
+        return f"{assessment_type}:{body['session_id']}"
+    return None
+
+
+def _replayed(cached: CachedResponse) -> func.HttpResponse:
+    return func.HttpResponse(
+        cached.body,
+        status_code=cached.status_code,
+        mimetype=cached.mimetype,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def _cacheable(resp: func.HttpResponse | None) -> CachedResponse | None:
+    if resp is None:
+        return None
+    return CachedResponse(resp.status_code, resp.get_body(), resp.mimetype)
+
+
+def _idempotent(assessment_type: str):
+    """Answer retries of an already-accepted (type, session_id) from cache, without touching ADX."""
+
+    def _key_for(req: func.HttpRequest) -> str | None:
+        try:
+            body = json_codec.loads(req.get_body() or b"null")
+        except ValueError:
+            body = None
+        return _idempotency_key(assessment_type, req.headers.get(IDEMPOTENCY_HEADER), body)
+
+    def deco(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(req: func.HttpRequest) -> func.HttpResponse:
+                key = _key_for(req)
+                if key is None:
+                    return await fn(req)
+                cached = await async_adx.run_blocking(_idempotency.begin, key)
+                if cached is not None:
+                    return _replayed(cached)
+                resp = None
+                try:
+                    resp = await fn(req)
+                    return resp
+                finally:
+                    _idempotency.finish(key, _cacheable(resp))
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(req: func.HttpRequest) -> func.HttpResponse:
+            key = _key_for(req)
+            if key is None:
+                return fn(req)
+            cached = _idempotency.begin(key)
+            if cached is not None:
+                return _replayed(cached)
+            resp = None
+            try:
+                resp = fn(req)
+                return resp
+            finally:
+                _idempotency.finish(key, _cacheable(resp))
+
+        return wrapper
+
+    return deco
+
+# ---------------- Latest-record index (write-through) ----------------
+# Accepted rows update the per-type index and (write-behind) this instance's SQLite store; the
+# *_latest_live routes answer from the index, then the store, and only go to ADX (through
+# _live_cache) on a cold miss, seeding the index with the answer.
+_latest_index = LatestIndex()
+_latest_store = LatestStore()
+atexit.register(_latest_store.close)
+
+# Accepted rows are also pushed to /api/events/{assessment} subscribers on this instance.
+_live_events = EventHub()
+
+# assessment type -> (live query template, rows -> route payload)
+_LATEST_LIVE: Dict[str, Tuple[str, Callable[[list], Dict[str, Any]]]] = {
+    AIX_TYPE: (TECH_HEALTH_LIVE_QUERY, _tech_health_payload),
+    AI_TYPE: (AI_LIVE_QUERY, _ai_payload),
+    DIGITAL_TYPE: (DIGITAL_LIVE_QUERY, _digital_payload),
+}
+
+
+def _latest_query(assessment_type: str) -> str:
+    p = _pipelines.get(assessment_type)
+    src = _latest_views.source(p.table, p.time_column)
+    return _LATEST_LIVE[assessment_type][0].format(
+        source=src.source, time_column=p.time_column, time_expr=src.time_expr,
+        customer_match=_CUSTOMER_MATCH, participant_match=_PARTICIPANT_MATCH,
+    )
+
+
+def _index_latest(assessment_type: str, row: Dict[str, Any]) -> None:
+    payload = _LATEST_LIVE[assessment_type][1]([row])
+    body = json_codec.dumps(payload)
+    customer, participant, ts = row["customer_key"], row["participant_key"], payload["timestamp"]
+    _latest_index.record(assessment_type, customer, participant, ts, body)
+    _latest_store.put(assessment_type, customer, participant, ts, body)
+    _live_events.publish(
+        assessment_type, customer, participant,
+        json_codec.dumps({"customer": row["customer"], "participant": row["participant_name"], **payload}),
+    )
+
+
+def _stored_latest(assessment_type: str, customer: str, participant: str, max_age_s: float) -> bytes | None:
+    """Store lookup for an index miss (e.g. after a restart); a hit is loaded back into the index."""
+    try:
+        stored = _latest_store.get(assessment_type, customer, participant)
+    except Exception:
+        logging.exception("Latest store read failed")
+        return None
+    if stored is None or (max_age_s > 0 and time.time() - stored.updated_at > max_age_s):
+        return None
+    _latest_index.seed(assessment_type, customer, participant, stored.event_ts, stored.body)
+    return stored.body
+
+
+def _seed_latest(assessment_type: str, params: Dict[str, str], rows: list) -> bytes:
+    payload = _LATEST_LIVE[assessment_type][1](rows)
+    body = json_codec.dumps(payload)
+    if rows:
+        _latest_index.seed(
+            assessment_type, params["p_customer"], params["p_participant"], payload["timestamp"], body
+        )
+    return body
+
+
+def _latest_live(assessment_type: str, params: Dict[str, str]) -> Tuple[bytes, str]:
+    """-> (JSON body, X-Cache outcome): index, then the coalescing live cache, then ADX."""
+    body = _latest_index.get(assessment_type, params["p_customer"], params["p_participant"])
+    if body is not None:
+        return body, "index"
+    body = _stored_latest(assessment_type, params["p_customer"], params["p_participant"], LATEST_INDEX_MAX_AGE_S)
+    if body is not None:
+        return body, "store"
+    query = _latest_query(assessment_type)
+    return _live_cache.get(
+        (assessment_type, params["p_customer"], params["p_participant"]),
+        lambda: _seed_latest(assessment_type, params, _query_rows(query, params)),
+    )
+
+
+async def _latest_live_async(assessment_type: str, params: Dict[str, str]) -> Tuple[bytes, str]:
+    body = _latest_index.get(assessment_type, params["p_customer"], params["p_participant"])
+    if body is not None:
+        return body, "index"
+    body = await async_adx.run_blocking(
+        _stored_latest, assessment_type, params["p_customer"], params["p_participant"], LATEST_INDEX_MAX_AGE_S
+    )
+    if body is not None:
+        return body, "store"
+    query = _latest_query(assessment_type)
+
+    async def fetch() -> bytes:
+        return _seed_latest(assessment_type, params, await _query_rows_async(query, params))
+
+    return await _live_cache.get_async(
+        (assessment_type, params["p_customer"], params["p_participant"]), fetch
+    )
+
+
+# ---------------- Batch latest (many participants, one ADX query) ----------------
+# A workshop screen with N participant cards asks once: keys are answered from the index, then
+# the store (one SELECT), and whatever is left by a single arg_max query per call. Every row found
+# is seeded into the index, so the per-participant *_latest_live routes hit afterwards.
+# Rows from before the key columns get their keys computed (lookup_keys.kql_legacy_key) before
+# grouping, so they land in the same group as newer rows of that participant. arg_max ranks by
+# latest_views.latest_rank, so a rescored row beats the row it corrects.
+LATEST_BATCH_MAX_KEYS = int(os.environ.get("LATEST_BATCH_MAX_KEYS", "500"))
+
+LATEST_BATCH_QUERY = """
+declare query_parameters(p_customers:dynamic = dynamic([]), p_keys:dynamic = dynamic([]));
+{source}
+| where customer_key in (p_customers) or (isempty(customer_key) and {legacy_customer} in (p_customers))
+| where isnotempty({time_column})
+| extend customer_key = iff(isempty(customer_key), {legacy_customer}, customer_key),
+         participant_key = iff(isempty(participant_key), {legacy_participant}, participant_key)
+| summarize arg_max({rank}, {columns}, customer, participant_name) by customer_key, participant_key
+{key_filter}
+"""
+
+# Keys mode only: keep the (customer_key, participant_key) pairs that were asked for.
+_BATCH_KEY_FILTER = """| join kind=leftsemi (
+    print k = p_keys
+    | mv-expand k
+    | project customer_key = tostring(k[0]), participant_key = tostring(k[1])
+) on customer_key, participant_key"""
+
+# assessment type -> columns the route payload needs (besides the keys and display names)
+_LATEST_BATCH_COLUMNS = {
+    AIX_TYPE: "overall_score_500, timestamp_utc",
+    AI_TYPE: "timestamp, total_105, percent, level, maturity",
+    DIGITAL_TYPE: "timestamp, total_140, percent, level, maturity",
+}
+
+
+def _kql_dynamic(value: Any) -> str:
+    return "dynamic(" + json_codec.dumps(value).decode("utf-8") + ")"
+
+
+async def _query_latest_batch(
+    assessment_type: str, customers: List[str], keys: List[Tuple[str, str]] | None
+) -> Tuple[Dict[Tuple[str, str], bytes], Dict[Tuple[str, str], Tuple[str, str]]]:
+    """One arg_max query; keys=None means every participant of the customers. Seeds the index.
+
+    -> (body per normalised key, display (customer, participant) per key).
+    """
+    p = _pipelines.get(assessment_type)
+    src = _latest_views.source(p.table, p.time_column)
+    query = LATEST_BATCH_QUERY.format(
+        source=src.source,
+        time_column=p.time_column,
+        rank=latest_rank(src.time_expr),
+        columns=_LATEST_BATCH_COLUMNS[assessment_type],
+        key_filter=_BATCH_KEY_FILTER if keys is not None else "",
+        legacy_customer=kql_legacy_key("customer"),
+        legacy_participant=kql_legacy_key("participant_name"),
+    )
+    params = {"p_customers": _kql_dynamic(sorted(customers)), "p_keys": _kql_dynamic([list(k) for k in keys or ()])}
+    payload_fn = _LATEST_LIVE[assessment_type][1]
+    found: Dict[Tuple[str, str], bytes] = {}
+    labels: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    for row in await _query_rows_async(query, params):
+        key = (str(row["customer_key"]), str(row["participant_key"]))
+        payload = payload_fn([row])
+        body = json_codec.dumps(payload)
+        _latest_index.seed(assessment_type, *key, payload["timestamp"], body)
+        found[key] = body
+        labels[key] = (str(row["customer"]), str(row["participant_name"]))
+    return found, labels
+
+
+async def _latest_batch(
+    assessment_type: str,
+    customer: str,
+    keys: List[Tuple[str, str]],
+    labels: Dict[Tuple[str, str], Tuple[str, str]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """-> (one result per key, counts per source). No keys = every participant of `customer`.
+
+    Keys are normalised (lookup_keys.py); labels are the customer / participant echoed per key.
+    """
+    sources: Dict[Tuple[str, str], Tuple[bytes, str]] = {}
+    whole: Dict[Tuple[str, str], bytes] = {}
+    outcome = ""
+    if not keys:
+        # The participant set is only known to ADX; coalesce and TTL-cache that answer, and let
+        # newer rows already in the index win over it below.
+        (whole, labels), outcome = await _live_cache.get_async(
+            ("batch", assessment_type, customer),
+            lambda: _query_latest_batch(assessment_type, [customer], None),
+        )
+        keys = sorted(whole)
+    for key in keys:
+        body = _latest_index.get(assessment_type, *key)
+        if body is not None:
+            sources[key] = (body, "index")
+        elif key in whole:
+            sources[key] = (whole[key], "adx" if outcome in ("miss", "bypass") else outcome)
+    missing = [k for k in keys if k not in sources]
+    if missing:
+        try:
+            stored = await async_adx.run_blocking(
+                _latest_store.get_many, [(assessment_type, c, p) for c, p in missing]
+            )
+        except Exception:
+            logging.exception("Latest store batch read failed")
+            stored = {}
+        now = time.time()
+        for (_, c, p), record in stored.items():
+            if LATEST_INDEX_MAX_AGE_S > 0 and now - record.updated_at > LATEST_INDEX_MAX_AGE_S:
+                continue
+            _latest_index.seed(assessment_type, c, p, record.event_ts, record.body)
+            sources[(c, p)] = (record.body, "store")
+        missing = [k for k in keys if k not in sources]
+    if missing:
+        found, _ = await _query_latest_batch(assessment_type, sorted({c for c, _ in missing}), missing)
+        sources.update((k, (body, "adx")) for k, body in found.items())
+
+    empty = _LATEST_LIVE[assessment_type][1]([])
+    results: List[Dict[str, Any]] = []
+    counts: Dict[str, int] = {}
+    for key in keys:
+        body, source = sources.get(key, (None, "empty"))
+        counts[source] = counts.get(source, 0) + 1
+        payload = json_codec.loads(body) if body is not None else empty
+        c, p = labels.get(key, key)
+        results.append({"customer": c, "participant": p, **payload})
+    return results, counts
+
+
+def _batch_keys(
+    req: func.HttpRequest,
+) -> Tuple[str, List[Tuple[str, str]], Dict[Tuple[str, str], Tuple[str, str]]]:
+    """-> (customer key, normalised keys, labels as sent) from ?customer= (GET) or
+    {"customer", "participants", "keys"} (POST)."""
+    if req.method == "GET":
+        body: Dict[str, Any] = {"customer": req.params.get("customer")}
+    else:
+        body = req.get_json()
+        if not isinstance(body, dict):
+            raise ValueError("Body must be a JSON object")
+    customer = str(body.get("customer") or "").strip()
+    pairs = [(customer, participant) for participant in body.get("participants") or []]
+    for k in body.get("keys") or []:
+        if not isinstance(k, dict):
+            raise ValueError("keys must be objects with customer and participant")
+        pairs.append((k.get("customer") or customer, k.get("participant")))
+    keys: List[Tuple[str, str]] = []
+    labels: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    for c, p in pairs:
+        key = (normalize_key(c), normalize_key(p))
+        if not key[0] or not key[1]:
+            raise ValueError("Every key needs a customer and a participant")
+        if key not in labels:
+            keys.append(key)
+            labels[key] = (str(c).strip(), str(p).strip())
+    if not keys and not customer:
+        raise ValueError("Pass customer, participants or keys")
+    if len(keys) > LATEST_BATCH_MAX_KEYS:
+        raise ValueError(f"At most {LATEST_BATCH_MAX_KEYS} keys per request")
+    return normalize_key(customer), keys, labels
+
+
+def _accepted(p: AssessmentPipeline, row: Dict[str, Any]) -> None:
+    for hook in p.accepted:
+        try:
+            hook(row)
+        except Exception:
+            logging.exception("%s accepted hook %s failed", p.name, getattr(hook, "__name__", hook))
+
+# ---------------- Assessment pipelines ----------------
+# Every track runs through the same engine below; a new track is one register() call plus _expose().
+_pipelines = PipelineRegistry()
+_pipeline_stats = PipelineStats()
+
+AIX_PIPELINE = _pipelines.register(AssessmentPipeline(
+    name=AIX_TYPE,
+    route="score_and_push",
+    table=ADX_TABLE,
+    mapping=ADX_MAPPING,
+    validate=_validate,
+    build_row=_build_row,
+    accepted=(functools.partial(_index_latest, AIX_TYPE),),
+    dev_note="cache updated",
+    time_column="timestamp_utc",
+))
+AI_PIPELINE = _pipelines.register(AssessmentPipeline(
+    name=AI_TYPE,
+    route="ai_readiness_score_and_push",
+    table=AI_ADX_TABLE,
+    mapping=AI_ADX_MAPPING,
+    validate=_validate_ai_readiness,
+    build_row=_build_ai_row,
+    accepted=(functools.partial(_index_latest, AI_TYPE),),
+    label="AI ",
+    dev_note="AI row built",
+))
+DIGITAL_PIPELINE = _pipelines.register(AssessmentPipeline(
+    name=DIGITAL_TYPE,
+    route="digital_readiness_score_and_push",
+    table=DIGITAL_ADX_TABLE,
+    mapping=DIGITAL_ADX_MAPPING,
+    validate=_validate_digital,
+    build_row=_build_digital_row,
+    accepted=(functools.partial(_index_latest, DIGITAL_TYPE),),
+    label="Digital ",
+    dev_note="digital row built",
+))
+
+
+def _prepare(
+    p: AssessmentPipeline, req: func.HttpRequest, clock: StageClock
+) -> func.HttpResponse | Tuple[Dict[str, Any], bytes]:
+    """parse -> validate -> hooks -> build -> encode; an HttpResponse means stop and answer it."""
+    try:
+        body = json_codec.loads(req.get_body())
+    except ValueError:
+        return func.HttpResponse("Invalid JSON", status_code=400)
+    clock.mark("parse")
+    try:
+        p.validate(body)
+    except Exception as e:
+        return func.HttpResponse(str(e), status_code=400)
+    clock.mark("validate")
+
+    if p.hooks:
+        for hook in p.hooks:
+            try:
+                hook(body)
+            except Exception:
+                logging.exception("%s hook %s failed", p.name, getattr(hook, "__name__", hook))
+        clock.mark("hooks")
+
+    try:
+        row = p.build_row(body)
+    except Exception as e:
+        return func.HttpResponse(f"Timestamp/shape error: {e}", status_code=400)
+    clock.mark("build")
+
+    # Allow success in dev when no ingest URI
+    if not KUSTO_INGEST_URI:
+        _accepted(p, row)
+        return func.HttpResponse(f"Accepted (no KUSTO_INGEST_URI; {p.dev_note})", status_code=200)
+    event_bytes = json_codec.dumps_line(row)
+    clock.mark("encode")
+    return row, event_bytes
+
+
+def _finish(
+    p: AssessmentPipeline, clock: StageClock, resp: func.HttpResponse, mode: str
+) -> func.HttpResponse:
+    _pipeline_stats.record(p.name, clock, resp.status_code, mode)
+    resp.headers["Server-Timing"] = clock.server_timing()
+    return resp
+
+
+def _dead_letter_if_failed(p: AssessmentPipeline, event_bytes: bytes, fut: Future) -> None:
+    result = fut.result()
+    if not result.ok:
+        _dead_letter_rows(p.table, p.mapping, [event_bytes], result.detail, result.status_code)
+
+
+def _submit_ingest(p: AssessmentPipeline, event_bytes: bytes) -> func.HttpResponse:
+    """Spool (202 + receipt) or, failing that, ride the shared batcher and wait for the batch."""
+    spooled = _spool_accept(p.table, p.mapping, event_bytes)
+    if spooled is not None:
+        return spooled
+
+    try:
+        fut = _batcher.submit(p.table, p.mapping, event_bytes)
+    except Exception as e:
+        # Not queued (batcher shutting down): nothing was sent, so the client's retry is the copy.
+        logging.exception("%singest exception", p.label)
+        return func.HttpResponse(f"Exception: {e}", status_code=503, headers={"Retry-After": "5"})
+    try:
+        result = fut.result(timeout=INGEST_WAIT_TIMEOUT)
+    except FuturesTimeout:
+        if _batcher.withdraw(fut):
+            # Never sent: nothing to dead-letter, the client's retry is the only copy.
+            logging.warning("%singest timed out in the batch queue; row withdrawn", p.label)
+            return func.HttpResponse(
+                "Ingest queue is backed up; not ingested, retry later",
+                status_code=503, headers={"Retry-After": "5"},
+            )
+        # Already being sent: the outcome is unknown here. Dead-letter only if the batch fails.
+        fut.add_done_callback(functools.partial(_dead_letter_if_failed, p, event_bytes))
+        return func.HttpResponse(
+            json_codec.dumps({"status": "pending", "detail": "ingest in progress; outcome unknown"}),
+            status_code=202, mimetype="application/json",
+        )
+    if result.status_code is None:
+        _dead_letter_rows(p.table, p.mapping, [event_bytes], f"Exception: {result.detail}")
+        return func.HttpResponse(f"Exception: {result.detail}", status_code=500)
+    if not result.ok:
+        _dead_letter_rows(p.table, p.mapping, [event_bytes], result.detail, result.status_code)
+        logging.error(
+            "%sADX ingest failed: %s %s", p.label, result.status_code, result.detail
+        )
+        return func.HttpResponse(
+            f"{p.label}ADX ingest error: {result.detail}", status_code=502
+        )
+    return func.HttpResponse("Accepted", status_code=200)
+
+
+def _run_ingest(p: AssessmentPipeline, req: func.HttpRequest) -> func.HttpResponse:
+    clock = StageClock()
+    prepared = _prepare(p, req, clock)
+    if isinstance(prepared, func.HttpResponse):
+        return _finish(p, clock, prepared, "sync")
+    row, event_bytes = prepared
+    resp = _submit_ingest(p, event_bytes)
+    if resp.status_code in (200, 202):
+        _accepted(p, row)
+    clock.mark("ingest")
+    return _finish(p, clock, resp, "sync")
+
+
+async def _run_ingest_async(p: AssessmentPipeline, req: func.HttpRequest) -> func.HttpResponse:
+    clock = StageClock()
+    prepared = _prepare(p, req, clock)
+    if isinstance(prepared, func.HttpResponse):
+        return _finish(p, clock, prepared, "async")
+    row, event_bytes = prepared
+    resp = await _ingest_async(p.table, p.mapping, event_bytes, p.label)
+    if resp.status_code in (200, 202):
+        _accepted(p, row)
+    clock.mark("ingest")
+    return _finish(p, clock, resp, "async")
+
+# ---------------- Bulk ingest helpers ----------------
+BULK_MAX_ROWS = int(os.environ.get("BULK_MAX_ROWS", "50000"))
+
+
+def _parse_bulk_body(raw: bytes) -> List[Any]:
+    """A JSON array, or NDJSON (one object per line). Bad NDJSON lines come back as ValueErrors."""
+    if raw.lstrip().startswith(b"["):
+        items = json_codec.loads(raw)
+        if not isinstance(items, list):
+            raise ValueError("expected a JSON array")
+        return items
+    items: List[Any] = []
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            items.append(json_codec.loads(line))
+        except ValueError as e:
+            items.append(ValueError(f"Invalid JSON: {e}"))
+    return items
+
+
+def _chunk_by_bytes(lines: List[bytes], max_bytes: int) -> List[Tuple[int, int]]:
+    chunks, start, size = [], 0, 0
+    for i, line in enumerate(lines):
+        if i > start and size + len(line) > max_bytes:
+            chunks.append((start, i))
+            start, size = i, 0
+        size += len(line)
+    if start < len(lines):
+        chunks.append((start, len(lines)))
+    return chunks
+
+
+def _bulk_ingest(p: AssessmentPipeline, req: func.HttpRequest) -> func.HttpResponse:
+    clock = StageClock()
+    try:
+        items = _parse_bulk_body(req.get_body() or b"")
+    except ValueError:
+        return _finish(p, clock, func.HttpResponse("Invalid JSON", status_code=400), "bulk")
+    clock.mark("parse")
+    if not items:
+        return _finish(p, clock, func.HttpResponse("No rows in request body", status_code=400), "bulk")
+    if len(items) > BULK_MAX_ROWS:
+        resp = func.HttpResponse(f"Too many rows ({len(items)} > {BULK_MAX_ROWS})", status_code=413)
+        return _finish(p, clock, resp, "bulk")
+    table, mapping = p.table, p.mapping
+
+    # Same validation + row shaping as the single-row routes, applied per row.
+    results: List[Dict[str, Any]] = [{} for _ in items]
+    lines: List[bytes] = []
+    line_rows: List[Dict[str, Any]] = []
+    line_index: List[int] = []
+    line_keys: List[str | None] = []
+    batch_keys = set()
+    for i, item in enumerate(items):
+        try:
+            if isinstance(item, Exception):
+                raise item
+            if not isinstance(item, dict):
+                raise ValueError("row must be a JSON object")
+            p.validate(item)
+            key = _idempotency_key(p.name, None, item)
+            if key is not None and (key in batch_keys or _idempotency.seen(key)):
+                results[i] = {"index": i, "status": "duplicate"}
+                continue
+            row = p.build_row(item)
+        except Exception as e:
+            results[i] = {"index": i, "status": "rejected", "error": str(e)}
+            continue
+        if key is not None:
+            batch_keys.add(key)
+        lines.append(json_codec.dumps_line(row))
+        line_rows.append(row)
+        line_index.append(i)
+        line_keys.append(key)
+    clock.mark("shape")
+
+    for start, end in _chunk_by_bytes(lines, INGEST_BATCH_MAX_BYTES):
+        error = None
+        if KUSTO_INGEST_URI:
+            status = None
+            try:
+                status, text = _send_ingest(table, mapping, b"".join(lines[start:end]))
+                if status not in (200, 202):
+                    logging.error("ADX bulk ingest failed (%s): %s %s", table, status, text)
+                    error = f"ADX ingest error: {text}"
+            except Exception as e:
+                logging.exception("Bulk ingest exception (%s)", table)
+                error = f"Exception: {e}"
+            if error is not None:
+                _dead_letter_rows(table, mapping, lines[start:end], error, status)
+        for k in range(start, end):
+            i = line_index[k]
+            results[i] = (
+                {"index": i, "status": "accepted"}
+                if error is None
+                else {"index": i, "status": "failed", "error": error}
+            )
+            if error is None:
+                _accepted(p, line_rows[k])
+                if line_keys[k] is not None:
+                    _idempotency.remember(line_keys[k], CachedResponse(200, b"Accepted", None))
+
+    clock.mark("ingest")
+
+    counts = {"accepted": 0, "rejected": 0, "failed": 0, "duplicate": 0}
+    for r in results:
+        counts[r["status"]] += 1
+    payload = {**counts, "total": len(items), "results": results}
+    resp = func.HttpResponse(
+        json_codec.dumps(payload),
+        status_code=200 if counts["accepted"] + counts["duplicate"] == len(items) else 207,
+        mimetype="application/json",
+    )
+    return _finish(p, clock, resp, "bulk")
+
 # ---------------- Routes ----------------
 
 # Health ping
@@ -267,84 +1132,278 @@ def health(req: func.HttpRequest) -> func.HttpResponse:
     payload = {"status": "ok", "kusto": "skipped"}
     try:
         if KUSTO_DATA_URI:
-            client = _kusto_query_client()
-            result = client.execute_query(ADX_DB, "print 1")
+            result = _kusto_execute("print 1")
             _ = list(result.primary_results[0])[0][0]
             payload["kusto"] = "ok"
     except Exception as ex:
         payload["kusto"] = f"error: {str(ex)}"
         return func.HttpResponse(
-            json.dumps(payload),
+            json_codec.dumps(payload),
             status_code=500,
             mimetype="application/json",
         )
     return func.HttpResponse(
-        json.dumps(payload),
+        json_codec.dumps(payload),
         status_code=200,
         mimetype="application/json",
     )
 
-# POST /api/score_and_push  (FUNCTION key) — ingest + update cache
-@app.function_name("score_and_push")
+# GET /api/ingest_stats  (FUNCTION key) — ingest transport counters
+@app.function_name("ingest_stats")
+@app.route(route="ingest_stats", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
+def ingest_stats(req: func.HttpRequest) -> func.HttpResponse:
+    payload = {
+        "transport": ingest_transport.stats(),
+        "batcher": _batcher.stats(),
+        "tokens": token_cache.stats(),
+        "kusto_clients": _kusto_pool.stats(),
+        "async_transport": async_adx.stats(),
+        "spool": _spool.stats(),
+        "dead_letter": _dead_letter.stats(),
+        "compression": ingest_gzip.stats(),
+        "idempotency": _idempotency.stats(),
+        "pipelines": _pipeline_stats.stats(),
+        "json_codec": json_codec.stats(),
+        "scoring": scoring.stats(),
+        "live_cache": _live_cache.stats(),
+        "latest_index": _latest_index.stats(),
+        "latest_store": _latest_store.stats(),
+        "live_events": _live_events.stats(),
+        "latest_views": _latest_views.stats(),
+    }
+    return func.HttpResponse(
+        json_codec.dumps(payload),
+        status_code=200,
+        mimetype="application/json",
+    )
+
+# /api/dead_letters[/requeue|/purge]  (ADMIN key) — operator view of failed ingests
+#   GET  /api/dead_letters?state=&table=&limit=&offset=
+#   POST /api/dead_letters/requeue   {"ids": [...]} or {"state": "parked"} (empty body = all)
+#   POST /api/dead_letters/purge     {"ids": [...]} or {"state": "parked"} (empty body = all)
+@app.function_name("dead_letters")
 @app.route(
-    route="score_and_push",
-    methods=["POST"],
-    auth_level=func.AuthLevel.FUNCTION,
+    route="dead_letters/{action?}",
+    methods=["GET", "POST"],
+    auth_level=func.AuthLevel.ADMIN,
 )
-def score_and_push(req: func.HttpRequest) -> func.HttpResponse:
+def dead_letters(req: func.HttpRequest) -> func.HttpResponse:
+    action = (req.route_params.get("action") or "").lower()
     try:
-        body = req.get_json()
-    except ValueError:
-        return func.HttpResponse("Invalid JSON", status_code=400)
-    try:
-        _validate(body)
-    except Exception as e:
+        if req.method == "GET" and not action:
+            entries = _dead_letter.list(
+                state=req.params.get("state") or None,
+                table=req.params.get("table") or None,
+                limit=int(req.params.get("limit") or 100),
+                offset=int(req.params.get("offset") or 0),
+            )
+            payload: Dict[str, Any] = {"entries": entries, "stats": _dead_letter.stats()}
+        elif req.method == "POST" and action in ("requeue", "purge"):
+            try:
+                body = json_codec.loads(req.get_body()) if req.get_body() else {}
+            except ValueError:
+                return func.HttpResponse("Invalid JSON", status_code=400)
+            if not isinstance(body, dict):
+                return func.HttpResponse("Body must be a JSON object", status_code=400)
+            ids = body.get("ids") or None
+            state = body.get("state") or None
+            if ids is not None and not (isinstance(ids, list) and all(type(i) is int for i in ids)):
+                raise ValueError("ids must be a list of integers")
+            if state is not None and not isinstance(state, str):
+                raise ValueError("state must be a string")
+            op = _dead_letter.requeue if action == "requeue" else _dead_letter.purge
+            payload = {action: op(ids=ids, state=state)}
+        else:
+            return func.HttpResponse("Unsupported dead_letters action", status_code=404)
+    except ValueError as e:
         return func.HttpResponse(str(e), status_code=400)
+    return func.HttpResponse(
+        json_codec.dumps(payload),
+        status_code=200,
+        mimetype="application/json",
+    )
+
+# GET /api/ingest_receipts/{receipt_id}  (FUNCTION key) — state of a spooled row
+@app.function_name("ingest_receipt_status")
+@app.route(
+    route="ingest_receipts/{receipt_id}",
+    methods=["GET"],
+    auth_level=func.AuthLevel.FUNCTION,
+)
+def ingest_receipt_status(req: func.HttpRequest) -> func.HttpResponse:
+    receipt_id = req.route_params.get("receipt_id", "")
+    status = _spool.status(receipt_id)
+    if status is None:
+        return func.HttpResponse(
+            json_codec.dumps({"error": "unknown receipt", "receipt_id": receipt_id}),
+            status_code=404,
+            mimetype="application/json",
+        )
+    return func.HttpResponse(
+        json_codec.dumps(status),
+        status_code=200,
+        mimetype="application/json",
+    )
 
-    # Update local cache (best-effort) with enforced time
+# ---------------- Ingest routes (one set per registered pipeline) ----------------
+# POST /api/<route>        (FUNCTION key) — validate, run hooks, spool/batch to ADX
+# POST /api/<route>_async  (FUNCTION key) — same contract; HTTP/2 multiplexed POST
+# POST /api/<route>_bulk   (FUNCTION key) — JSON array or NDJSON body; per-row results
+# Responses carry Server-Timing with the engine's per-stage durations.
+def _expose(p: AssessmentPipeline) -> Callable[[func.HttpRequest], func.HttpResponse]:
+    @app.function_name(p.route)
+    @app.route(route=p.route, methods=["POST"], auth_level=func.AuthLevel.FUNCTION)
+    @_idempotent(p.name)
+    def ingest(req: func.HttpRequest) -> func.HttpResponse:
+        return _run_ingest(p, req)
+
+    @app.function_name(f"{p.route}_async")
+    @app.route(route=f"{p.route}_async", methods=["POST"], auth_level=func.AuthLevel.FUNCTION)
+    @_idempotent(p.name)
+    async def ingest_async(req: func.HttpRequest) -> func.HttpResponse:
+        return await _run_ingest_async(p, req)
+
+    @app.function_name(f"{p.route}_bulk")
+    @app.route(route=f"{p.route}_bulk", methods=["POST"], auth_level=func.AuthLevel.FUNCTION)
+    def ingest_bulk(req: func.HttpRequest) -> func.HttpResponse:
+        return _bulk_ingest(p, req)
+
+    return ingest
+
+
+# AIX: accepted rows are written through to the latest index/store (as for every track),
+# which is what /api/tech_health_latest serves
+score_and_push = _expose(AIX_PIPELINE)
+
+# AI Readiness: {timestamp, session_id, customer, industry, participant_name, participant_role,
+#   org, answers[21], total_105, percent, level, maturity, notes}
+ai_readiness_score_and_push = _expose(AI_PIPELINE)
+
+# Digital Readiness: same shape with answers[28] and total_140
+digital_readiness_score_and_push = _expose(DIGITAL_PIPELINE)
+
+# GET /api/export/{assessment}?customer=&industry=&from=&to=&limit=&cursor=  (FUNCTION key)
+# assessment = aix | ai_readiness | digital_readiness. Body is NDJSON, oldest row first; while
+# X-Continuation-Cursor is present, pass it back as ?cursor= (same filters) for the next page.
+@app.function_name("export_rows")
+@app.route(route="export/{assessment}", methods=["GET"], auth_level=func.AuthLevel.FUNCTION)
+def export_rows(req: func.HttpRequest) -> func.HttpResponse:
+    name = (req.route_params.get("assessment") or "").upper()
+    if name not in _pipelines.names():
+        return func.HttpResponse(f"Unknown assessment: {name.lower()}", status_code=404)
+    p = _pipelines.get(name)
     try:
-        _write_latest_cache(body)
-    except Exception:
-        logging.exception("Failed to write latest cache")
+        filters = {
+            "assessment": p.name,
+            "customer": normalize_key(req.params.get("customer")),
+            "industry": (req.params.get("industry") or "").strip(),
+        }
+        for key in ("from", "to"):
+            value = (req.params.get(key) or "").strip()
+            filters[key] = _parse_iso_to_utc(value).isoformat() if value else ""
+        limit = int(req.params.get("limit") or ndjson_export.EXPORT_PAGE_ROWS)
+        if not 1 <= limit <= ndjson_export.EXPORT_PAGE_MAX_ROWS:
+            raise ValueError(f"limit must be between 1 and {ndjson_export.EXPORT_PAGE_MAX_ROWS}")
+        token = req.params.get("cursor")
+        cursor = ndjson_export.decode_cursor(token, filters) if token else None
+    except ValueError as e:
+        return func.HttpResponse(str(e), status_code=400)
 
-    # Shape row for ADX (enforced UTC time)
+    params = ndjson_export.query_parameters(filters, cursor, limit + 1, _utc_now_iso())
+    query = ndjson_export.EXPORT_QUERY.format(
+        table=p.table, time_column=p.time_column, customer_match=_CUSTOMER_MATCH
+    )
     try:
-        row = _build_row(body)
-    except Exception as e:
-        return func.HttpResponse(f"Timestamp/shape error: {e}", status_code=400)
+        from azure.kusto.data import ClientRequestProperties
 
-    # Allow success in dev when no ingest URI
-    if not KUSTO_INGEST_URI:
+        if not KUSTO_DATA_URI:
+            raise RuntimeError("KUSTO_DATA_URI is not set")
+        props = ClientRequestProperties()
+        for key, value in params.items():
+            props.set_parameter(key, value)
+        resp = _kusto_pool.execute_streaming(KUSTO_DATA_URI, ADX_DB, query, props)
+        try:
+            table = next(iter(resp.iter_primary_results()), None)
+            if table is None:
+                page = ndjson_export.Page(b"", 0, None)
+            else:
+                page = ndjson_export.write_page(
+                    [c.column_name for c in table.columns], table, limit,
+                    p.time_column, params["p_until"], filters, after=cursor,
+                )
+        finally:
+            close = getattr(resp, "close", None)
+            if callable(close):
+                close()
+    except Exception as ex:
+        logging.exception("%s export error", p.name)
         return func.HttpResponse(
-            "Accepted (no KUSTO_INGEST_URI; cache updated)", status_code=200
+            json_codec.dumps({"error": str(ex)}),
+            mimetype="application/json",
+            status_code=500,
         )
-
-    ingest_url = (
-        f"{KUSTO_INGEST_URI}/v1/rest/ingest/{ADX_DB}/{ADX_TABLE}"
-        f"?streamFormat=json&mappingName={ADX_MAPPING}"
-    )
-    event_bytes = (json.dumps(row) + "\n").encode("utf-8")
+    headers = {"X-Row-Count": str(page.rows)}
+    if page.next_cursor:
+        headers["X-Continuation-Cursor"] = page.next_cursor
+    return func.HttpResponse(page.body, status_code=200, mimetype="application/x-ndjson", headers=headers)
+
+# GET /api/events/{assessment}?customer=&participant=&timeout=  (push of accepted rows; ANONYMOUS)
+# assessment = aix | ai_readiness | digital_readiness. Holds the request until a matching row is
+# accepted on this instance (or `timeout` seconds, max LIVE_EVENTS_HOLD_S), then returns. With
+# Accept: text/event-stream the body is SSE: EventSource reconnects after `retry` ms and sends
+# Last-Event-ID itself, so it behaves like one stream. Otherwise JSON long-poll:
+# {"events": [...], "last_event_id": ..., "reset": bool}; pass last_event_id back as ?last_event_id=.
+# "reset" means updates may have been missed (restart, other instance, buffer overrun): refetch
+# *_latest_live once and carry on from the returned id.
+LIVE_EVENTS_RETRY_MS = 500
+
+
+def _sse_body(events: list, last_id: str, reset: bool) -> bytes:
+    lines = [f"retry: {LIVE_EVENTS_RETRY_MS}\n".encode()]
+    if reset:
+        lines.append(f"id: {last_id}\nevent: reset\ndata: {{}}\n\n".encode())
+    for e in events:
+        lines.append(f"id: {_live_events.event_id(e.seq)}\nevent: score\ndata: ".encode() + e.data + b"\n\n")
+    if not events and not reset:
+        # Nothing happened during the hold: keep the client's resume point moving forward.
+        lines.append(f": heartbeat\nid: {last_id}\n\n".encode())
+    return b"".join(lines)
+
+
+@app.function_name("live_events")
+@app.route(route="events/{assessment}", methods=["GET"], auth_level=func.AuthLevel.ANONYMOUS)
+async def live_events(req: func.HttpRequest) -> func.HttpResponse:
+    name = (req.route_params.get("assessment") or "").upper()
+    if name not in _LATEST_LIVE:
+        return func.HttpResponse(f"Unknown assessment: {name.lower()}", status_code=404)
+    params = _live_params(req)
+    last_event_id = req.headers.get("Last-Event-ID") or req.params.get("last_event_id") or ""
+    try:
+        hold_s = min(max(float(req.params.get("timeout") or LIVE_EVENTS_HOLD_S), 0.0), LIVE_EVENTS_HOLD_S)
+    except ValueError:
+        return func.HttpResponse("timeout must be a number of seconds", status_code=400)
+    sse = "text/event-stream" in (req.headers.get("Accept") or "")
 
     try:
-        token = _get_ingest_token()
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json; charset=utf-8",
-        }
-        resp = requests.post(
-            ingest_url, headers=headers, data=event_bytes, timeout=30
+        events, seq, reset = await _live_events.wait(
+            name, params["p_customer"], params["p_participant"], last_event_id.strip(), hold_s
         )
-        if resp.status_code not in (200, 202):
-            logging.error(
-                "ADX ingest failed: %s %s", resp.status_code, resp.text
-            )
-            return func.HttpResponse(
-                f"ADX ingest error: {resp.text}", status_code=502
-            )
-        return func.HttpResponse("Accepted", status_code=200)
-    except Exception as e:
-        logging.exception("Ingest exception")
-        return func.HttpResponse(f"Exception: {e}", status_code=500)
+    except TooManySubscribers:
+        return func.HttpResponse(
+            "Too many live subscribers", status_code=503, headers={"Retry-After": "5"}
+        )
+    last_id = _live_events.event_id(seq)
+    headers = {"Cache-Control": "no-cache", "X-Last-Event-ID": last_id}
+    if sse:
+        return func.HttpResponse(
+            _sse_body(events, last_id, reset), status_code=200, mimetype="text/event-stream", headers=headers
+        )
+    payload = {
+        "events": [{"id": _live_events.event_id(e.seq), **json_codec.loads(e.data)} for e in events],
+        "last_event_id": last_id,
+        "reset": reset,
+    }
+    return func.HttpResponse(json_codec.dumps(payload), status_code=200, mimetype="application/json", headers=headers)
 
 # GET /api/tech_health_latest  (cache; ANONYMOUS)
 @app.function_name("tech_health_latest")
@@ -355,20 +1414,19 @@ def score_and_push(req: func.HttpRequest) -> func.HttpResponse:
 )
 def tech_health_latest_get(req: func.HttpRequest) -> func.HttpResponse:
     try:
-        if os.path.exists(LATEST_CACHE_PATH):
-            with open(LATEST_CACHE_PATH, "r") as f:
-                payload = f.read()
-        else:
-            payload = json.dumps(
+        # Latest accepted AIX row on this instance, surviving restarts via the SQLite store.
+        payload, outcome = _latest_index.get(AIX_TYPE, "", ""), "index"
+        if payload is None:
+            payload, outcome = _stored_latest(AIX_TYPE, "", "", 0), "store"
+        if payload is None:
+            payload, outcome = json_codec.dumps(
                 {"score": 0, "max": 500, "level": "", "timestamp": ""}
-            )
-        return func.HttpResponse(
-            payload, mimetype="application/json", status_code=200
-        )
+            ), "empty"
+        return _live_response(req, payload, outcome)
     except Exception as e:
         logging.exception("latest read error")
         return func.HttpResponse(
-            json.dumps({"error": str(e)}),
+            json_codec.dumps({"error": str(e)}),
             mimetype="application/json",
             status_code=500,
         )
@@ -382,51 +1440,31 @@ def tech_health_latest_get(req: func.HttpRequest) -> func.HttpResponse:
 )
 def tech_health_latest_live(req: func.HttpRequest) -> func.HttpResponse:
     try:
-        customer = (req.params.get("customer") or "").strip()
-        participant = (req.params.get("participant") or "").strip()
-
-        query = f"""
-declare query_parameters(p_customer:string = "", p_participant:string = "");
-{ADX_TABLE}
-| where (p_customer == "" or customer == p_customer)
-| where (p_participant == "" or participant_name == p_participant)
-| where isnotempty(timestamp_utc)
-| top 1 by todatetime(timestamp_utc) desc
-| project overall_score_500, timestamp_utc
-"""
-        props = ClientRequestProperties()
-        props.set_parameter("p_customer", customer)
-        props.set_parameter("p_participant", participant)
-
-        client = _kusto_query_client()
-        resp = client.execute_query(ADX_DB, query, props)
-
-        table = resp.primary_results[0] if resp.primary_results else None
-        if not table or table.rows_count == 0:
-            return func.HttpResponse(
-                json.dumps(
-                    {"score": 0, "max": 500, "level": "", "timestamp": ""}
-                ),
-                status_code=200,
-                mimetype="application/json",
-            )
-
-        row0 = table.rows[0]  # DataRow
-        score = int((row0["overall_score_500"] or 0))
-        ts = str(row0["timestamp_utc"])
-
-        level = _level_from_score(score)
+        body, outcome = _latest_live(AIX_TYPE, _live_params(req))
+        return _live_response(req, body, outcome)
+    except Exception as ex:
+        logging.exception("live latest error")
         return func.HttpResponse(
-            json.dumps(
-                {"score": score, "max": 500, "level": level, "timestamp": ts}
-            ),
+            json_codec.dumps({"error": str(ex)}),
             mimetype="application/json",
-            status_code=200,
+            status_code=500,
         )
+
+# GET /api/tech_health_latest_live_async  (same contract; async HTTP/2 query path)
+@app.function_name("tech_health_latest_live_async")
+@app.route(
+    route="tech_health_latest_live_async",
+    methods=["GET"],
+    auth_level=func.AuthLevel.ANONYMOUS,
+)
+async def tech_health_latest_live_async(req: func.HttpRequest) -> func.HttpResponse:
+    try:
+        body, outcome = await _latest_live_async(AIX_TYPE, _live_params(req))
+        return _live_response(req, body, outcome)
     except Exception as ex:
-        logging.exception("live latest error")
+        logging.exception("live latest error (async)")
         return func.HttpResponse(
-            json.dumps({"error": str(ex)}),
+            json_codec.dumps({"error": str(ex)}),
             mimetype="application/json",
             status_code=500,
         )
@@ -445,215 +1483,113 @@ def digital_readiness_latest_live(req: func.HttpRequest) -> func.HttpResponse:
     in a dial-friendly format.
     """
     try:
-        customer = (req.params.get("customer") or "").strip()
-        participant = (req.params.get("participant") or "").strip()
-
-        query = f"""
-declare query_parameters(p_customer:string = "", p_participant:string = "");
-{DIGITAL_ADX_TABLE}
-| where (p_customer == "" or customer == p_customer)
-| where (p_participant == "" or participant_name == p_participant)
-| where isnotempty(timestamp)
-| top 1 by todatetime(timestamp) desc
-| project customer,
-          participant_name,
-          timestamp,
-          total_140,
-          percent,
-          level,
-          maturity
-"""
-        props = ClientRequestProperties()
-        props.set_parameter("p_customer", customer)
-        props.set_parameter("p_participant", participant)
-
-        client = _kusto_query_client()
-        resp = client.execute_query(ADX_DB, query, props)
-
-        table = resp.primary_results[0] if resp.primary_results else None
-        if not table or table.rows_count == 0:
-            return func.HttpResponse(
-                json.dumps(
-                    {
-                        "score": 0,
-                        "max": 140,
-                        "percent": 0.0,
-                        "level": 0,
-                        "maturity": "",
-                        "timestamp": "",
-                    }
-                ),
-                status_code=200,
-                mimetype="application/json",
-            )
-
-        row0 = table.rows[0]
-        score = int(row0["total_140"] or 0)
-        percent = float(row0["percent"] or 0.0)
-        level = int(row0["level"] or 0)
-        maturity = str(row0["maturity"] or "")
-        ts = str(row0["timestamp"])
-
-        payload = {
-            "score": score,        # 0–140
-            "max": 140,
-            "percent": percent,    # 0–100
-            "level": level,        # 1–5
-            "maturity": maturity,  # Not Started / Initial / Developing / Advanced / Leading
-            "timestamp": ts,
-        }
-        return func.HttpResponse(
-            json.dumps(payload),
-            status_code=200,
-            mimetype="application/json",
-        )
+        body, outcome = _latest_live(DIGITAL_TYPE, _live_params(req))
+        return _live_response(req, body, outcome)
     except Exception as ex:
         logging.exception("digital_readiness_latest_live error")
         return func.HttpResponse(
-            json.dumps({"error": str(ex)}),
+            json_codec.dumps({"error": str(ex)}),
             status_code=500,
             mimetype="application/json",
         )
 
-# Reuse POST for tests
-@app.function_name("test_score_and_push")
+@app.function_name("digital_readiness_latest_live_async")
 @app.route(
-    route="test_score_and_push",
-    methods=["POST"],
-    auth_level=func.AuthLevel.FUNCTION,
+    route="digital_readiness_latest_live_async",
+    methods=["GET"],
+    auth_level=func.AuthLevel.ANONYMOUS,
 )
-def test_score_and_push(req: func.HttpRequest) -> func.HttpResponse:
-    return score_and_push(req)
+async def digital_readiness_latest_live_async(req: func.HttpRequest) -> func.HttpResponse:
+    """Async twin of digital_readiness_latest_live (HTTP/2 REST query, no worker thread held)."""
+    try:
+        body, outcome = await _latest_live_async(DIGITAL_TYPE, _live_params(req))
+        return _live_response(req, body, outcome)
+    except Exception as ex:
+        logging.exception("digital_readiness_latest_live_async error")
+        return func.HttpResponse(
+            json_codec.dumps({"error": str(ex)}),
+            status_code=500,
+            mimetype="application/json",
+        )
 
-# --------- AI Readiness ingest endpoint ---------
-@app.function_name("ai_readiness_score_and_push")
+# --------- AI Readiness latest (index, then ADX) ---------
+@app.function_name("ai_readiness_latest_live")
 @app.route(
-    route="ai_readiness_score_and_push",
-    methods=["POST"],
-    auth_level=func.AuthLevel.FUNCTION,
+    route="ai_readiness_latest_live",
+    methods=["GET"],
+    auth_level=func.AuthLevel.ANONYMOUS,
 )
-def ai_readiness_score_and_push(req: func.HttpRequest) -> func.HttpResponse:
-    """
-    POST /api/ai_readiness_score_and_push
-    Body:
-    {
-      "timestamp": "...", "session_id": "...", "customer": "...", "industry": "...",
-      "participant_name": "...", "participant_role": "...", "org": "...",
-      "answers": [...], "total_105": 90, "percent": 85.71,
-      "level": 5, "maturity": "Optimized", "notes": "..."
-    }
-    """
+def ai_readiness_latest_live(req: func.HttpRequest) -> func.HttpResponse:
+    """GET /api/ai_readiness_latest_live?customer=&participant= (same payload shape, max 105)."""
     try:
-        body = req.get_json()
-    except ValueError:
-        return func.HttpResponse("Invalid JSON", status_code=400)
-
-    try:
-        _validate_ai_readiness(body)
-    except Exception as e:
-        return func.HttpResponse(str(e), status_code=400)
-
-    try:
-        row = _build_ai_row(body)
-    except Exception as e:
-        return func.HttpResponse(f"Timestamp/shape error: {e}", status_code=400)
-
-    if not KUSTO_INGEST_URI:
+        body, outcome = _latest_live(AI_TYPE, _live_params(req))
+        return _live_response(req, body, outcome)
+    except Exception as ex:
+        logging.exception("ai_readiness_latest_live error")
         return func.HttpResponse(
-            "Accepted (no KUSTO_INGEST_URI; AI row built)", status_code=200
+            json_codec.dumps({"error": str(ex)}),
+            status_code=500,
+            mimetype="application/json",
         )
 
-    ingest_url = (
-        f"{KUSTO_INGEST_URI}/v1/rest/ingest/{ADX_DB}/{AI_ADX_TABLE}"
-        f"?streamFormat=json&mappingName={AI_ADX_MAPPING}"
-    )
-    event_bytes = (json.dumps(row) + "\n").encode("utf-8")
-
+@app.function_name("ai_readiness_latest_live_async")
+@app.route(
+    route="ai_readiness_latest_live_async",
+    methods=["GET"],
+    auth_level=func.AuthLevel.ANONYMOUS,
+)
+async def ai_readiness_latest_live_async(req: func.HttpRequest) -> func.HttpResponse:
     try:
-        token = _get_ingest_token()
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json; charset=utf-8",
-        }
-        resp = requests.post(
-            ingest_url, headers=headers, data=event_bytes, timeout=30
+        body, outcome = await _latest_live_async(AI_TYPE, _live_params(req))
+        return _live_response(req, body, outcome)
+    except Exception as ex:
+        logging.exception("ai_readiness_latest_live_async error")
+        return func.HttpResponse(
+            json_codec.dumps({"error": str(ex)}),
+            status_code=500,
+            mimetype="application/json",
         )
-        if resp.status_code not in (200, 202):
-            logging.error(
-                "AI ADX ingest failed: %s %s", resp.status_code, resp.text
-            )
-            return func.HttpResponse(
-                f"AI ADX ingest error: {resp.text}", status_code=502
-            )
-        return func.HttpResponse("Accepted", status_code=200)
-    except Exception as e:
-        logging.exception("AI ingest exception")
-        return func.HttpResponse(f"Exception: {e}", status_code=500)
 
-# --------- Digital Readiness ingest endpoint ---------
-@app.function_name("digital_readiness_score_and_push")
+# GET  /api/latest_batch/{assessment}?customer=             (every participant of a customer)
+# POST /api/latest_batch/{assessment}  {"customer", "participants": [...], "keys": [{customer, participant}]}
+# assessment = aix | ai_readiness | digital_readiness. Returns {"results": [...], "count": n}, one
+# result per key in request order (whole-customer: by participant), each the *_latest_live payload
+# plus customer and participant. X-Cache counts where the answers came from, e.g. "adx=3,index=17".
+@app.function_name("latest_batch")
 @app.route(
-    route="digital_readiness_score_and_push",
-    methods=["POST"],
-    auth_level=func.AuthLevel.FUNCTION,
+    route="latest_batch/{assessment}",
+    methods=["GET", "POST"],
+    auth_level=func.AuthLevel.ANONYMOUS,
 )
-def digital_readiness_score_and_push(req: func.HttpRequest) -> func.HttpResponse:
-    """
-    POST /api/digital_readiness_score_and_push
-    Body:
-    {
-      "timestamp": "...", "session_id": "...", "customer": "...", "industry": "...",
-      "participant_name": "...", "participant_role": "...", "org": "...",
-      "answers": [... 28 values ...], "total_140": 120, "percent": 85.71,
-      "level": 4, "maturity": "Advanced", "notes": "..."
-    }
-    """
+async def latest_batch(req: func.HttpRequest) -> func.HttpResponse:
+    name = (req.route_params.get("assessment") or "").upper()
+    if name not in _LATEST_LIVE:
+        return func.HttpResponse(f"Unknown assessment: {name.lower()}", status_code=404)
     try:
-        body = req.get_json()
-    except ValueError:
-        return func.HttpResponse("Invalid JSON", status_code=400)
-
-    try:
-        _validate_digital(body)
-    except Exception as e:
+        customer, keys, labels = _batch_keys(req)
+    except ValueError as e:
         return func.HttpResponse(str(e), status_code=400)
-
     try:
-        row = _build_digital_row(body)
-    except Exception as e:
-        return func.HttpResponse(f"Timestamp/shape error: {e}", status_code=400)
-
-    if not KUSTO_INGEST_URI:
+        results, counts = await _latest_batch(name, customer, keys, labels)
+    except Exception as ex:
+        logging.exception("latest_batch error")
         return func.HttpResponse(
-            "Accepted (no KUSTO_INGEST_URI; digital row built)", status_code=200
+            json_codec.dumps({"error": str(ex)}),
+            status_code=500,
+            mimetype="application/json",
         )
+    body = json_codec.dumps({"results": results, "count": len(results)})
+    outcome = ",".join(f"{k}={v}" for k, v in sorted(counts.items()))
+    if req.method == "GET":
+        return _live_response(req, body, outcome)
+    return func.HttpResponse(body, status_code=200, mimetype="application/json", headers={"X-Cache": outcome})
 
-    ingest_url = (
-        f"{KUSTO_INGEST_URI}/v1/rest/ingest/{ADX_DB}/{DIGITAL_ADX_TABLE}"
-        f"?streamFormat=json&mappingName={DIGITAL_ADX_MAPPING}"
-    )
-    event_bytes = (json.dumps(row) + "\n").encode("utf-8")
-
-    try:
-        token = _get_ingest_token()
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json; charset=utf-8",
-        }
-        resp = requests.post(
-            ingest_url, headers=headers, data=event_bytes, timeout=30
-        )
-        if resp.status_code not in (200, 202):
-            logging.error(
-                "Digital ADX ingest failed: %s %s",
-                resp.status_code,
-                resp.text,
-            )
-            return func.HttpResponse(
-                f"Digital ADX ingest error: {resp.text}", status_code=502
-            )
-        return func.HttpResponse("Accepted", status_code=200)
-    except Exception as e:
-        logging.exception("Digital ingest exception")
-        return func.HttpResponse(f"Exception: {e}", status_code=500)
-
+# Reuse POST for tests
+@app.function_name("test_score_and_push")
+@app.route(
+    route="test_score_and_push",
+    methods=["POST"],
+    auth_level=func.AuthLevel.FUNCTION,
+)
+def test_score_and_push(req: func.HttpRequest) -> func.HttpResponse:
+    return score_and_push(req)
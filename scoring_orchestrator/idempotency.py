@@ -0,0 +1,106 @@
+# idempotency.py — bounded recent-key store for idempotent ingest
+# Keys are "<assessment type>:<session_id>" (or a client Idempotency-Key header). An LRU holds the
+# cached response for recently completed keys (IDEMPOTENCY_MAX_KEYS, each kept IDEMPOTENCY_TTL_S);
+# a key that was evicted or expired is treated as new. Concurrent retries of an in-flight key wait
+# for the first attempt's response instead of ingesting twice.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+# ---------------- Config ----------------
+IDEMPOTENCY_MAX_KEYS = int(os.environ.get("IDEMPOTENCY_MAX_KEYS", "50000"))
+IDEMPOTENCY_TTL_S    = float(os.environ.get("IDEMPOTENCY_TTL_S", str(24 * 3600)))
+IDEMPOTENCY_WAIT_S   = float(os.environ.get("IDEMPOTENCY_WAIT_S", "35"))
+
+
+class CachedResponse(NamedTuple):
+    status_code: int
+    body: bytes
+    mimetype: Optional[str]
+
+
+class _InFlight:
+    __slots__ = ("event", "response")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.response: Optional[CachedResponse] = None
+
+
+class IdempotencyStore:
+    def __init__(self, max_keys: int = IDEMPOTENCY_MAX_KEYS, ttl_s: float = IDEMPOTENCY_TTL_S):
+        self.max_keys = max_keys
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._done: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, CachedResponse)
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._stats = {"hits": 0, "misses": 0, "waited": 0, "evictions": 0}
+
+    def _lookup(self, key: str) -> Optional[CachedResponse]:
+        hit = self._done.get(key)
+        if hit is None:
+            return None
+        expires_at, resp = hit
+        if expires_at < time.time():
+            del self._done[key]
+            return None
+        self._done.move_to_end(key)
+        return resp
+
+    def begin(self, key: str) -> Optional[CachedResponse]:
+        """Cached response for a duplicate, or None if the caller now owns the key."""
+        with self._lock:
+            resp = self._lookup(key)
+            if resp is not None:
+                self._stats["hits"] += 1
+                return resp
+            pending = self._in_flight.get(key)
+            if pending is None:
+                self._stats["misses"] += 1
+                self._in_flight[key] = _InFlight()
+                return None
+            self._stats["waited"] += 1
+
+        # Another request with the same key is mid-ingest: share its outcome.
+        pending.event.wait(IDEMPOTENCY_WAIT_S)
+        if pending.response is not None:
+            with self._lock:
+                self._stats["hits"] += 1
+            return pending.response
+        return self.begin(key) if pending.event.is_set() else None
+
+    def finish(self, key: str, response: Optional[CachedResponse]) -> None:
+        """Cache a successful (2xx) response; anything else releases the key for retries."""
+        with self._lock:
+            pending = self._in_flight.pop(key, None)
+            ok = response is not None and 200 <= response.status_code < 300
+            if ok:
+                self._store(key, response)
+        if pending is not None:
+            pending.response = response if ok else None
+            pending.event.set()
+
+    def remember(self, key: str, response: CachedResponse) -> None:
+        with self._lock:
+            self._store(key, response)
+
+    def seen(self, key: str) -> bool:
+        with self._lock:
+            return self._lookup(key) is not None or key in self._in_flight
+
+    def _store(self, key: str, response: CachedResponse) -> None:
+        self._done[key] = (time.time() + self.ttl_s, response)
+        self._done.move_to_end(key)
+        while len(self._done) > self.max_keys:
+            self._done.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["cached_keys"] = len(self._done)
+            out["in_flight"] = len(self._in_flight)
+        return out
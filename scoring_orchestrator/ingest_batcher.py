@@ -0,0 +1,233 @@
+# ingest_batcher.py — in-process micro-batcher for ADX streaming ingest
+# Rows headed for the same (table, mapping) are coalesced into one multi-line JSON body.
+# A batch is flushed when it hits INGEST_BATCH_MAX_ROWS / INGEST_BATCH_MAX_BYTES, when its
+# oldest row has waited INGEST_BATCH_MAX_DELAY_MS, or when the process shuts down.
+# A caller that stops waiting can withdraw() its row as long as its batch has not been handed to
+# send(); once the send starts, the row's outcome arrives on its future.
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+# ---------------- Config ----------------
+INGEST_BATCH_MAX_ROWS     = int(os.environ.get("INGEST_BATCH_MAX_ROWS", "500"))
+INGEST_BATCH_MAX_BYTES    = int(os.environ.get("INGEST_BATCH_MAX_BYTES", str(4 * 1024 * 1024)))  # ADX streaming limit
+INGEST_BATCH_MAX_DELAY_MS = float(os.environ.get("INGEST_BATCH_MAX_DELAY_MS", "50"))
+
+# send(table, mapping, body) -> (http_status, response_text)
+SendFn = Callable[[str, str, bytes], Tuple[int, str]]
+
+
+class IngestResult(NamedTuple):
+    ok: bool
+    status_code: Optional[int]  # None when the POST raised before a response came back
+    detail: str
+    batch_rows: int
+
+
+class _Pending:
+    __slots__ = ("key", "lines", "futures", "nbytes", "first_at")
+
+    def __init__(self, key: Tuple[str, str]):
+        self.key = key
+        self.lines: List[bytes] = []
+        self.futures: List[Future] = []
+        self.nbytes = 0
+        self.first_at = time.monotonic()
+
+    def add(self, line: bytes, fut: Future) -> None:
+        self.lines.append(line)
+        self.futures.append(fut)
+        self.nbytes += len(line)
+
+
+class IngestBatcher:
+    def __init__(
+        self,
+        send: SendFn,
+        max_rows: int = INGEST_BATCH_MAX_ROWS,
+        max_bytes: int = INGEST_BATCH_MAX_BYTES,
+        max_delay_ms: float = INGEST_BATCH_MAX_DELAY_MS,
+    ):
+        self._send = send
+        self.max_rows = max(1, max_rows)
+        self.max_bytes = max(1, max_bytes)
+        self.max_delay_s = max(0.0, max_delay_ms) / 1000.0
+
+        self._cond = threading.Condition()
+        self._pending: Dict[Tuple[str, str], _Pending] = {}
+        self._ready: Deque[Tuple[_Pending, str]] = deque()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._stats_lock = threading.Lock()
+        self._flushes = 0
+        self._rows = 0
+        self._bytes = 0
+        self._failed_flushes = 0
+        self._max_rows_seen = 0
+        self._reasons: Dict[str, int] = {}
+        self._latencies_ms: Deque[float] = deque(maxlen=512)
+
+    # ---------------- Producer side ----------------
+    def submit(self, table: str, mapping: str, line: bytes) -> "Future[IngestResult]":
+        """Queue one newline-terminated JSON row; the future resolves when its batch is sent."""
+        fut: Future = Future()
+        key = (table, mapping)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ingest batcher is closed")
+            self._ensure_thread()
+            p = self._pending.get(key)
+            if p is not None and p.nbytes + len(line) > self.max_bytes:
+                self._ready.append((self._pending.pop(key), "size"))
+                p = None
+            if p is None:
+                p = self._pending[key] = _Pending(key)
+            p.add(line, fut)
+            if len(p.lines) >= self.max_rows or p.nbytes >= self.max_bytes:
+                self._ready.append((self._pending.pop(key), "size"))
+            self._cond.notify()
+        return fut
+
+    def withdraw(self, fut: "Future[IngestResult]") -> bool:
+        """Take a row back out of its batch if the batch has not been handed to send() yet.
+
+        True means the row will never be sent (its future is cancelled); False means its batch
+        is already being sent (or done) and the future will still resolve.
+        """
+        with self._cond:
+            batches = list(self._pending.values()) + [p for p, _ in self._ready]
+            for p in batches:
+                for i, f in enumerate(p.futures):
+                    if f is fut:
+                        line = p.lines.pop(i)
+                        del p.futures[i]
+                        p.nbytes -= len(line)
+                        fut.cancel()
+                        return True
+        return False
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Send everything buffered right now and wait for those sends to finish."""
+        with self._cond:
+            futures = [f for p in self._pending.values() for f in p.futures]
+            futures += [f for p, _ in self._ready for f in p.futures]
+            while self._pending:
+                _, p = self._pending.popitem()
+                self._ready.append((p, "manual"))
+            self._cond.notify()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for f in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                f.result(timeout=remaining)
+            except CancelledError:
+                pass  # withdrawn
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Stop accepting rows, flush what is buffered and join the flusher thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    # ---------------- Flusher thread ----------------
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="adx-ingest-batcher", daemon=True
+            )
+            self._thread.start()
+
+    def _collect(self) -> Optional[Tuple[_Pending, str]]:
+        """The next batch to send. Batches are taken one at a time, so a row waiting behind a slow
+        send stays in _ready and can still be withdrawn."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                for key, p in list(self._pending.items()):
+                    if self._closed or now - p.first_at >= self.max_delay_s:
+                        reason = "shutdown" if self._closed else "delay"
+                        self._ready.append((self._pending.pop(key), reason))
+                while self._ready:
+                    p, reason = self._ready.popleft()
+                    if p.lines:  # empty when every row was withdrawn
+                        return p, reason
+                if self._closed:
+                    return None
+                timeout = None
+                if self._pending:
+                    oldest = min(p.first_at for p in self._pending.values())
+                    timeout = max(0.0, oldest + self.max_delay_s - now)
+                self._cond.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            self._flush(*batch)
+
+    def _flush(self, p: _Pending, reason: str) -> None:
+        table, mapping = p.key
+        body = b"".join(p.lines)
+        started = time.perf_counter()
+        try:
+            status, text = self._send(table, mapping, body)
+            result = IngestResult(status in (200, 202), status, text, len(p.lines))
+        except Exception as ex:
+            logging.exception("ADX batch ingest exception (%s)", table)
+            result = IngestResult(False, None, str(ex), len(p.lines))
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+        for f in p.futures:
+            f.set_result(result)
+
+        with self._stats_lock:
+            self._flushes += 1
+            self._rows += len(p.lines)
+            self._bytes += len(body)
+            self._max_rows_seen = max(self._max_rows_seen, len(p.lines))
+            self._reasons[reason] = self._reasons.get(reason, 0) + 1
+            self._latencies_ms.append(elapsed_ms)
+            if not result.ok:
+                self._failed_flushes += 1
+
+    # ---------------- Stats ----------------
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            lat = sorted(self._latencies_ms)
+            flushes = self._flushes
+            out: Dict[str, Any] = {
+                "flushes": flushes,
+                "failed_flushes": self._failed_flushes,
+                "rows": self._rows,
+                "bytes": self._bytes,
+                "avg_flush_rows": round(self._rows / flushes, 2) if flushes else 0.0,
+                "max_flush_rows": self._max_rows_seen,
+                "avg_flush_bytes": round(self._bytes / flushes, 1) if flushes else 0.0,
+                "flush_reasons": dict(self._reasons),
+            }
+        with self._cond:
+            out["buffered_rows"] = sum(len(p.lines) for p in self._pending.values())
+        if lat:
+            out["flush_latency_ms"] = {
+                "p50": round(lat[len(lat) // 2], 2),
+                "p95": round(lat[min(len(lat) - 1, int(len(lat) * 0.95))], 2),
+                "max": round(lat[-1], 2),
+            }
+        out["limits"] = {
+            "max_rows": self.max_rows,
+            "max_bytes": self.max_bytes,
+            "max_delay_ms": self.max_delay_s * 1000.0,
+        }
+        return out
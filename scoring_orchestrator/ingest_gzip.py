@@ -0,0 +1,64 @@
+# ingest_gzip.py — optional gzip compression of ADX streaming-ingest bodies
+# Enabled per table via INGEST_GZIP_TABLES ("*" for all, or a comma list of table names).
+# Bodies smaller than INGEST_GZIP_MIN_BYTES are sent as-is; the gzip frame overhead isn't worth it.
+# Raw vs. sent byte counts are kept per table so the egress saving per ingest route is visible.
+
+import gzip
+import os
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+# ---------------- Config ----------------
+INGEST_GZIP_TABLES    = {
+    t.strip() for t in os.environ.get("INGEST_GZIP_TABLES", "").split(",") if t.strip()
+}
+INGEST_GZIP_MIN_BYTES = int(os.environ.get("INGEST_GZIP_MIN_BYTES", "1024"))
+INGEST_GZIP_LEVEL     = min(9, max(1, int(os.environ.get("INGEST_GZIP_LEVEL", "5"))))
+
+_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def enabled_for(table: str) -> bool:
+    return "*" in INGEST_GZIP_TABLES or table in INGEST_GZIP_TABLES
+
+
+def maybe_compress(table: str, body: bytes) -> Tuple[bytes, Dict[str, str]]:
+    """Return (body_to_send, extra_headers) for this table's ingest POST."""
+    raw_len = len(body)
+    extra: Dict[str, str] = {}
+    elapsed_ms = 0.0
+    if enabled_for(table) and raw_len >= INGEST_GZIP_MIN_BYTES:
+        started = time.perf_counter()
+        body = gzip.compress(body, compresslevel=INGEST_GZIP_LEVEL, mtime=0)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        extra["Content-Encoding"] = "gzip"
+
+    with _lock:
+        s = _stats.setdefault(
+            table,
+            {"requests": 0, "compressed": 0, "raw_bytes": 0, "sent_bytes": 0, "compress_ms": 0.0},
+        )
+        s["requests"] += 1
+        s["raw_bytes"] += raw_len
+        s["sent_bytes"] += len(body)
+        if extra:
+            s["compressed"] += 1
+            s["compress_ms"] += elapsed_ms
+    return body, extra
+
+
+def stats() -> Dict[str, Any]:
+    with _lock:
+        per_table = {t: dict(s) for t, s in _stats.items()}
+    for s in per_table.values():
+        s["ratio"] = round(s["sent_bytes"] / s["raw_bytes"], 3) if s["raw_bytes"] else None
+        s["saved_bytes"] = s["raw_bytes"] - s["sent_bytes"]
+        s["compress_ms"] = round(s["compress_ms"], 2)
+    return {
+        "tables": sorted(INGEST_GZIP_TABLES),
+        "min_bytes": INGEST_GZIP_MIN_BYTES,
+        "level": INGEST_GZIP_LEVEL,
+        "per_table": per_table,
+    }
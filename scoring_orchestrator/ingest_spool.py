@@ -0,0 +1,355 @@
+# ingest_spool.py — durable write-ahead spool for ADX ingest (202 + receipt)
+# A validated row is appended to a local segment file and fsynced before the handler answers;
+# a background drainer ships spooled rows to ADX in multi-line batches and records the outcome
+# in an ack log. On startup, every spooled row without a final ack is queued again, so unsent
+# rows survive process restarts.
+# The default directory is instance-local (/tmp/ingest_spool/<WEBSITE_INSTANCE_ID>). /home is an
+# SMB share mounted on every scaled-out instance, so spooling there would let two instances
+# replay each other's segments and race on one acks.log.
+#
+# On-disk layout (INGEST_SPOOL_DIR):
+#   seg-000000000001.log   one record per line: <json header>\t<row json>\n
+#   acks.log               one line per finished receipt: <receipt_id> <state>\n
+
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import json_codec
+
+# ---------------- Config ----------------
+INGEST_SPOOL_DIR          = os.environ.get(
+    "INGEST_SPOOL_DIR",
+    os.path.join("/tmp", "ingest_spool", os.environ.get("WEBSITE_INSTANCE_ID", "local")),
+)
+SPOOL_SEGMENT_BYTES       = int(os.environ.get("SPOOL_SEGMENT_BYTES", str(16 * 1024 * 1024)))
+SPOOL_DRAIN_BATCH_BYTES   = int(os.environ.get("SPOOL_DRAIN_BATCH_BYTES", str(4 * 1024 * 1024)))
+SPOOL_DRAIN_BATCH_ROWS    = int(os.environ.get("SPOOL_DRAIN_BATCH_ROWS", "1000"))
+SPOOL_MAX_ATTEMPTS        = int(os.environ.get("SPOOL_MAX_ATTEMPTS", "5"))
+SPOOL_RETRY_BASE_S        = float(os.environ.get("SPOOL_RETRY_BASE_S", "2"))
+SPOOL_RECEIPT_HISTORY     = int(os.environ.get("SPOOL_RECEIPT_HISTORY", "100000"))
+
+# send(table, mapping, body) -> (http_status, response_text)
+SendFn = Callable[[str, str, bytes], Tuple[int, str]]
+# on_failed(table, mapping, lines, error) — rows that ran out of attempts (e.g. to a dead-letter store)
+FailedFn = Callable[[str, str, List[bytes], str], None]
+
+STATE_SPOOLED       = "spooled"
+STATE_SENT          = "sent"
+STATE_FAILED        = "failed"
+STATE_DEAD_LETTERED = "dead_lettered"
+FINAL_STATES        = (STATE_SENT, STATE_FAILED, STATE_DEAD_LETTERED)
+
+_SEG_PREFIX = "seg-"
+_SEG_SUFFIX = ".log"
+_ACKS_FILE  = "acks.log"
+
+
+class _Item:
+    __slots__ = ("rid", "table", "mapping", "line", "segment", "attempts", "not_before")
+
+    def __init__(self, rid: str, table: str, mapping: str, line: bytes, segment: int):
+        self.rid = rid
+        self.table = table
+        self.mapping = mapping
+        self.line = line
+        self.segment = segment
+        self.attempts = 0
+        self.not_before = 0.0
+
+
+class IngestSpool:
+    def __init__(self, directory: str, send: SendFn, on_failed: Optional[FailedFn] = None):
+        self.directory = directory
+        self._send = send
+        self._on_failed = on_failed
+
+        self._lock = threading.Lock()          # segment file + bookkeeping
+        self._cond = threading.Condition(self._lock)
+        self._queue: Deque[_Item] = deque()
+        self._receipts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._outstanding: Dict[int, int] = {}  # segment -> unfinished rows
+        self._seg_no = 0
+        self._seg_file = None
+        self._seg_size = 0
+        self._acks_file = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = False
+        self._closed = False
+
+        self._stats = {
+            "appended": 0,
+            "sent": 0,
+            "failed": 0,
+            "dead_lettered": 0,
+            "retries": 0,
+            "recovered": 0,
+        }
+
+    # ---------------- Lifecycle ----------------
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            self._recover()
+            self._acks_file = open(os.path.join(self.directory, _ACKS_FILE), "ab")
+            self._open_segment(self._seg_no + 1)
+            self._started = True
+            self._thread = threading.Thread(
+                target=self._drain_loop, name="adx-ingest-spool", daemon=True
+            )
+            self._thread.start()
+
+    def close(self, timeout: float = 10.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._lock:
+            for f in (self._seg_file, self._acks_file):
+                if f is not None:
+                    f.close()
+            self._seg_file = self._acks_file = None
+
+    # ---------------- Producer side ----------------
+    def append(self, table: str, mapping: str, line: bytes) -> str:
+        """Durably spool one newline-terminated JSON row and return its receipt id."""
+        self.start()
+        rid = uuid.uuid4().hex
+        header = json_codec.dumps({"id": rid, "t": table, "m": mapping, "at": time.time()})
+        record = header + b"\t" + line
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ingest spool is closed")
+            if self._seg_size + len(record) > SPOOL_SEGMENT_BYTES and self._seg_size > 0:
+                self._open_segment(self._seg_no + 1)
+            self._seg_file.write(record)
+            self._seg_file.flush()
+            os.fsync(self._seg_file.fileno())
+            self._seg_size += len(record)
+
+            self._outstanding[self._seg_no] = self._outstanding.get(self._seg_no, 0) + 1
+            self._queue.append(_Item(rid, table, mapping, line, self._seg_no))
+            self._set_receipt(rid, STATE_SPOOLED, table)
+            self._stats["appended"] += 1
+            self._cond.notify()
+        return rid
+
+    def status(self, rid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            r = self._receipts.get(rid)
+            return dict(r, receipt_id=rid) if r is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["queued"] = len(self._queue)
+            out["segments"] = len([s for s, n in self._outstanding.items() if n > 0])
+            out["directory"] = self.directory
+        return out
+
+    # ---------------- Recovery ----------------
+    def _segments_on_disk(self) -> List[int]:
+        nums = []
+        for name in os.listdir(self.directory):
+            if name.startswith(_SEG_PREFIX) and name.endswith(_SEG_SUFFIX):
+                try:
+                    nums.append(int(name[len(_SEG_PREFIX):-len(_SEG_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(nums)
+
+    def _seg_path(self, seg: int) -> str:
+        return os.path.join(self.directory, f"{_SEG_PREFIX}{seg:012d}{_SEG_SUFFIX}")
+
+    def _recover(self) -> None:
+        acks: Dict[str, str] = {}
+        acks_path = os.path.join(self.directory, _ACKS_FILE)
+        if os.path.exists(acks_path):
+            with open(acks_path, "rb") as f:
+                for raw in f:
+                    parts = raw.decode("utf-8", "replace").split()
+                    if len(parts) == 2:
+                        acks[parts[0]] = parts[1]
+
+        live_ids = set()
+        for seg in self._segments_on_disk():
+            self._seg_no = max(self._seg_no, seg)
+            pending = 0
+            seg_ids = set()
+            with open(self._seg_path(seg), "rb") as f:
+                for raw in f:
+                    if not raw.endswith(b"\n") or b"\t" not in raw:
+                        continue  # torn tail from a crash mid-append: never acknowledged to a caller
+                    header, line = raw.split(b"\t", 1)
+                    try:
+                        h = json_codec.loads(header)
+                        rid, t, m = h["id"], h["t"], h["m"]
+                    except (ValueError, KeyError, TypeError):
+                        continue  # malformed header
+                    seg_ids.add(rid)
+                    state = acks.get(rid)
+                    if state in FINAL_STATES:
+                        self._set_receipt(rid, state, t)
+                        continue
+                    self._queue.append(_Item(rid, t, m, line, seg))
+                    self._set_receipt(rid, STATE_SPOOLED, t)
+                    pending += 1
+            if pending:
+                self._outstanding[seg] = pending
+                self._stats["recovered"] += pending
+                live_ids |= seg_ids
+            else:
+                os.remove(self._seg_path(seg))
+
+        # Compact the ack log down to receipts that still live in a segment.
+        tmp = acks_path + ".tmp"
+        with open(tmp, "wb") as f:
+            for rid, state in acks.items():
+                if rid in live_ids:
+                    f.write(f"{rid} {state}\n".encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, acks_path)
+        if self._stats["recovered"]:
+            logging.info("Ingest spool recovered %d unsent rows", self._stats["recovered"])
+
+    # ---------------- Bookkeeping (caller holds _lock) ----------------
+    def _open_segment(self, seg: int) -> None:
+        if self._seg_file is not None:
+            self._seg_file.close()
+            if not self._outstanding.get(self._seg_no):
+                self._remove_segment(self._seg_no)
+        self._seg_no = seg
+        self._seg_file = open(self._seg_path(seg), "ab")
+        self._seg_size = self._seg_file.tell()
+
+    def _remove_segment(self, seg: int) -> None:
+        self._outstanding.pop(seg, None)
+        try:
+            os.remove(self._seg_path(seg))
+        except FileNotFoundError:
+            pass
+
+    def _set_receipt(self, rid: str, state: str, table: str, **extra: Any) -> None:
+        r = self._receipts.pop(rid, None) or {"table": table, "attempts": 0}
+        r["state"] = state
+        r["updated_at"] = time.time()
+        r.update(extra)
+        self._receipts[rid] = r
+        # Bound memory: evict the oldest finished receipts (pending ones are never evicted).
+        while len(self._receipts) > SPOOL_RECEIPT_HISTORY:
+            old_rid, old = next(iter(self._receipts.items()))
+            if old["state"] not in FINAL_STATES:
+                break
+            del self._receipts[old_rid]
+
+    def _finish(self, items: List[_Item], state: str, error: Optional[str] = None) -> None:
+        """Persist final acks for items, then release their segments."""
+        with self._lock:
+            self._acks_file.write(b"".join(f"{it.rid} {state}\n".encode("utf-8") for it in items))
+            self._acks_file.flush()
+            os.fsync(self._acks_file.fileno())
+            for it in items:
+                extra = {"attempts": it.attempts, "error": error[:500] if error else None}
+                self._set_receipt(it.rid, state, it.table, **extra)
+                left = self._outstanding.get(it.segment, 0) - 1
+                self._outstanding[it.segment] = left
+                if left <= 0 and it.segment != self._seg_no:
+                    self._remove_segment(it.segment)
+            self._stats[state] += len(items)
+            if not any(self._outstanding.values()):
+                # Fully drained: start a fresh segment and reset the ack log.
+                if self._seg_size > 0:
+                    self._open_segment(self._seg_no + 1)
+                self._acks_file.seek(0)
+                self._acks_file.truncate()
+
+    # ---------------- Drainer ----------------
+    def _take_batch(self) -> Optional[List[_Item]]:
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                now = time.monotonic()
+                ready: List[_Item] = []
+                wait = None
+                for _ in range(len(self._queue)):
+                    it = self._queue.popleft()
+                    if it.not_before <= now and len(ready) < SPOOL_DRAIN_BATCH_ROWS:
+                        ready.append(it)
+                    else:
+                        if it.not_before > now:
+                            delay = it.not_before - now
+                            wait = delay if wait is None else min(wait, delay)
+                        self._queue.append(it)
+                if ready:
+                    return ready
+                self._cond.wait(wait)
+
+    def _drain_loop(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            groups: Dict[Tuple[str, str], List[_Item]] = {}
+            for it in batch:
+                groups.setdefault((it.table, it.mapping), []).append(it)
+            for (table, mapping), items in groups.items():
+                for chunk in self._chunks(items):
+                    self._ship(table, mapping, chunk)
+
+    def _chunks(self, items: List[_Item]) -> List[List[_Item]]:
+        chunks: List[List[_Item]] = [[]]
+        size = 0
+        for it in items:
+            if chunks[-1] and size + len(it.line) > SPOOL_DRAIN_BATCH_BYTES:
+                chunks.append([])
+                size = 0
+            chunks[-1].append(it)
+            size += len(it.line)
+        return chunks
+
+    def _ship(self, table: str, mapping: str, items: List[_Item]) -> None:
+        body = b"".join(it.line for it in items)
+        try:
+            status, text = self._send(table, mapping, body)
+            error = None if status in (200, 202) else f"ADX ingest error {status}: {text}"
+        except Exception as ex:
+            logging.exception("Spool drain exception (%s)", table)
+            error = f"Exception: {ex}"
+
+        if error is None:
+            self._finish(items, STATE_SENT)
+            return
+
+        logging.error("Spool drain failed (%s, %d rows): %s", table, len(items), error[:500])
+        retry: List[_Item] = []
+        give_up: List[_Item] = []
+        for it in items:
+            it.attempts += 1
+            (give_up if it.attempts >= SPOOL_MAX_ATTEMPTS else retry).append(it)
+        if give_up:
+            state = STATE_FAILED
+            if self._on_failed is not None:
+                try:
+                    self._on_failed(table, mapping, [it.line for it in give_up], error)
+                    state = STATE_DEAD_LETTERED
+                except Exception:
+                    logging.exception("Spool on_failed hook raised (%s)", table)
+            self._finish(give_up, state, error)
+        if retry:
+            delay = SPOOL_RETRY_BASE_S * (2 ** (retry[0].attempts - 1))
+            with self._cond:
+                for it in retry:
+                    it.not_before = time.monotonic() + delay
+                    self._set_receipt(it.rid, STATE_SPOOLED, it.table, attempts=it.attempts, error=error[:500])
+                    self._queue.append(it)
+                self._stats["retries"] += len(retry)
+                self._cond.notify()
@@ -0,0 +1,122 @@
+# ingest_transport.py — pooled keep-alive HTTP transport for ADX streaming ingest
+# One requests.Session per worker process, shared by every ingest route, so the
+# TCP + TLS handshake to KUSTO_INGEST_URI is paid per pooled connection, not per POST.
+# requests/urllib3 are imported on the first POST, not at module load, so ping and the cache-read
+# routes never pay for them on a cold start.
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import requests
+
+# ---------------- Config ----------------
+# Pool is sized to the Functions worker thread count so every thread can hold a warm connection.
+INGEST_POOL_SIZE       = int(
+    os.environ.get("INGEST_POOL_SIZE")
+    or os.environ.get("PYTHON_THREADPOOL_THREAD_COUNT")
+    or 16
+)
+INGEST_CONNECT_TIMEOUT = float(os.environ.get("INGEST_CONNECT_TIMEOUT", "3.05"))  # seconds
+INGEST_READ_TIMEOUT    = float(os.environ.get("INGEST_READ_TIMEOUT", "30"))       # seconds
+
+# ---------------- Pool hit/miss accounting ----------------
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "new_connections": 0, "errors": 0}
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _ingest_adapter(**kwargs):
+    """HTTPAdapter whose pools count every freshly opened connection (a pool miss)."""
+    from requests.adapters import HTTPAdapter
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class _CountingHTTPConnectionPool(HTTPConnectionPool):
+        def _new_conn(self):
+            _count("new_connections")
+            return super()._new_conn()
+
+    class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        def _new_conn(self):
+            _count("new_connections")
+            return super()._new_conn()
+
+    class _IngestAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kw):
+            super().init_poolmanager(*args, **kw)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": _CountingHTTPConnectionPool,
+                "https": _CountingHTTPSConnectionPool,
+            }
+
+    return _IngestAdapter(**kwargs)
+
+
+# ---------------- Session (lazy, one per process) ----------------
+_session: "Optional[requests.Session]" = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> "requests.Session":
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+
+                s = requests.Session()
+                # No transport-level retries: a silent resend would duplicate rows in ADX.
+                adapter = _ingest_adapter(
+                    pool_connections=4,
+                    pool_maxsize=INGEST_POOL_SIZE,
+                    max_retries=0,
+                )
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers["Connection"] = "keep-alive"
+                _session = s
+    return _session
+
+
+def post(url: str, data: bytes, headers: Dict[str, str]) -> "requests.Response":
+    """POST through the shared pool with separate connect/read timeouts."""
+    _count("requests")
+    try:
+        return get_session().post(
+            url,
+            data=data,
+            headers=headers,
+            timeout=(INGEST_CONNECT_TIMEOUT, INGEST_READ_TIMEOUT),
+        )
+    except Exception:
+        _count("errors")
+        raise
+
+
+def close() -> None:
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def stats() -> Dict[str, Any]:
+    with _stats_lock:
+        snap = dict(_stats)
+    misses = snap["new_connections"]
+    hits = max(snap["requests"] - snap["errors"] - misses, 0)
+    return {
+        "requests": snap["requests"],
+        "errors": snap["errors"],
+        "pool_hits": hits,
+        "pool_misses": misses,
+        "pool_size": INGEST_POOL_SIZE,
+        "connect_timeout_s": INGEST_CONNECT_TIMEOUT,
+        "read_timeout_s": INGEST_READ_TIMEOUT,
+    }
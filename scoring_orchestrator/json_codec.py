@@ -0,0 +1,65 @@
+# json_codec.py — one JSON codec for request bodies, ingest rows and responses
+# Uses orjson when it is installed (parses bytes directly, serialises straight to bytes, appends
+# the NDJSON newline itself), otherwise the standard library with compact separators so both
+# backends produce the same shape. JSON_CODEC=stdlib forces the fallback.
+# Decode errors are ValueError subclasses with either backend, so callers keep `except ValueError`.
+
+import json
+import os
+from typing import Any, Dict, Union
+
+JSON_CODEC = os.environ.get("JSON_CODEC", "auto").lower()
+
+try:
+    if JSON_CODEC == "stdlib":
+        raise ImportError("JSON_CODEC=stdlib")
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "stdlib"
+
+_SEPARATORS = (",", ":")
+_encoder = json.JSONEncoder(separators=_SEPARATORS)  # built once; json.dumps(..., separators=) builds one per call
+_stats: Dict[str, int] = {"orjson_fallbacks": 0}
+
+
+if orjson is not None:
+    _OPT_LINE = orjson.OPT_APPEND_NEWLINE
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson is stricter (non-str keys, >64-bit ints); keep the old behaviour for those.
+            _stats["orjson_fallbacks"] += 1
+            return _encoder.encode(obj).encode("utf-8")
+
+    def dumps_line(obj: Any) -> bytes:
+        """One NDJSON line (row + "\\n") for the ADX ingest body."""
+        try:
+            return orjson.dumps(obj, option=_OPT_LINE)
+        except TypeError:
+            _stats["orjson_fallbacks"] += 1
+            return (_encoder.encode(obj) + "\n").encode("utf-8")
+
+else:
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)  # accepts bytes; detects UTF-8/16/32 itself
+
+    def dumps(obj: Any) -> bytes:
+        return _encoder.encode(obj).encode("utf-8")
+
+    def dumps_line(obj: Any) -> bytes:
+        """One NDJSON line (row + "\\n") for the ADX ingest body."""
+        return (_encoder.encode(obj) + "\n").encode("utf-8")
+
+
+def stats() -> Dict[str, Any]:
+    return {"backend": BACKEND, **_stats}
@@ -0,0 +1,104 @@
+# latest_index.py — in-memory "latest record" index per assessment type
+# Every accepted row is written through under four keys: (customer, participant), (customer, any),
+# (any, participant) and (any, any), which are exactly the filter combinations the *_latest_live
+# routes accept. A key keeps the newest row by event time, so out-of-order retries never roll it
+# back. Answers fetched from ADX on a cold miss are seeded under the key that was asked for.
+# The index is per worker process: with several instances, LATEST_INDEX_MAX_AGE_S bounds how long
+# an entry is trusted before the route goes back to ADX (0 = until evicted). Memory is bounded by
+# LRU eviction at LATEST_INDEX_MAX_KEYS.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# ---------------- Config ----------------
+LATEST_INDEX_MAX_KEYS  = int(os.environ.get("LATEST_INDEX_MAX_KEYS", "50000"))
+LATEST_INDEX_MAX_AGE_S = float(os.environ.get("LATEST_INDEX_MAX_AGE_S", "60"))
+
+ANY = ""  # wildcard customer / participant, same as an empty query parameter
+
+Key = Tuple[str, str, str]  # (assessment type, customer, participant)
+
+
+def filter_keys(customer: str, participant: str) -> List[Tuple[str, str]]:
+    """The (customer, participant) filter combinations a row is the latest answer for."""
+    customer, participant = customer or ANY, participant or ANY
+    return list({(c, p) for c in (customer, ANY) for p in (participant, ANY)})
+
+
+class _Entry(NamedTuple):
+    event_ts: float       # epoch seconds of the row's event time (ordering)
+    stored_at: float      # monotonic time the entry was written (max age)
+    body: bytes           # encoded route payload
+
+
+def event_epoch(ts: Any) -> float:
+    """Epoch seconds for an ISO string / datetime; unparsable or empty sorts first."""
+    if isinstance(ts, datetime):
+        dt = ts
+    else:
+        try:
+            dt = datetime.fromisoformat(str(ts).strip().replace("Z", "+00:00"))
+        except ValueError:
+            return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class LatestIndex:
+    def __init__(self, max_keys: int = LATEST_INDEX_MAX_KEYS, max_age_s: float = LATEST_INDEX_MAX_AGE_S):
+        self._max = max(4, max_keys)
+        self._max_age = max_age_s
+        self._entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "records": 0, "seeds": 0, "evictions": 0}
+
+    def _put(self, key: Key, entry: _Entry) -> None:
+        # caller holds self._lock
+        current = self._entries.get(key)
+        if current is None or entry.event_ts >= current.event_ts:
+            self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def record(self, assessment: str, customer: str, participant: str, event_ts: Any, body: bytes) -> None:
+        """An accepted row: update every filter combination it is the answer for."""
+        entry = _Entry(event_epoch(event_ts), time.monotonic(), body)
+        with self._lock:
+            for c, p in filter_keys(customer, participant):
+                self._put((assessment, c, p), entry)
+            self._stats["records"] += 1
+
+    def seed(self, assessment: str, customer: str, participant: str, event_ts: Any, body: bytes) -> None:
+        """An ADX answer for exactly this filter combination."""
+        entry = _Entry(event_epoch(event_ts), time.monotonic(), body)
+        with self._lock:
+            self._put((assessment, customer or ANY, participant or ANY), entry)
+            self._stats["seeds"] += 1
+
+    def get(self, assessment: str, customer: str, participant: str) -> Optional[bytes]:
+        key = (assessment, customer or ANY, participant or ANY)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if self._max_age > 0 and time.monotonic() - entry.stored_at > self._max_age:
+                self._stats["expired"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.body
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["keys"] = len(self._entries)
+        out.update(max_keys=self._max, max_age_s=self._max_age)
+        return out
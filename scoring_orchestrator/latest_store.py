@@ -0,0 +1,212 @@
+# latest_store.py — persistent latest-score store (SQLite, WAL) behind the in-memory latest index
+# Replaces the /tmp/tech_health_latest.json rewrite. put() only records the row in a pending map
+# (coalesced per key, newest event time wins) and returns; a writer thread flushes the map every
+# LATEST_STORE_FLUSH_MS in one transaction, and an upsert never replaces a newer row. Readers use
+# their own per-thread connections. WAL mode gives each read a consistent snapshot while the
+# writer commits, so a torn record is impossible. Lookups check the unflushed map first, so a
+# worker reads its own writes. Like dead_letter.py, sqlite3 is imported on first use.
+# The default file is instance-local (/tmp/latest_store/<WEBSITE_INSTANCE_ID>.db), not on the /home
+# SMB share where WAL locking is unreliable. Each instance therefore has its own cache: it starts
+# empty on a fresh instance and only sees rows ingested there. A miss falls through to ADX, which
+# stays the source of truth; a row ingested on another instance is picked up once the local entry
+# is older than the route's max age.
+
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from latest_index import ANY, event_epoch, filter_keys
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# ---------------- Config ----------------
+LATEST_STORE_PATH      = os.environ.get(
+    "LATEST_STORE_PATH",
+    os.path.join("/tmp", "latest_store", os.environ.get("WEBSITE_INSTANCE_ID", "local") + ".db"),
+)
+LATEST_STORE_FLUSH_MS  = float(os.environ.get("LATEST_STORE_FLUSH_MS", "250"))
+LATEST_STORE_MAX_BATCH = int(os.environ.get("LATEST_STORE_MAX_BATCH", "1000"))  # flush early past this
+
+Key = Tuple[str, str, str]  # (assessment type, customer, participant)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS latest_scores (
+    assessment    TEXT NOT NULL,
+    customer      TEXT NOT NULL,
+    participant   TEXT NOT NULL,
+    event_ts      REAL NOT NULL,
+    body          BLOB NOT NULL,
+    updated_at    REAL NOT NULL,
+    PRIMARY KEY (assessment, customer, participant)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO latest_scores (assessment, customer, participant, event_ts, body, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (assessment, customer, participant) DO UPDATE SET
+    event_ts = excluded.event_ts, body = excluded.body, updated_at = excluded.updated_at
+WHERE excluded.event_ts >= latest_scores.event_ts
+"""
+
+
+class StoredLatest(NamedTuple):
+    body: bytes
+    event_ts: float
+    updated_at: float     # wall-clock time the row was written (age checks across restarts)
+
+
+class LatestStore:
+    def __init__(self, path: str = LATEST_STORE_PATH, flush_ms: float = LATEST_STORE_FLUSH_MS):
+        self.path = path
+        self._flush_s = flush_ms / 1000.0
+        self._pending: Dict[Key, StoredLatest] = {}
+        self._lock = threading.Lock()            # guards _pending / _stats / thread start
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._writer: "Optional[sqlite3.Connection]" = None
+        self._write_lock = threading.Lock()      # one flush at a time (writer thread, close, callers)
+        self._local = threading.local()          # per-thread reader connections
+        self._stats = {
+            "puts": 0,
+            "coalesced": 0,
+            "flushes": 0,
+            "rows_written": 0,
+            "write_errors": 0,
+            "reads": 0,
+            "read_hits": 0,
+        }
+
+    # ---------------- Connections ----------------
+    def _connect(self, shared: bool = False) -> "sqlite3.Connection":
+        import sqlite3  # opened on first use; keeps sqlite3 off the cold-start import path
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=not shared)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # WAL + NORMAL: a crash may lose the last flush, never corrupts
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _reader(self) -> "sqlite3.Connection":
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # ---------------- Writes (request threads) ----------------
+    def put(self, assessment: str, customer: str, participant: str, event_ts: Any, body: bytes) -> None:
+        """Queue an accepted row under every filter combination it answers; never blocks on disk."""
+        record = StoredLatest(body, event_epoch(event_ts), time.time())
+        with self._lock:
+            if self._closed:
+                return
+            for c, p in filter_keys(customer, participant):
+                key = (assessment, c, p)
+                current = self._pending.get(key)
+                if current is not None:
+                    self._stats["coalesced"] += 1
+                    if current.event_ts > record.event_ts:
+                        continue
+                self._pending[key] = record
+            self._stats["puts"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._flush_loop, name="latest-store-writer", daemon=True)
+                self._thread.start()
+            if len(self._pending) >= LATEST_STORE_MAX_BATCH:
+                self._wake.set()
+
+    # ---------------- Writer thread ----------------
+    def _flush_loop(self) -> None:
+        while True:
+            self._wake.wait(self._flush_s)
+            self._wake.clear()
+            self.flush()
+            if self._closed:
+                return
+
+    def flush(self) -> int:
+        """Write the pending map in one transaction; rows stay pending if the write fails."""
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                if self._writer is None:
+                    self._writer = self._connect(shared=True)
+                with self._writer:
+                    self._writer.executemany(
+                        _UPSERT, [(a, c, p, r.event_ts, r.body, r.updated_at) for (a, c, p), r in batch.items()]
+                    )
+            except Exception:
+                logging.exception("Latest store flush failed (%d rows kept pending)", len(batch))
+                with self._lock:
+                    self._stats["write_errors"] += 1
+                    for key, record in batch.items():
+                        current = self._pending.get(key)
+                        if current is None or current.event_ts < record.event_ts:
+                            self._pending[key] = record
+                return 0
+        with self._lock:
+            self._stats["flushes"] += 1
+            self._stats["rows_written"] += len(batch)
+        return len(batch)
+
+    # ---------------- Reads ----------------
+    def get(self, assessment: str, customer: str, participant: str) -> Optional[StoredLatest]:
+        return self.get_many([(assessment, customer, participant)]).get(
+            (assessment, customer or ANY, participant or ANY)
+        )
+
+    def get_many(self, keys: Iterable[Key]) -> Dict[Key, StoredLatest]:
+        """Several (assessment, customer, participant) lookups; one SELECT (one snapshot) per 300 keys."""
+        wanted = list({(a, c or ANY, p or ANY) for a, c, p in keys})
+        out: Dict[Key, StoredLatest] = {}
+        with self._lock:
+            self._stats["reads"] += len(wanted)
+            for key in wanted:
+                record = self._pending.get(key)
+                if record is not None:
+                    out[key] = record
+        missing = [k for k in wanted if k not in out]
+        if missing:
+            conn = self._reader()
+            for start in range(0, len(missing), 300):  # stay under SQLite's bound-parameter limit
+                chunk = missing[start:start + 300]
+                clause = " OR ".join(["(assessment = ? AND customer = ? AND participant = ?)"] * len(chunk))
+                args: List[str] = [v for key in chunk for v in key]
+                for a, c, p, event_ts, body, updated_at in conn.execute(
+                    "SELECT assessment, customer, participant, event_ts, body, updated_at"
+                    f" FROM latest_scores WHERE {clause}",
+                    args,
+                ):
+                    out[(a, c, p)] = StoredLatest(bytes(body), event_ts, updated_at)
+        with self._lock:
+            self._stats["read_hits"] += len(out)
+        return out
+
+    # ---------------- Lifecycle ----------------
+    def close(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["pending"] = len(self._pending)
+        out["path"] = self.path
+        return out
@@ -0,0 +1,108 @@
+# latest_views.py — send latest-record queries to the arg_max materialized views when they exist
+# The DDL in kusto/ (and DigitalReadiness/kusto, AIreadiness/kusto) creates <table>_latest: one row
+# per (customer, participant_name), holding that participant's newest row plus a typed event_time.
+# Reading the view touches one row per participant instead of scanning and converting every
+# timestamp string. The catalog lists healthy, enabled views with `.show materialized-views`,
+# at most once per ADX_VIEW_REFRESH_S, in a background thread. Callers never wait for it: until
+# the first listing lands (or when it fails) queries keep reading the base table.
+# Referencing the view by name returns the materialized part plus the not-yet-materialized
+# delta, so it is as fresh as the table.
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, NamedTuple
+
+# ---------------- Config ----------------
+ADX_LATEST_VIEWS   = os.environ.get("ADX_LATEST_VIEWS", "auto").strip().lower()   # auto | off
+ADX_VIEW_REFRESH_S = float(os.environ.get("ADX_VIEW_REFRESH_S", "300"))
+
+LATEST_VIEW_SUFFIX = "_latest"
+VIEW_TIME_COLUMN   = "event_time"   # typed datetime column every latest view carries
+
+# Healthy, enabled views only: a view that fell behind or was disabled is not trusted.
+SHOW_VIEWS_COMMAND = ".show materialized-views | where IsEnabled and IsHealthy | project Name"
+
+
+def latest_rank(time_expr: str) -> str:
+    """KQL long ordering rows by `time_expr` (whole seconds), then by ingestion_time().
+
+    arg_max takes one sort key, and a rescored row (rescore.py) repeats the event time of the row
+    it corrects. The low nine digits hold the seconds from event to ingestion, so on a tie the
+    later write wins. The kusto/*_latest_view.kql DDL uses the same expression.
+    """
+    return (
+        f"tolong(({time_expr} - datetime(2000-01-01)) / 1s) * 1000000000"
+        f" + max_of(0, min_of(999999999, coalesce(tolong((ingestion_time() - {time_expr}) / 1s), 0)))"
+    )
+
+
+class LatestSource(NamedTuple):
+    source: str       # table or view name to query
+    time_expr: str    # datetime expression to order by
+    view: bool
+
+
+def table_source(table: str, time_column: str) -> LatestSource:
+    return LatestSource(table, f"todatetime({time_column})", False)
+
+
+class ViewCatalog:
+    def __init__(
+        self,
+        list_views: Callable[[], Iterable[str]],
+        refresh_s: float = ADX_VIEW_REFRESH_S,
+        mode: str = ADX_LATEST_VIEWS,
+    ):
+        self._list_views = list_views
+        self._refresh_s = refresh_s
+        self._enabled = mode != "off"
+        self._views: FrozenSet[str] = frozenset()
+        self._checked_at = float("-inf")      # monotonic time of the last listing attempt
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._stats = {"refreshes": 0, "refresh_errors": 0, "view_reads": 0, "table_reads": 0}
+
+    def _maybe_refresh(self) -> None:
+        with self._lock:
+            if self._refreshing or time.monotonic() - self._checked_at < self._refresh_s:
+                return
+            self._refreshing = True
+            self._checked_at = time.monotonic()
+        threading.Thread(target=self._refresh, name="latest-views-refresh", daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            views = frozenset(self._list_views())
+        except Exception as e:
+            logging.warning("Listing materialized views failed; reading base tables: %s", e)
+            with self._lock:
+                self._stats["refresh_errors"] += 1
+                self._views = frozenset()
+                self._refreshing = False
+            return
+        with self._lock:
+            self._views = views
+            self._stats["refreshes"] += 1
+            self._refreshing = False
+
+    def source(self, table: str, time_column: str) -> LatestSource:
+        """Where to read the latest rows of `table`: its <table>_latest view if healthy, else the table."""
+        if not self._enabled:
+            return table_source(table, time_column)
+        self._maybe_refresh()
+        view = table + LATEST_VIEW_SUFFIX
+        with self._lock:
+            if view in self._views:
+                self._stats["view_reads"] += 1
+                return LatestSource(view, VIEW_TIME_COLUMN, True)
+            self._stats["table_reads"] += 1
+        return table_source(table, time_column)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["views"] = sorted(self._views)
+        out.update(enabled=self._enabled, refresh_s=self._refresh_s)
+        return out
@@ -0,0 +1,193 @@
+# live_cache.py — TTL + LRU cache with single-flight for the *_latest_live routes
+# Dashboards and the Figma plugin poll the same (route, customer, participant) every few seconds.
+# A fresh entry (age <= LIVE_CACHE_TTL_S) is served as-is. A stale one still inside the
+# stale-while-revalidate window is served immediately while one background refresh runs. Anything
+# older is a miss, and concurrent misses for a key share one ADX call (the first caller fetches,
+# the rest wait on its future). Failed fetches are never cached; a failed background refresh keeps
+# the stale entry. Sync routes wait on the shared future directly, async routes through
+# asyncio.wrap_future, so both twins of a route can share one flight.
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# ---------------- Config ----------------
+LIVE_CACHE_TTL_S       = float(os.environ.get("LIVE_CACHE_TTL_S", "10"))     # 0 disables the cache
+LIVE_CACHE_SWR_S       = float(os.environ.get("LIVE_CACHE_SWR_S", "30"))     # serve-stale window after TTL
+LIVE_CACHE_MAX_ENTRIES = int(os.environ.get("LIVE_CACHE_MAX_ENTRIES", "1024"))
+LIVE_CACHE_WAIT_S      = float(os.environ.get("LIVE_CACHE_WAIT_S", "30"))    # max wait on another caller's fetch
+
+# Outcome of a lookup, surfaced as X-Cache on the response.
+HIT, STALE, MISS, COALESCED, BYPASS = "hit", "stale", "miss", "coalesced", "bypass"
+
+
+class LiveCache:
+    def __init__(
+        self,
+        ttl_s: float = LIVE_CACHE_TTL_S,
+        swr_s: float = LIVE_CACHE_SWR_S,
+        max_entries: int = LIVE_CACHE_MAX_ENTRIES,
+        wait_s: float = LIVE_CACHE_WAIT_S,
+    ):
+        self._ttl = ttl_s
+        self._swr = swr_s
+        self._max = max(1, max_entries)
+        self._wait = wait_s
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()  # key -> (fetched_at, value)
+        self._flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "fetch_errors": 0,
+            "evictions": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    # ---------------- Lookup (caller holds self._lock) ----------------
+    def _lookup(self, key: Hashable, now: float) -> Tuple[Optional[str], Any, Optional[Future], bool]:
+        """-> (outcome or None, cached value, flight to join or None, whether the caller leads a refresh)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = now - entry[0]
+            if age <= self._ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return HIT, entry[1], None, False
+            if age <= self._ttl + self._swr:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                lead = key not in self._flights
+                if lead:
+                    self._flights[key] = Future()
+                    self._stats["refreshes"] += 1
+                return STALE, entry[1], None, lead
+        flight = self._flights.get(key)
+        if flight is not None:
+            self._stats["coalesced"] += 1
+            return COALESCED, None, flight, False
+        self._flights[key] = Future()
+        self._stats["misses"] += 1
+        return None, None, None, True
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _land(self, key: Hashable, value: Any = None, error: Optional[BaseException] = None) -> None:
+        """Publish the leader's result to everyone waiting on the flight."""
+        with self._lock:
+            flight = self._flights.pop(key, None)
+            if error is not None:
+                self._stats["fetch_errors"] += 1
+        if flight is None:
+            return
+        if error is not None:
+            flight.set_exception(error)
+        else:
+            flight.set_result(value)
+
+    # ---------------- Sync routes ----------------
+    def get(self, key: Hashable, fetch: Callable[[], Any]) -> Tuple[Any, str]:
+        """-> (value, outcome). Exceptions from fetch propagate to the caller and its waiters."""
+        if not self.enabled:
+            return fetch(), BYPASS
+        with self._lock:
+            outcome, value, flight, lead = self._lookup(key, time.monotonic())
+        if outcome == STALE:
+            if lead:
+                threading.Thread(
+                    target=self._refresh, args=(key, fetch), name="live-cache-refresh", daemon=True
+                ).start()
+            return value, STALE
+        if outcome == HIT:
+            return value, HIT
+        if flight is not None:
+            return flight.result(timeout=self._wait), COALESCED
+        try:
+            value = fetch()
+        except BaseException as e:
+            self._land(key, error=e)
+            raise
+        self._store(key, value)
+        self._land(key, value)
+        return value, MISS
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], Any]) -> None:
+        try:
+            value = fetch()
+        except Exception as e:
+            with self._lock:
+                self._stats["refresh_errors"] += 1
+            logging.warning("live cache refresh failed for %r: %s", key, e)
+            self._land(key, error=e)
+            return
+        self._store(key, value)
+        self._land(key, value)
+
+    # ---------------- Async routes ----------------
+    async def get_async(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Tuple[Any, str]:
+        if not self.enabled:
+            return await fetch(), BYPASS
+        with self._lock:
+            outcome, value, flight, lead = self._lookup(key, time.monotonic())
+        if outcome == STALE:
+            if lead:
+                asyncio.get_running_loop().create_task(self._refresh_async(key, fetch))
+            return value, STALE
+        if outcome == HIT:
+            return value, HIT
+        if flight is not None:
+            return await asyncio.wait_for(asyncio.wrap_future(flight), self._wait), COALESCED
+        try:
+            value = await fetch()
+        except BaseException as e:
+            self._land(key, error=e)
+            raise
+        self._store(key, value)
+        self._land(key, value)
+        return value, MISS
+
+    async def _refresh_async(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            value = await fetch()
+        except Exception as e:
+            with self._lock:
+                self._stats["refresh_errors"] += 1
+            logging.warning("live cache refresh failed for %r: %s", key, e)
+            self._land(key, error=e)
+            return
+        self._store(key, value)
+        self._land(key, value)
+
+    # ---------------- Admin ----------------
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["entries"] = len(self._entries)
+            out["in_flight"] = len(self._flights)
+        out.update(ttl_s=self._ttl, swr_s=self._swr, max_entries=self._max)
+        return out
@@ -0,0 +1,191 @@
+# live_events.py — in-process pub/sub of accepted rows for the /api/events/{assessment} route
+# Ingest handlers publish() every accepted row (any thread). Subscribers are async route handlers:
+# each waits on an asyncio.Event set via call_soon_threadsafe, so a hold costs no worker thread and
+# a publish reaches it in one event-loop turn. Recent events sit in a bounded ring buffer per
+# assessment type. A subscriber sends back the last id it saw (Last-Event-ID), and anything newer
+# that matches its filters is delivered at once; an id from before the buffer (or from another
+# worker process) gets a "reset" telling the client to refetch the latest record.
+# Event ids are "<boot>-<seq>", so ids from a previous process are recognisably foreign.
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+# ---------------- Config ----------------
+LIVE_EVENTS_BUFFER          = int(os.environ.get("LIVE_EVENTS_BUFFER", "1000"))    # per assessment type
+LIVE_EVENTS_MAX_SUBSCRIBERS = int(os.environ.get("LIVE_EVENTS_MAX_SUBSCRIBERS", "200"))
+LIVE_EVENTS_HOLD_S          = float(os.environ.get("LIVE_EVENTS_HOLD_S", "25"))    # max wait per request
+
+
+class LiveEvent(NamedTuple):
+    seq: int
+    assessment: str
+    customer: str
+    participant: str
+    data: bytes           # JSON event payload
+
+
+class TooManySubscribers(Exception):
+    pass
+
+
+class _Subscriber:
+    __slots__ = ("assessment", "loop", "wake")
+
+    def __init__(self, assessment: str, loop: asyncio.AbstractEventLoop):
+        self.assessment = assessment
+        self.loop = loop
+        self.wake = asyncio.Event()
+
+
+class EventHub:
+    def __init__(self, buffer: int = LIVE_EVENTS_BUFFER, max_subscribers: int = LIVE_EVENTS_MAX_SUBSCRIBERS):
+        self.boot = format(int(time.time() * 1000), "x")
+        self._buffer_size = max(1, buffer)
+        self._max_subscribers = max_subscribers
+        self._buffers: Dict[str, Deque[LiveEvent]] = {}
+        self._evicted: Dict[str, int] = {}     # newest seq pushed out of each ring buffer
+        self._subscribers: Set[_Subscriber] = set()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._stats = {"published": 0, "deliveries": 0, "rejected_subscribers": 0, "resets": 0, "timeouts": 0}
+
+    # ---------------- Ids ----------------
+    def event_id(self, seq: int) -> str:
+        return f"{self.boot}-{seq}"
+
+    def _parse_id(self, last_event_id: Optional[str]) -> Optional[int]:
+        """-> seq to resume after; None for an id this process never issued."""
+        if not last_event_id:
+            return None
+        boot, _, seq = last_event_id.partition("-")
+        if boot != self.boot or not seq.isdigit():
+            return None
+        return int(seq)
+
+    # ---------------- Publish (any thread) ----------------
+    def publish(self, assessment: str, customer: str, participant: str, data: bytes) -> None:
+        with self._lock:
+            self._seq += 1
+            buf = self._buffers.get(assessment)
+            if buf is None:
+                buf = self._buffers[assessment] = deque(maxlen=self._buffer_size)
+            if len(buf) == buf.maxlen:
+                self._evicted[assessment] = buf[0].seq
+            buf.append(LiveEvent(self._seq, assessment, customer or "", participant or "", data))
+            self._stats["published"] += 1
+            waiting = [s for s in self._subscribers if s.assessment == assessment]
+        for sub in waiting:
+            try:
+                sub.loop.call_soon_threadsafe(sub.wake.set)
+            except RuntimeError:
+                pass  # loop already closed; the subscriber is gone
+
+    # ---------------- Subscribe (async route handlers) ----------------
+    def _since(self, assessment: str, after: int, customer: str, participant: str) -> Tuple[List[LiveEvent], bool]:
+        """Matching events newer than `after`, and whether `after` fell off the ring buffer."""
+        with self._lock:
+            buf = list(self._buffers.get(assessment, ()))
+            evicted = self._evicted.get(assessment, 0)
+            current = self._seq
+        if after > current:
+            return [], True
+        gap = after < evicted
+        events = [
+            e for e in buf
+            if e.seq > after
+            and (not customer or e.customer == customer)
+            and (not participant or e.participant == participant)
+        ]
+        return events, gap
+
+    def head(self) -> int:
+        with self._lock:
+            return self._seq
+
+    async def wait(
+        self,
+        assessment: str,
+        customer: str,
+        participant: str,
+        last_event_id: Optional[str],
+        hold_s: float = LIVE_EVENTS_HOLD_S,
+    ) -> Tuple[List[LiveEvent], int, bool]:
+        """Events after last_event_id matching the filters, waiting up to hold_s for the first one.
+
+        -> (events, seq to resume from, reset). reset means the client's id is unknown or too
+        old and it should refetch the latest record; it resumes from the current head.
+        Raises TooManySubscribers when the cap is reached.
+        """
+        after = self._parse_id(last_event_id)
+        if after is None:
+            if last_event_id:
+                with self._lock:
+                    self._stats["resets"] += 1
+                return [], self.head(), True
+            after = self.head()  # fresh subscriber: only what happens from now on
+        events, gap = self._since(assessment, after, customer, participant)
+        if gap:
+            with self._lock:
+                self._stats["resets"] += 1
+            return [], self.head(), True
+        if events:
+            return self._delivered(events, after)
+
+        sub = _Subscriber(assessment, asyncio.get_running_loop())
+        with self._lock:
+            if len(self._subscribers) >= self._max_subscribers:
+                self._stats["rejected_subscribers"] += 1
+                raise TooManySubscribers()
+            self._subscribers.add(sub)
+        try:
+            deadline = time.monotonic() + hold_s
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # One last look: an event published after the last wake-up would otherwise be
+                    # skipped by resuming from the head. Read the head first; everything up to it
+                    # is in the snapshot _since checks.
+                    head = self.head()
+                    events, gap = self._since(assessment, after, customer, participant)
+                    if gap:
+                        with self._lock:
+                            self._stats["resets"] += 1
+                        return [], self.head(), True
+                    if events:
+                        return self._delivered(events, after)
+                    with self._lock:
+                        self._stats["timeouts"] += 1
+                    return [], max(after, head), False
+                try:
+                    await asyncio.wait_for(sub.wake.wait(), remaining)
+                except asyncio.TimeoutError:
+                    continue
+                sub.wake.clear()
+                events, gap = self._since(assessment, after, customer, participant)
+                if gap:
+                    with self._lock:
+                        self._stats["resets"] += 1
+                    return [], self.head(), True
+                if events:
+                    return self._delivered(events, after)
+        finally:
+            with self._lock:
+                self._subscribers.discard(sub)
+
+    def _delivered(self, events: List[LiveEvent], after: int) -> Tuple[List[LiveEvent], int, bool]:
+        with self._lock:
+            self._stats["deliveries"] += len(events)
+        return events, max(after, events[-1].seq), False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self._stats)
+            out["subscribers"] = len(self._subscribers)
+            out["buffered"] = {k: len(v) for k, v in self._buffers.items()}
+            out["head"] = self.event_id(self._seq)
+        out["max_subscribers"] = self._max_subscribers
+        return out
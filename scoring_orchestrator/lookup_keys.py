@@ -0,0 +1,38 @@
+# lookup_keys.py — normalised customer / participant lookup keys
+# Rows carry customer_key / participant_key next to the display values, and every query route
+# filters on them with plain equality (`customer_key == p_customer`). ADX can answer that from its
+# term index, where `tolower(customer) == ...` converts every row. The request side is normalised
+# the same way, so "Acme ", "ACME" and "ａｃｍｅ" (full-width) all find the same rows.
+# Normalisation: NFKC, case-fold (then NFKC again, since folding can denormalise), trim, and
+# collapse inner whitespace runs to one space.
+# Rows ingested before the key columns existed have them empty. Queries fall back to a key computed
+# in KQL from the display value for those rows (kql_key_match); KQL has no NFKC, so that fallback
+# is lowercase + whitespace only, the same expression the latest views in kusto/ use.
+
+import unicodedata
+from typing import Any, Dict
+
+
+def normalize_key(value: Any) -> str:
+    if value is None:
+        return ""
+    folded = unicodedata.normalize("NFKC", unicodedata.normalize("NFKC", str(value)).casefold())
+    return " ".join(folded.split())
+
+
+def key_fields(customer: Any, participant: Any) -> Dict[str, str]:
+    """The customer_key / participant_key columns for a row."""
+    return {"customer_key": normalize_key(customer), "participant_key": normalize_key(participant)}
+
+
+def kql_legacy_key(column: str) -> str:
+    """KQL for the key of a row from before the key columns, computed from display `column`."""
+    return f'tolower(trim(@"\\s+", replace_regex({column}, @"\\s+", " ")))'
+
+
+def kql_key_match(key_column: str, display_column: str, param: str) -> str:
+    """KQL predicate: `key_column` equals `param`, or the row has no key and its display value matches."""
+    return (
+        f"({key_column} == {param} or "
+        f"(isempty({key_column}) and {kql_legacy_key(display_column)} == {param}))"
+    )
@@ -0,0 +1,180 @@
+# ndjson_export.py — paged NDJSON export of an assessment table
+# A page is one streaming Kusto query (rows are parsed as they arrive), keyset-ordered and encoded
+# row by row straight into the response body, so a worker never holds more than one page:
+# EXPORT_PAGE_MAX_ROWS rows / EXPORT_PAGE_MAX_BYTES bytes.
+# The keyset is (time column, session_id, ingestion ticks, row hash). Time + session_id alone
+# repeat for client retries and rescore.py corrections, and a page edge between two such rows
+# skipped the second. Rows equal in all four are identical, so the cursor also counts how many rows
+# with its key were already served (skip).
+# The continuation cursor is opaque to clients. It carries that key and count, the ingestion-time
+# snapshot taken by the first page (rows ingested mid-export don't shift later pages), and a
+# fingerprint of the filters it was issued for.
+
+import base64
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import json_codec
+
+EXPORT_PAGE_ROWS      = 5000
+EXPORT_PAGE_MAX_ROWS  = 50000
+EXPORT_PAGE_MAX_BYTES = 16 * 1024 * 1024
+
+_CURSOR_VERSION = 2
+
+# `{table}` / `{time_column}` come from the pipeline registry, never from the request;
+# `{customer_match}` is the key predicate from lookup_keys.kql_key_match (legacy rows included).
+EXPORT_QUERY = """
+declare query_parameters(p_customer:string = "", p_industry:string = "", p_from:string = "",
+                         p_to:string = "", p_after_ts:string = "", p_after_sid:string = "",
+                         p_after_ing:long = 0, p_after_hash:long = 0, p_skip:long = 0,
+                         p_until:string = "", p_take:long = 5000);
+{table}
+| where isempty(p_until) or ingestion_time() <= todatetime(p_until)
+| extend _export_hash = hash(tostring(pack_all()))
+| extend _export_ts = todatetime({time_column}), _export_ing = coalesce(tolong(ingestion_time()), 0)
+| where isnotnull(_export_ts)
+| where isempty(p_customer) or {customer_match}
+| where isempty(p_industry) or industry == p_industry
+| where isempty(p_from) or _export_ts >= todatetime(p_from)
+| where isempty(p_to) or _export_ts < todatetime(p_to)
+| where isempty(p_after_ts)
+     or _export_ts > todatetime(p_after_ts)
+     or (_export_ts == todatetime(p_after_ts)
+         and (strcmp(session_id, p_after_sid) > 0
+              or (session_id == p_after_sid
+                  and (_export_ing > p_after_ing
+                       or (_export_ing == p_after_ing and _export_hash >= p_after_hash)))))
+| order by _export_ts asc, session_id asc, _export_ing asc, _export_hash asc
+| where row_number() > p_skip
+| take p_take
+| project-away _export_ts
+"""
+
+
+class CursorError(ValueError):
+    pass
+
+
+# Columns the query adds for the keyset; they feed the cursor and are not written out.
+_KEY_COLUMNS = ("_export_ing", "_export_hash")
+
+Key = Tuple[str, str, int, int]   # (time, session_id, ingestion ticks, row hash)
+
+
+class Cursor(NamedTuple):
+    after_ts: str
+    after_sid: str
+    after_ing: int
+    after_hash: int
+    skip: int           # rows with exactly this key already served
+    until: str
+
+    @property
+    def key(self) -> Key:
+        return (self.after_ts, self.after_sid, self.after_ing, self.after_hash)
+
+
+class Page(NamedTuple):
+    body: bytes
+    rows: int
+    next_cursor: Optional[str]      # None on the last page
+
+
+def _fingerprint(filters: Dict[str, str]) -> str:
+    raw = "\x1f".join(f"{k}={filters[k]}" for k in sorted(filters))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(cursor: Cursor, filters: Dict[str, str]) -> str:
+    doc = {"v": _CURSOR_VERSION, "t": cursor.after_ts, "s": cursor.after_sid, "i": cursor.after_ing,
+           "h": cursor.after_hash, "n": cursor.skip, "u": cursor.until, "f": _fingerprint(filters)}
+    return base64.urlsafe_b64encode(json_codec.dumps(doc)).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, filters: Dict[str, str]) -> Cursor:
+    try:
+        doc = json_codec.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if doc.get("v") != _CURSOR_VERSION:
+            raise CursorError("unsupported cursor version")
+        cursor = Cursor(str(doc["t"]), str(doc["s"]), int(doc["i"]), int(doc["h"]), int(doc["n"]), str(doc["u"]))
+        fingerprint = doc["f"]
+    except CursorError:
+        raise
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise CursorError("invalid cursor")
+    if fingerprint != _fingerprint(filters):
+        raise CursorError("cursor was issued for different filters")
+    return cursor
+
+
+def query_parameters(filters: Dict[str, str], cursor: Optional[Cursor], take: int, now_iso: str) -> Dict[str, Any]:
+    """Kusto query parameters for one page; the first page pins the ingestion-time snapshot."""
+    return {
+        "p_customer": filters.get("customer", ""),
+        "p_industry": filters.get("industry", ""),
+        "p_from": filters.get("from", ""),
+        "p_to": filters.get("to", ""),
+        "p_after_ts": cursor.after_ts if cursor else "",
+        "p_after_sid": cursor.after_sid if cursor else "",
+        "p_after_ing": cursor.after_ing if cursor else 0,
+        "p_after_hash": cursor.after_hash if cursor else 0,
+        "p_skip": cursor.skip if cursor else 0,
+        "p_until": cursor.until if cursor else now_iso,
+        "p_take": take,
+    }
+
+
+def _plain(value: Any) -> Any:
+    # Kusto SDK cells: datetime for datetime columns, Decimal for decimal ones.
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    if type(value).__name__ == "Decimal":
+        return float(value)
+    return value
+
+
+def write_page(
+    columns: List[str],
+    rows: Iterable[Any],
+    limit: int,
+    time_column: str,
+    until: str,
+    filters: Dict[str, str],
+    max_bytes: int = EXPORT_PAGE_MAX_BYTES,
+    after: Optional[Cursor] = None,
+) -> Page:
+    """Encode rows (the query asked for limit + 1) into one NDJSON page; `after` is the cursor
+    this page was read from.
+
+    A row past `limit`, or a page that reaches `max_bytes`, means there is more to read.
+    """
+    ing_i, hash_i = (columns.index(c) for c in _KEY_COLUMNS)
+    out_columns = [(i, c) for i, c in enumerate(columns) if c not in _KEY_COLUMNS]
+    parts: List[bytes] = []
+    size = 0
+    served = 0
+    # Key of the last row served and how many rows in a row carried it (across pages, too).
+    last: Optional[Key] = after.key if after else None
+    run = after.skip if after else 0
+    more = False
+    for row in rows:
+        if served >= limit or size >= max_bytes:
+            more = True
+            break
+        row = list(row)
+        doc = {c: _plain(row[i]) for i, c in out_columns}
+        line = json_codec.dumps_line(doc)
+        parts.append(line)
+        size += len(line)
+        served += 1
+        key = (str(doc.get(time_column) or ""), str(doc.get("session_id") or ""), int(row[ing_i]), int(row[hash_i]))
+        if key == last:
+            run += 1
+        else:
+            last, run = key, 1
+    next_cursor = None
+    if more and last is not None:
+        next_cursor = encode_cursor(Cursor(*last, run, until), filters)
+    return Page(b"".join(parts), served, next_cursor)
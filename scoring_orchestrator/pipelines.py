@@ -0,0 +1,113 @@
+# pipelines.py — assessment pipeline registry + per-stage ingest timings
+# Each assessment track (AIX, AI Readiness, Digital Readiness, ...) is one AssessmentPipeline:
+# where its rows go (table + mapping), how a body is validated and shaped into a row, and which
+# best-effort hooks (cache writes) run once a body is valid. function_app.py runs every pipeline
+# through the same ingest engine and exposes the same sync/async/bulk routes for each; adding a
+# track is a register() call.
+# StageClock marks the end of each engine stage (one perf_counter per stage); PipelineStats
+# aggregates the marks per pipeline for /api/ingest_stats and the Server-Timing header.
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+Hook = Callable[[Dict[str, Any]], None]
+
+
+@dataclass(frozen=True)
+class AssessmentPipeline:
+    name: str                                       # assessment-type tag; also scopes idempotency keys
+    route: str                                      # POST /api/<route>, <route>_async, <route>_bulk
+    table: str
+    mapping: str
+    validate: Callable[[Any], None]                 # raises ValueError with a client-facing message
+    build_row: Callable[[Dict[str, Any]], Dict[str, Any]]
+    hooks: Tuple[Hook, ...] = ()                    # best-effort, run after validation (cache writes)
+    accepted: Tuple[Hook, ...] = ()                 # best-effort, run with the built row once ingest accepted it
+    label: str = ""                                 # log / error prefix, e.g. "AI "
+    dev_note: str = "row built"                     # 200 message when KUSTO_INGEST_URI is unset
+    time_column: str = "timestamp"                  # event-time column of `table` (export paging)
+
+
+class PipelineRegistry:
+    def __init__(self):
+        self._pipelines: Dict[str, AssessmentPipeline] = {}
+
+    def register(self, pipeline: AssessmentPipeline) -> AssessmentPipeline:
+        if pipeline.name in self._pipelines:
+            raise ValueError(f"pipeline already registered: {pipeline.name}")
+        if any(p.route == pipeline.route for p in self._pipelines.values()):
+            raise ValueError(f"route already registered: {pipeline.route}")
+        self._pipelines[pipeline.name] = pipeline
+        return pipeline
+
+    def get(self, name: str) -> AssessmentPipeline:
+        return self._pipelines[name]
+
+    def names(self) -> List[str]:
+        return list(self._pipelines)
+
+    def __iter__(self) -> Iterator[AssessmentPipeline]:
+        return iter(list(self._pipelines.values()))
+
+
+class StageClock:
+    """Elapsed time per stage of one request; mark() closes the stage that just finished."""
+
+    __slots__ = ("stages", "_last")
+
+    def __init__(self):
+        self.stages: List[Tuple[str, float]] = []
+        self._last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.stages.append((stage, (now - self._last) * 1000.0))
+        self._last = now
+
+    def total_ms(self) -> float:
+        return sum(ms for _, ms in self.stages)
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{stage};dur={ms:.2f}" for stage, ms in self.stages)
+
+
+class PipelineStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, pipeline: str, clock: StageClock, status_code: Optional[int], mode: str = "sync") -> None:
+        total = clock.total_ms()
+        with self._lock:
+            s = self._stats.setdefault(pipeline, {"requests": {}, "status": {}, "stages": {}})
+            s["requests"][mode] = s["requests"].get(mode, 0) + 1
+            code = str(status_code)
+            s["status"][code] = s["status"].get(code, 0) + 1
+            for stage, ms in clock.stages + [("total", total)]:
+                st = s["stages"].get(stage)
+                if st is None:
+                    st = s["stages"][stage] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+                st["count"] += 1
+                st["total_ms"] += ms
+                if ms > st["max_ms"]:
+                    st["max_ms"] = ms
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = {}
+            for name, s in self._stats.items():
+                stages = {}
+                for stage, st in s["stages"].items():
+                    stages[stage] = {
+                        "count": st["count"],
+                        "avg_ms": round(st["total_ms"] / st["count"], 3),
+                        "max_ms": round(st["max_ms"], 3),
+                    }
+                out[name] = {
+                    "requests": dict(s["requests"]),
+                    "status": dict(s["status"]),
+                    "stages": stages,
+                }
+        return out
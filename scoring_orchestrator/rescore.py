@@ -0,0 +1,419 @@
+# rescore.py — re-score historical rows after a level-band / scoring change, and write them back
+# Streams rows for one track out of ADX (keyset-paged by timestamp + session_id) or out of a local
+# NDJSON export. Each chunk is re-scored with the vectorised scoring.score_batch() in a process
+# pool. Only rows whose score fields changed are re-ingested, as multi-line streaming-ingest POSTs.
+# ADX is append-only: a corrected row is a new row (stamped with a fresh received_at_utc) with the
+# same event time as the one it corrects, so the latest-record readers order by event time and
+# then ingestion_time() (latest_views.latest_rank), and the correction wins the tie.
+#
+# Usage (from scoring_orchestrator/, with requirements.txt installed):
+#   python rescore.py ai --dry-run --diff diff.ndjson               # what would change, nothing written
+#   python rescore.py ai                                            # read + rewrite from ADX
+#   python rescore.py digital --dry-run --diff digital.ndjson       # Digital is report-only (bands)
+#   python rescore.py aix --input export.ndjson --dry-run --diff aix.ndjson  # AIX is report-only
+#   python rescore.py ai --resume                                   # continue from the last checkpoint
+# ADX reads need KUSTO_DATA_URI, writes need KUSTO_INGEST_URI (same settings as function_app.py).
+# The checkpoint is written after every chunk has been applied in order, so an interrupted run
+# resumes at the first chunk that was not yet written. A fresh run (no --resume) also pins the
+# read to rows ingested before it started, so its own corrected rows are never read back.
+
+import argparse
+import logging
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import ingest_gzip
+import ingest_transport
+import json_codec
+import scoring
+import token_cache
+from dead_letter import parse_retry_after
+from ingest_batcher import INGEST_BATCH_MAX_BYTES
+from lookup_keys import key_fields
+
+# ---------------- Config (same settings as function_app.py) ----------------
+KUSTO_INGEST_URI = os.environ.get("KUSTO_INGEST_URI")
+KUSTO_DATA_URI   = os.environ.get("KUSTO_DATA_URI")
+ADX_DB           = os.environ.get("ADX_DATABASE", "aixdb")
+
+KUSTO_INGEST_SCOPE = "https://ingest.kusto.windows.net/.default"
+KUSTO_DATA_SCOPE   = "https://kusto.kusto.windows.net/.default"
+
+RESCORE_CHUNK_ROWS = int(os.environ.get("RESCORE_CHUNK_ROWS", "5000"))
+RESCORE_INGEST_ATTEMPTS = 3
+
+
+@dataclass(frozen=True)
+class TrackSource:
+    name: str                       # scoring track name / CLI choice
+    table: str
+    mapping: str
+    time_column: str                # keyset paging + ordering
+    fields: Tuple[str, ...]         # score columns that may change
+    report_only: bool = False       # provisional scoring: --dry-run only, never rewritten
+
+
+TRACK_SOURCES: Dict[str, TrackSource] = {
+    "aix": TrackSource(
+        "AIX",
+        os.environ.get("ADX_TABLE", "aix_scores_v2"),
+        os.environ.get("ADX_MAPPING", "aix_scores_json_map"),
+        "timestamp_utc",
+        ("overall_score_500",),
+        report_only=True,           # scoring.score_aix is provisional
+    ),
+    "ai": TrackSource(
+        scoring.AI_READINESS.name,
+        os.environ.get("AI_ADX_TABLE", "ai_readiness_scores"),
+        os.environ.get("AI_ADX_MAPPING", "ai_readiness_scores_json_map"),
+        "timestamp",
+        (scoring.AI_READINESS.total_field, "percent", "level", "maturity"),
+    ),
+    "digital": TrackSource(
+        scoring.DIGITAL_READINESS.name,
+        os.environ.get("DIGITAL_ADX_TABLE", "digital_readiness_scores"),
+        os.environ.get("DIGITAL_ADX_MAPPING", "digital_readiness_scores_json_map"),
+        "timestamp",
+        (scoring.DIGITAL_READINESS.total_field, "percent", "level", "maturity"),
+        report_only=scoring.DIGITAL_READINESS.bands_provisional,
+    ),
+}
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _plain(value: Any) -> Any:
+    # Kusto SDK cells: datetime for datetime columns, Decimal for decimal ones.
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    if type(value).__name__ == "Decimal":
+        return float(value)
+    return value
+
+
+# ---------------- Sources ----------------
+# Each yields (rows, cursor after the chunk); the cursor is what the checkpoint stores.
+Chunk = Tuple[List[Dict[str, Any]], Dict[str, Any]]
+
+ADX_CHUNK_QUERY = """
+declare query_parameters(p_after_ts:string = "", p_after_sid:string = "", p_after_ing:long = 0,
+                         p_after_hash:long = 0, p_skip:long = 0, p_until:string = "", p_take:long = 5000);
+{table}
+| where isempty(p_until) or ingestion_time() <= todatetime(p_until)
+| extend _rescore_hash = hash(tostring(pack_all()))
+| extend _rescore_ts = todatetime({time_column}), _rescore_ing = coalesce(tolong(ingestion_time()), 0)
+| where isnotnull(_rescore_ts)
+| where isempty(p_after_ts)
+     or _rescore_ts > todatetime(p_after_ts)
+     or (_rescore_ts == todatetime(p_after_ts)
+         and (strcmp(session_id, p_after_sid) > 0
+              or (session_id == p_after_sid
+                  and (_rescore_ing > p_after_ing
+                       or (_rescore_ing == p_after_ing and _rescore_hash >= p_after_hash)))))
+| order by _rescore_ts asc, session_id asc, _rescore_ing asc, _rescore_hash asc
+| where row_number() > p_skip
+| take p_take
+| project-away _rescore_ts
+"""
+
+
+def _adx_chunks(src: TrackSource, cursor: Dict[str, Any], chunk_rows: int) -> Iterator[Chunk]:
+    """Keyset paging on (time column, session_id, ingestion ticks, row hash), as in
+    ndjson_export. Time + session_id repeat for retries and earlier corrections, and each of those
+    rows is re-scored; rows equal in all four keys are identical, so the cursor counts how many
+    of them were already read (skip)."""
+    if not KUSTO_DATA_URI:
+        raise RuntimeError("KUSTO_DATA_URI is not set (or pass --input)")
+    from azure.kusto.data import ClientRequestProperties, KustoClient, KustoConnectionStringBuilder
+
+    kcsb = KustoConnectionStringBuilder.with_token_provider(
+        KUSTO_DATA_URI, token_cache.token_provider(KUSTO_DATA_SCOPE)
+    )
+    client = KustoClient(kcsb)
+    query = ADX_CHUNK_QUERY.format(table=src.table, time_column=src.time_column)
+    key = (cursor.get("after_ts", ""), cursor.get("after_sid", ""),
+           int(cursor.get("after_ing", 0)), int(cursor.get("after_hash", 0)))
+    skip = int(cursor.get("skip", 0))
+    until = cursor["until"]
+    while True:
+        props = ClientRequestProperties()
+        for name, value in zip(("p_after_ts", "p_after_sid", "p_after_ing", "p_after_hash"), key):
+            props.set_parameter(name, value)
+        props.set_parameter("p_skip", skip)
+        props.set_parameter("p_until", until)
+        props.set_parameter("p_take", chunk_rows)
+        resp = client.execute(ADX_DB, query, props)
+        table = resp.primary_results[0] if resp.primary_results else None
+        if not table or table.rows_count == 0:
+            return
+        cols = [c.column_name for c in table.columns]
+        rows = [{c: _plain(v) for c, v in zip(cols, r)} for r in table.rows]
+        for row in rows:
+            row_key = (str(row[src.time_column]), str(row.get("session_id") or ""),
+                       int(row.pop("_rescore_ing")), int(row.pop("_rescore_hash")))
+            key, skip = (key, skip + 1) if row_key == key else (row_key, 1)
+        yield rows, {"after_ts": key[0], "after_sid": key[1], "after_ing": key[2], "after_hash": key[3],
+                     "skip": skip, "until": until}
+        if len(rows) < chunk_rows:
+            return
+
+
+def _file_chunks(path: str, cursor: Dict[str, Any], chunk_rows: int) -> Iterator[Chunk]:
+    """NDJSON export, one row per line; the cursor is the byte offset after the chunk."""
+    with open(path, "rb") as f:
+        f.seek(int(cursor.get("offset", 0)))
+        rows: List[Dict[str, Any]] = []
+        while True:
+            line = f.readline()
+            if line.strip():
+                rows.append(json_codec.loads(line))
+            if len(rows) >= chunk_rows or (not line and rows):
+                yield rows, {"offset": f.tell()}
+                rows = []
+            if not line:
+                return
+
+
+# ---------------- Re-scoring (runs in the worker processes) ----------------
+def _stored_value(value: Any) -> Any:
+    """Numbers that older rows stored as strings ("3", "60.0"), as numbers; anything else as is."""
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return value
+        return int(number) if number.is_integer() else number
+    return value
+
+
+def _rescore_chunk(track: str, fields: Tuple[str, ...], rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Score one chunk; returns only the changed rows, plus what changed."""
+    import numpy as np
+
+    changed: List[Dict[str, Any]] = []
+    diffs: List[Dict[str, Any]] = []
+    invalid = 0
+
+    if track == "AIX":
+        usable, domain_scores = [], []
+        for i, r in enumerate(rows):
+            try:
+                domain_scores.append([float(d["score"]) for d in r["domains"]])
+            except (KeyError, TypeError, ValueError):
+                continue
+            usable.append(i)
+        invalid = len(rows) - len(usable)
+        new = {"overall_score_500": scoring.score_aix_batch(domain_scores)["overall_score_500"]} if usable else {}
+    else:
+        t = scoring.TRACKS[track]
+        usable = [
+            i for i, r in enumerate(rows)
+            if isinstance(r.get("answers"), list) and len(r["answers"]) == t.answers
+            and all(type(v) is int for v in r["answers"])
+        ]
+        new = {}
+        if usable:
+            a = np.array([rows[i]["answers"] for i in usable], dtype=np.int64)
+            ok = ~((a < t.answer_min) | (a > t.answer_max)).any(axis=1)
+            usable = [i for i, good in zip(usable, ok.tolist()) if good]
+            if usable:
+                s = scoring.score_batch(t, a[ok])
+                new = {t.total_field: s["total"], "percent": s["percent"], "level": s["level"],
+                       "maturity": s["maturity"]}
+        invalid = len(rows) - len(usable)
+
+    columns = {f: new[f].tolist() for f in fields} if new else {}
+    transitions: Counter = Counter()
+    field_counts: Counter = Counter()
+    for k, i in enumerate(usable):
+        row = rows[i]
+        diff = {}
+        for f in fields:
+            server = columns[f][k]
+            if _stored_value(row.get(f)) != server:
+                diff[f] = [row.get(f), server]
+        if not diff:
+            continue
+        field_counts.update(diff.keys())
+        if "maturity" in diff:
+            transitions[f"{diff['maturity'][0]} -> {diff['maturity'][1]}"] += 1
+        fixed = dict(row)
+        for f, (_, server) in diff.items():
+            fixed[f] = server
+        fixed.update(key_fields(row.get("customer"), row.get("participant_name")))  # older rows lack them
+        changed.append(fixed)
+        diffs.append({"session_id": row.get("session_id"), "changes": diff})
+    return {
+        "rows": len(rows),
+        "invalid": invalid,
+        "changed": changed,
+        "diffs": diffs,
+        "fields": dict(field_counts),
+        "transitions": dict(transitions),
+    }
+
+
+# ---------------- Write-back ----------------
+def _ingest_lines(src: TrackSource, lines: List[bytes]) -> None:
+    """POST the corrected rows in ADX-sized batches; raises after RESCORE_INGEST_ATTEMPTS."""
+    if not KUSTO_INGEST_URI:
+        raise RuntimeError("KUSTO_INGEST_URI is not set (or pass --dry-run)")
+    url = f"{KUSTO_INGEST_URI}/v1/rest/ingest/{ADX_DB}/{src.table}?streamFormat=json&mappingName={src.mapping}"
+    start, size = 0, 0
+    for i, line in enumerate(lines):
+        if i > start and size + len(line) > INGEST_BATCH_MAX_BYTES:
+            _post_batch(src, url, b"".join(lines[start:i]))
+            start, size = i, 0
+        size += len(line)
+    if start < len(lines):
+        _post_batch(src, url, b"".join(lines[start:]))
+
+
+def _post_batch(src: TrackSource, url: str, body: bytes) -> None:
+    for attempt in range(1, RESCORE_INGEST_ATTEMPTS + 1):
+        payload, extra = ingest_gzip.maybe_compress(src.table, body)
+        headers = {
+            "Authorization": f"Bearer {token_cache.get_token(KUSTO_INGEST_SCOPE)}",
+            "Content-Type": "application/json; charset=utf-8",
+            **extra,
+        }
+        resp = ingest_transport.post(url, payload, headers)
+        if resp.status_code in (200, 202):
+            return
+        if attempt == RESCORE_INGEST_ATTEMPTS or resp.status_code not in (408, 429, 500, 502, 503, 504):
+            raise RuntimeError(f"ADX ingest error ({src.table}): {resp.status_code} {resp.text}")
+        delay = parse_retry_after(resp.headers.get("Retry-After")) or 2.0 ** attempt
+        logging.warning("ADX ingest %s (%s); retrying in %.1fs", resp.status_code, src.table, delay)
+        time.sleep(delay)
+
+
+# ---------------- Checkpoint ----------------
+def _load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "rb") as f:
+            return json_codec.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def _save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(json_codec.dumps(state))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ---------------- Driver ----------------
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    src = TRACK_SOURCES[args.track]
+    checkpoint_path = args.checkpoint or f"rescore-{args.track}{'-dry' if args.dry_run else ''}.checkpoint.json"
+    source_id = os.path.abspath(args.input) if args.input else f"adx:{ADX_DB}/{src.table}"
+
+    if src.report_only and not args.dry_run:
+        # Provisional scoring (see scoring.py): report disagreements, never rewrite history.
+        raise SystemExit(f"{args.track} re-scoring is report-only until its scoring is confirmed; pass --dry-run")
+    if not args.dry_run and not KUSTO_INGEST_URI:
+        raise SystemExit("KUSTO_INGEST_URI is not set (or pass --dry-run)")
+    if not args.input and not KUSTO_DATA_URI:
+        raise SystemExit("KUSTO_DATA_URI is not set (or pass --input)")
+
+    state = _load_checkpoint(checkpoint_path) if args.resume else None
+    if state is not None:
+        if state.get("source") != source_id or state.get("track") != args.track:
+            raise SystemExit(f"{checkpoint_path} belongs to {state.get('track')} / {state.get('source')}")
+        if state.get("done"):
+            print(f"{checkpoint_path}: already complete", file=sys.stderr)
+            return state
+    else:
+        cursor: Dict[str, Any] = {} if args.input else {"until": _utc_now_iso()}
+        state = {"track": args.track, "source": source_id, "dry_run": args.dry_run, "cursor": cursor,
+                 "rows": 0, "invalid": 0, "changed": 0, "written": 0, "fields": {}, "transitions": {},
+                 "done": False}
+
+    chunks = (
+        _file_chunks(args.input, state["cursor"], args.chunk_rows)
+        if args.input
+        else _adx_chunks(src, state["cursor"], args.chunk_rows)
+    )
+    diff_out = open(args.diff, "ab") if args.diff else None
+    fields: Counter = Counter(state["fields"])
+    transitions: Counter = Counter(state["transitions"])
+    started, rows_at_start = time.perf_counter(), state["rows"]
+
+    def apply(result: Dict[str, Any], cursor: Dict[str, Any]) -> None:
+        # Strictly in read order: the checkpoint cursor never passes an unwritten chunk.
+        if result["changed"] and not args.dry_run:
+            _ingest_lines(src, [json_codec.dumps_line(dict(r, received_at_utc=_utc_now_iso()))
+                                for r in result["changed"]])
+            state["written"] += len(result["changed"])
+        if diff_out is not None:
+            diff_out.write(b"".join(json_codec.dumps_line(d) for d in result["diffs"]))
+            diff_out.flush()
+        fields.update(result["fields"])
+        transitions.update(result["transitions"])
+        state.update(cursor=cursor, fields=dict(fields), transitions=dict(transitions))
+        state["rows"] += result["rows"]
+        state["invalid"] += result["invalid"]
+        state["changed"] += len(result["changed"])
+        _save_checkpoint(checkpoint_path, state)
+        elapsed = time.perf_counter() - started
+        rate = (state["rows"] - rows_at_start) / elapsed if elapsed > 0 else 0.0
+        print(f"{src.name}: {state['rows']} rows, {state['changed']} changed, {state['written']} written, "
+              f"{rate:,.0f} rows/s", file=sys.stderr)
+
+    try:
+        if args.workers <= 1:
+            for rows, cursor in chunks:
+                apply(_rescore_chunk(src.name, src.fields, rows), cursor)
+        else:
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                inflight: Deque[Tuple[Future, Dict[str, Any]]] = deque()
+                for rows, cursor in chunks:
+                    inflight.append((pool.submit(_rescore_chunk, src.name, src.fields, rows), cursor))
+                    if len(inflight) >= args.workers * 2:  # bounded read-ahead
+                        fut, c = inflight.popleft()
+                        apply(fut.result(), c)
+                while inflight:
+                    fut, c = inflight.popleft()
+                    apply(fut.result(), c)
+        state["done"] = True
+        _save_checkpoint(checkpoint_path, state)
+    finally:
+        if diff_out is not None:
+            diff_out.close()
+        ingest_transport.close()
+
+    elapsed = time.perf_counter() - started
+    state["rows_per_s"] = round((state["rows"] - rows_at_start) / elapsed, 1) if elapsed > 0 else 0.0
+    return state
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Re-score historical assessment rows and write them back to ADX.")
+    parser.add_argument("track", choices=sorted(TRACK_SOURCES))
+    parser.add_argument("--input", help="NDJSON export to read instead of ADX")
+    parser.add_argument("--dry-run", action="store_true", help="score and diff only; nothing is ingested")
+    parser.add_argument("--diff", help="append one NDJSON line per changed row (session_id + old/new values)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="scoring processes (1 = inline)")
+    parser.add_argument("--chunk-rows", type=int, default=RESCORE_CHUNK_ROWS)
+    parser.add_argument("--checkpoint", help="checkpoint file (default rescore-<track>[-dry].checkpoint.json)")
+    parser.add_argument("--resume", action="store_true", help="continue from the checkpoint")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    summary = run(args)
+    sys.stdout.buffer.write(json_codec.dumps(summary) + b"\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+# schemas.py — request-body validators compiled from score_and_push.openapi.json
+# The OpenAPI file is the single source of truth for the three ingest payloads. At import, each
+# operation's JSON schema is turned into the source of one flat Python function (required-key set
+# check, inlined type/range checks, C-level fast path for integer arrays) and compiled once, so a
+# request pays for a handful of comparisons instead of walking the schema. Every problem is
+# reported in one pass.
+# Valid bodies (the common case) are accepted by a single boolean expression of constant-key
+# subscripts and type tests; only an invalid body walks the fields again to collect messages.
+# Supported keywords: type, nullable, required, properties, items, minItems, maxItems,
+# minimum, maximum, enum.
+
+import json
+import os
+from typing import Any, Callable, Dict, List
+
+DEFAULT_SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "score_and_push.openapi.json")
+
+# Report at most this many bad items per array (a 28-answer payload of strings shouldn't yield 28 lines).
+MAX_ITEM_ERRORS = 5
+# Integer item ranges up to this size are checked with a precomputed set instead of a Python loop.
+_MAX_RANGE_SET = 256
+
+
+class SchemaValidationError(ValueError):
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+_MISSING = object()
+
+_TYPE_TESTS = {
+    "string": "type({v}) is str",
+    "integer": "type({v}) is int",
+    "number": "type({v}) is int or type({v}) is float",  # bool is not a number here
+    "boolean": "type({v}) is bool",
+}
+
+_TYPE_NAMES = {
+    "string": "a string",
+    "integer": "an integer",
+    "number": "a number",
+    "boolean": "a boolean",
+    "array": "an array",
+    "object": "an object",
+}
+
+
+def _fstr(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+class _Codegen:
+    """Emits the body of one validator. Paths are f-string bodies, e.g. "domains[{i2}].score"."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.consts: Dict[str, Any] = {"_MISSING": _MISSING, "MAX_ITEM_ERRORS": MAX_ITEM_ERRORS}
+        self._n = 0
+        self._ranges: Dict[tuple, str] = {}
+
+    def name(self, prefix: str) -> str:
+        self._n += 1
+        return f"{prefix}{self._n}"
+
+    def const(self, value: Any) -> str:
+        name = self.name("_k")
+        self.consts[name] = value
+        return name
+
+    def emit(self, depth: int, line: str) -> None:
+        self.lines.append("    " * depth + line)
+
+    def error(self, depth: int, message: str) -> None:
+        self.emit(depth, f'errors.append(f"{message}")')
+
+    # ---- fast path: one expression that is True only for a valid value ----
+    # Straight-line constant-key subscripts are the cheapest dict access CPython has; a missing
+    # required key raises KeyError, which the caller treats as "take the error path".
+    def fast(self, schema: Dict[str, Any], var: str) -> str:
+        kind = schema.get("type")
+        conds = []
+        if kind in _PY_TYPES:
+            types = _PY_TYPES[kind] + ((type(None),) if schema.get("nullable") else ())
+            if len(types) == 1:
+                conds.append(f"type({var}) is {self.const(types[0])}")
+            else:
+                conds.append(f"type({var}) in {self.const(frozenset(types))}")
+        deep = []
+        if kind == "object":
+            deep = self.fast_object(schema, var)
+        elif kind == "array":
+            deep = self.fast_array(schema, var)
+        else:
+            deep = self.fast_scalar(schema, var)
+        if deep:
+            expr = " and ".join(deep)
+            conds.append(f"({var} is None or {expr})" if schema.get("nullable") else expr)
+        return " and ".join(conds) if conds else "True"
+
+    def fast_object(self, schema: Dict[str, Any], var: str) -> List[str]:
+        required = schema.get("required", ())
+        props = schema.get("properties", {})
+        conds = [f"{name!r} in {var}" for name in required if name not in props]
+        for name, sub in props.items():
+            if not _has_checks(sub):
+                if name in required:
+                    conds.append(f"{name!r} in {var}")
+                continue
+            expr = self.fast(sub, f"{var}[{name!r}]")
+            conds.append(f"({expr})" if name in required else f"({name!r} not in {var} or {expr})")
+        return conds
+
+    def fast_array(self, schema: Dict[str, Any], var: str) -> List[str]:
+        conds = []
+        lo, hi = schema.get("minItems"), schema.get("maxItems")
+        if lo is not None and lo == hi:
+            conds.append(f"len({var}) == {int(lo)}")
+        else:
+            if lo is not None:
+                conds.append(f"len({var}) >= {int(lo)}")
+            if hi is not None:
+                conds.append(f"len({var}) <= {int(hi)}")
+        items = schema.get("items")
+        if items and _has_checks(items):
+            allowed = self._int_range_set(items)
+            if allowed:
+                conds.append(f"_INT_ONLY.issuperset(map(type, {var})) and {allowed}.issuperset({var})")
+            else:
+                item = self.name("x")
+                conds.append(f"all({self.fast(items, item)} for {item} in {var})")
+        return conds
+
+    def fast_scalar(self, schema: Dict[str, Any], var: str) -> List[str]:
+        conds = []
+        if schema.get("minimum") is not None:
+            conds.append(f"{var} >= {schema['minimum']!r}")
+        if schema.get("maximum") is not None:
+            conds.append(f"{var} <= {schema['maximum']!r}")
+        if "enum" in schema:
+            conds.append(f"{var} in {self.const(frozenset(schema['enum']))}")
+        return conds
+
+    def _int_range_set(self, items: Dict[str, Any]):
+        """Name of a precomputed frozenset for small non-null integer ranges, else None."""
+        if items.get("type") != "integer" or items.get("nullable") or "enum" in items:
+            return None
+        mn, mx = items.get("minimum"), items.get("maximum")
+        if mn is None or mx is None or mx - mn >= _MAX_RANGE_SET:
+            return None
+        key = ("_range", int(mn), int(mx))
+        if key not in self._ranges:
+            self._ranges[key] = self.const(frozenset(range(int(mn), int(mx) + 1)))
+            self.consts["_INT_ONLY"] = frozenset([int])
+        return self._ranges[key]
+
+    # ---- full check: collects every error ----
+    def node(self, schema: Dict[str, Any], var: str, path: str, depth: int) -> None:
+        if schema.get("nullable"):
+            self.emit(depth, f"if {var} is not None:")
+            depth += 1
+        kind = schema.get("type")
+        if kind == "object":
+            self.object(schema, var, path, depth)
+        elif kind == "array":
+            self.array(schema, var, path, depth)
+        else:
+            self.scalar(schema, var, path, depth)
+
+    def object(self, schema: Dict[str, Any], var: str, path: str, depth: int) -> None:
+        self.emit(depth, f"if type({var}) is not dict:")
+        self.error(depth + 1, f"{path or 'body'} must be an object")
+        self.emit(depth, "else:")
+        depth += 1
+        required = list(schema.get("required", ()))
+        if required:
+            req_set = self.const(frozenset(required))
+            req_order = self.const(tuple(required))
+            prefix = f"{path}: " if path else ""
+            self.emit(depth, f"if not {var}.keys() >= {req_set}:")
+            self.emit(
+                depth + 1,
+                f'errors.append(f"{prefix}Missing fields: " + ", ".join([k for k in {req_order} if k not in {var}]))',
+            )
+        props = schema.get("properties", {})
+        if not props:
+            self.emit(depth, "pass")
+        for name, sub in props.items():
+            if not _has_checks(sub):
+                continue
+            child = self.name("v")
+            self.emit(depth, f"{child} = {var}.get({name!r}, _MISSING)")
+            self.emit(depth, f"if {child} is not _MISSING:")
+            child_path = f"{path}.{_fstr(name)}" if path else _fstr(name)
+            self.node(sub, child, child_path, depth + 1)
+
+    def array(self, schema: Dict[str, Any], var: str, path: str, depth: int) -> None:
+        self.emit(depth, f"if type({var}) is not list:")
+        self.error(depth + 1, f"{path} must be an array")
+        self.emit(depth, "else:")
+        depth += 1
+        lo = schema.get("minItems")
+        hi = schema.get("maxItems")
+        if lo is not None or hi is not None:
+            conds = []
+            if lo is not None:
+                conds.append(f"len({var}) < {int(lo)}")
+            if hi is not None:
+                conds.append(f"len({var}) > {int(hi)}")
+            if lo is not None and lo == hi:
+                msg = f"{path} must contain exactly {lo} values"
+            else:
+                msg = f"{path} must contain between {lo or 0} and {hi if hi is not None else 'any number of'} values"
+            self.emit(depth, f"if {' or '.join(conds)}:")
+            self.error(depth + 1, msg)
+
+        items = schema.get("items")
+        if not items or not _has_checks(items):
+            self.emit(depth, "pass")
+            return
+
+        # Fast path for small integer ranges (the answers vectors): two C-level set checks. The type
+        # check goes first, so unhashable items (lists, dicts) never reach the set lookup.
+        allowed = self._int_range_set(items)
+        guard = f"not (_INT_ONLY.issuperset(map(type, {var})) and {allowed}.issuperset({var}))" if allowed else None
+        if guard:
+            self.emit(depth, f"if {guard}:")
+            depth += 1
+
+        idx, item, bad, before = self.name("i"), self.name("v"), self.name("bad"), self.name("n")
+        self.emit(depth, f"{bad} = 0")
+        self.emit(depth, f"for {idx}, {item} in enumerate({var}):")
+        self.emit(depth + 1, f"{before} = len(errors)")
+        self.node(items, item, f"{path}[{{{idx}}}]", depth + 1)
+        self.emit(depth + 1, f"if len(errors) > {before}:")
+        self.emit(depth + 2, f"{bad} += 1")
+        self.emit(depth + 2, f"if {bad} > MAX_ITEM_ERRORS:")
+        self.emit(depth + 3, f"del errors[{before}:]")
+        self.emit(depth, f"if {bad} > MAX_ITEM_ERRORS:")
+        self.error(depth + 1, f"{path}: {{{bad} - MAX_ITEM_ERRORS}} more invalid items")
+
+    def scalar(self, schema: Dict[str, Any], var: str, path: str, depth: int) -> None:
+        kind = schema.get("type")
+        keyword = "if"
+        if kind in _TYPE_TESTS:
+            self.emit(depth, f"if not ({_TYPE_TESTS[kind].format(v=var)}):")
+            self.error(depth + 1, f"{path} must be {_TYPE_NAMES[kind]}")
+            keyword = "elif"
+        mn, mx = schema.get("minimum"), schema.get("maximum")
+        if mn is not None or mx is not None:
+            conds = []
+            if mn is not None:
+                conds.append(f"{var} < {mn!r}")
+            if mx is not None:
+                conds.append(f"{var} > {mx!r}")
+            if mn is not None and mx is not None:
+                msg = f"{path} must be between {mn} and {mx}"
+            elif mn is not None:
+                msg = f"{path} must be >= {mn}"
+            else:
+                msg = f"{path} must be <= {mx}"
+            self.emit(depth, f"{keyword} {' or '.join(conds)}:")
+            self.error(depth + 1, msg)
+            keyword = "elif"
+        if "enum" in schema:
+            values = list(schema["enum"])
+            self.emit(depth, f"{keyword} {var} not in {self.const(frozenset(values))}:")
+            self.error(depth + 1, f"{path} must be one of {_fstr(repr(values))}")
+            keyword = "elif"
+        if keyword == "if":
+            self.emit(depth, "pass")
+
+
+_PY_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+}
+
+
+def _has_checks(schema: Dict[str, Any]) -> bool:
+    return any(k in schema for k in ("type", "enum", "minimum", "maximum", "required", "properties", "items"))
+
+
+def compile_schema(schema: Dict[str, Any], name: str = "validate") -> Callable[[Any], List[str]]:
+    """Compile a JSON schema into `name(body) -> list of error strings` (empty when valid)."""
+    gen = _Codegen()
+    gen.emit(0, f"def {name}(v0):")
+    gen.emit(1, "try:")
+    gen.emit(2, f"if {gen.fast(schema, 'v0')}:")
+    gen.emit(3, "return []")
+    gen.emit(1, "except KeyError:")
+    gen.emit(2, "pass")
+    gen.emit(1, "errors = []")
+    gen.node(schema, "v0", "", 1)
+    gen.emit(1, "return errors")
+    source = "\n".join(gen.lines) + "\n"
+    namespace = dict(gen.consts)
+    exec(compile(source, f"<schema {name}>", "exec"), namespace)
+    fn = namespace[name]
+    fn.__source__ = source
+    return fn
+
+
+class SchemaRegistry:
+    """operationId -> compiled request-body validator, built once from the OpenAPI spec."""
+
+    def __init__(self, spec_path: str = DEFAULT_SPEC_PATH):
+        with open(spec_path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+        self._checks: Dict[str, Callable[[Any], List[str]]] = {}
+        for item in spec.get("paths", {}).values():
+            for op in item.values():
+                op_id = op.get("operationId")
+                schema = (
+                    op.get("requestBody", {})
+                    .get("content", {})
+                    .get("application/json", {})
+                    .get("schema")
+                )
+                if op_id and schema:
+                    self._checks[op_id] = compile_schema(schema, f"check_{op_id}")
+
+    def operations(self) -> List[str]:
+        return sorted(self._checks)
+
+    def errors(self, operation_id: str, body: Any) -> List[str]:
+        return self._checks[operation_id](body)
+
+    def validator(self, operation_id: str) -> Callable[[Any], None]:
+        """A drop-in for the old _validate* functions: raises SchemaValidationError with all errors."""
+        check = self._checks[operation_id]
+
+        def validate(body: Any) -> None:
+            errors = check(body)
+            if errors:
+                raise SchemaValidationError(errors)
+
+        validate.__name__ = f"validate_{operation_id}"
+        return validate
@@ -0,0 +1,193 @@
+# scoring.py — server-side scoring for the AIX, AI Readiness and Digital Readiness tracks
+# Totals, percent, level and maturity are computed from the raw answers instead of trusted from the
+# client. Level bands are tables (ascending minimum total -> level, maturity) so the Python, NumPy
+# and TypeScript (AIreadiness/score_to_level.ts) versions are the same data:
+#   AI Readiness       21 answers x 1..5 = 21..105   bands at 22 / 43 / 64 / 85   (score_to_level.ts)
+#   Digital Readiness  28 answers x 1..5 = 28..140   bands at 29 / 57 / 85 / 113  (provisional)
+#   AIX                domain scores 0..5 -> 0..500  bands at 101 / 201 / 301 / 401 (_level_from_score)
+# The AIX formula (mean domain score x 100) is provisional: nothing upstream defines it, so the
+# ingest path stores the client's overall_score_500 and only counts disagreements. The Digital bands
+# are provisional for the same reason (the repo has no Digital band table; these just mirror the AI
+# ones), so Digital rows keep the client's level / maturity and only the total and percent, which
+# follow from the answers, are the server's.
+# score_answers()/score_aix() score one submission in pure Python (the ingest path); the *_batch
+# variants score thousands of rows in one vectorised NumPy call (backfills / offline jobs). NumPy is
+# imported by the first batch call only.
+
+import bisect
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+# (minimum total, level, maturity), ascending; a total below the first band gets level 1.
+Band = Tuple[int, int, str]
+
+NOT_STARTED = "Not Started"
+
+
+@dataclass(frozen=True)
+class Track:
+    name: str
+    answers: int               # questions per submission
+    answer_min: int
+    answer_max: int
+    total_field: str           # row column holding the raw total
+    bands: Tuple[Band, ...]
+    bands_provisional: bool = False   # level / maturity are only compared, never stored
+
+    @property
+    def max_total(self) -> int:
+        return self.answers * self.answer_max
+
+
+def _equal_bands(answers: int) -> Tuple[Band, ...]:
+    # Five equal-width bands over answers..5*answers; level k starts at answers*(k-1)+1.
+    names = ("Initial", "Developing", "Advanced", "Leading")
+    return tuple((answers * k + 1, k + 1, names[k - 1]) for k in range(1, 5))
+
+
+AI_READINESS = Track("AI_READINESS", 21, 1, 5, "total_105", _equal_bands(21))
+DIGITAL_READINESS = Track("DIGITAL_READINESS", 28, 1, 5, "total_140", _equal_bands(28), bands_provisional=True)
+
+TRACKS: Dict[str, Track] = {t.name: t for t in (AI_READINESS, DIGITAL_READINESS)}
+
+# AIX: mean domain score (0..AIX_DOMAIN_MAX) scaled to 0..500.
+AIX_MAX = 500
+AIX_DOMAIN_MAX = 5
+AIX_BANDS: Tuple[Tuple[int, str], ...] = (
+    (101, "Initial"),
+    (201, "Developing"),
+    (301, "Advanced"),
+    (401, "Leading"),
+)
+
+
+class Score(NamedTuple):
+    total: int
+    percent: float
+    level: int
+    maturity: str
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {"scored": 0, "batch_rows": 0, "client_mismatches": 0}
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += n
+
+
+# ---------------- One submission (pure Python) ----------------
+def level_for(track: Track, total: float) -> Tuple[int, str]:
+    mins = [b[0] for b in track.bands]
+    i = bisect.bisect_right(mins, total)
+    if i == 0:
+        return 1, NOT_STARTED
+    _, level, maturity = track.bands[i - 1]
+    return level, maturity
+
+
+def score_answers(track: Track, answers: Sequence[int]) -> Score:
+    if len(answers) != track.answers:
+        raise ValueError(f"answers must contain exactly {track.answers} values")
+    lo, hi = track.answer_min, track.answer_max
+    for v in answers:
+        if type(v) is not int or v < lo or v > hi:
+            raise ValueError(f"each answer must be an integer between {lo} and {hi}")
+    total = sum(answers)
+    level, maturity = level_for(track, total)
+    _count("scored")
+    return Score(total, round(total / track.max_total * 100.0, 2), level, maturity)
+
+
+def aix_maturity(score_500: float) -> str:
+    mins = [b[0] for b in AIX_BANDS]
+    i = bisect.bisect_right(mins, score_500)
+    return AIX_BANDS[i - 1][1] if i else NOT_STARTED
+
+
+def score_aix(domains: Sequence[Dict[str, Any]]) -> int:
+    """0..500 from the mean of the domain scores (each 0..AIX_DOMAIN_MAX)."""
+    scores = [float(d["score"]) for d in domains]
+    if not scores:
+        return 0
+    mean = min(max(sum(scores) / len(scores), 0.0), float(AIX_DOMAIN_MAX))
+    _count("scored")
+    return int(round(mean / AIX_DOMAIN_MAX * AIX_MAX))
+
+
+def note_mismatch(track_name: str, field: str, client: Any, server: Any) -> None:
+    """Client-sent value differs from the server's (counted; for AIX and the provisional Digital
+    level / maturity the client value is stored)."""
+    _count("client_mismatches")
+    logging.info("%s %s: client sent %r, server scored %r", track_name, field, client, server)
+
+
+# ---------------- Batches (NumPy, vectorised) ----------------
+def score_batch(track: Track, answers: Any) -> Dict[str, Any]:
+    """Score an (n, track.answers) matrix in one call.
+
+    Returns NumPy arrays: total (int), percent (float, 2dp), level (int), maturity (object).
+    Raises ValueError naming the first bad row if any answer is out of range.
+    """
+    import numpy as np
+
+    a = np.asarray(answers)
+    if a.ndim != 2 or a.shape[1] != track.answers:
+        raise ValueError(f"expected an (n, {track.answers}) answers matrix, got shape {a.shape}")
+    if a.dtype.kind not in "iu":
+        raise ValueError("answers must be integers")
+    bad = (a < track.answer_min) | (a > track.answer_max)
+    if bad.any():
+        row = int(np.flatnonzero(bad.any(axis=1))[0])
+        raise ValueError(
+            f"row {row}: each answer must be an integer between {track.answer_min} and {track.answer_max}"
+        )
+
+    total = a.sum(axis=1, dtype=np.int64)
+    mins = np.array([b[0] for b in track.bands])
+    idx = np.searchsorted(mins, total, side="right")          # 0 = below the first band
+    levels = np.array([1] + [b[1] for b in track.bands])
+    maturities = np.array([NOT_STARTED] + [b[2] for b in track.bands], dtype=object)
+    _count("batch_rows", len(total))
+    return {
+        "total": total,
+        "percent": np.round(total / track.max_total * 100.0, 2),
+        "level": levels[idx],
+        "maturity": maturities[idx],
+    }
+
+
+def score_aix_batch(domain_scores: Sequence[Sequence[float]]) -> Dict[str, Any]:
+    """overall_score_500 + maturity for many AIX submissions (ragged lists of domain scores)."""
+    import numpy as np
+
+    counts = np.fromiter((len(s) for s in domain_scores), dtype=np.int64, count=len(domain_scores))
+    flat = np.fromiter(
+        (float(v) for s in domain_scores for v in s), dtype=np.float64, count=int(counts.sum())
+    )
+    sums = np.zeros(len(counts))
+    nonempty = counts > 0
+    if flat.size:
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sums[nonempty] = np.add.reduceat(flat, starts[nonempty])
+    mean = np.divide(sums, counts, out=np.zeros(len(counts)), where=nonempty)
+    score = np.rint(np.clip(mean, 0.0, AIX_DOMAIN_MAX) / AIX_DOMAIN_MAX * AIX_MAX).astype(np.int64)
+    mins = np.array([b[0] for b in AIX_BANDS])
+    maturities = np.array([NOT_STARTED] + [b[1] for b in AIX_BANDS], dtype=object)
+    _count("batch_rows", len(score))
+    return {"overall_score_500": score, "maturity": maturities[np.searchsorted(mins, score, side="right")]}
+
+
+def stats() -> Dict[str, Any]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def bands() -> Dict[str, List[Band]]:
+    """The level tables, e.g. for a dashboard or a parity check against score_to_level.ts."""
+    out: Dict[str, List[Any]] = {t.name: list(t.bands) for t in TRACKS.values()}
+    out["AIX"] = [(m, i + 2, name) for i, (m, name) in enumerate(AIX_BANDS)]
+    return out
@@ -0,0 +1,104 @@
+# Run from scoring_orchestrator/:  python -m unittest discover -s tests
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dead_letter  # noqa: E402
+from dead_letter import STATE_PARKED, STATE_PENDING, DeadLetterStore  # noqa: E402
+
+
+class _Cluster:
+    """Replay send() stand-in: rejects any body containing a row with "bad", or throttles."""
+
+    def __init__(self, throttle: bool = False):
+        self.throttle = throttle
+        self.bodies = []
+
+    def __call__(self, table, mapping, body):
+        self.bodies.append(body)
+        if self.throttle:
+            return 429, "slow down", 7.0
+        if b'"bad"' in body:
+            return 400, "mapping error", None
+        return 200, "", None
+
+
+class DeadLetterStoreTest(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.WARNING)  # replay failures are expected here
+        self.dir = tempfile.mkdtemp()
+        self.cluster = _Cluster()
+        self.store = DeadLetterStore(os.path.join(self.dir, "dl.db"), self.cluster)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+        self.store.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _add(self, *rows):
+        self.store.add("t", "m", [json.dumps(r).encode() + b"\n" for r in rows], "boom", 500)
+        self.store.requeue()  # due now instead of after the first backoff
+
+    def _replay_once(self):
+        rows, _ = self.store._due_batch()
+        return self.store._replay_group("t", "m", rows)
+
+    def _states(self):
+        return sorted((json.loads(e["row_json"])["id"], e["state"]) for e in self.store.list())
+
+    def test_successful_replay_removes_the_rows(self):
+        self._add({"id": 1}, {"id": 2})
+        self.assertTrue(self._replay_once())
+        self.assertEqual(self.store.list(), [])
+        self.assertEqual(self.cluster.bodies, [b'{"id": 1}\n{"id": 2}\n'])
+        self.assertEqual(self.store.stats()["replayed_rows"], 2)
+
+    def test_rejected_batch_is_split_so_only_the_bad_row_stays(self):
+        self._add({"id": 1}, {"id": 2, "bad": 1}, {"id": 3}, {"id": 4})
+        self.assertTrue(self._replay_once())
+        self.assertEqual(self._states(), [(2, STATE_PENDING)])
+        entry = self.store.list()[0]
+        self.assertEqual((entry["attempts"], entry["status_code"]), (1, 400))
+
+    def test_row_is_parked_after_max_attempts(self):
+        self._add({"id": 1, "bad": 1})
+        with mock.patch.object(dead_letter, "DEAD_LETTER_MAX_ATTEMPTS", 2):
+            self._replay_once()
+            with self.store._db() as db:
+                db.execute("UPDATE dead_letters SET next_attempt = 0")  # skip the backoff
+            self._replay_once()
+        self.assertEqual(self._states(), [(1, STATE_PARKED)])
+        self.assertEqual(self.store.stats()["parked"], 1)
+        self.store.requeue(state=STATE_PARKED)
+        self.assertEqual(self._states(), [(1, STATE_PENDING)])
+
+    def test_throttling_pauses_replay_and_keeps_rows(self):
+        self.cluster.throttle = True
+        self._add({"id": 1}, {"id": 2})
+        self.assertFalse(self._replay_once())
+        self.assertEqual(len(self.cluster.bodies), 1)   # not split on a throttle
+        self.assertEqual(self._states(), [(1, STATE_PENDING), (2, STATE_PENDING)])
+        self.assertGreater(self.store.stats()["throttled_for_s"], 0)
+
+    def test_adding_the_same_row_twice_stores_it_once(self):
+        self._add({"id": 1})
+        self._add({"id": 1}, {"id": 2})
+        self.assertEqual(self._states(), [(1, STATE_PENDING), (2, STATE_PENDING)])
+        self.assertEqual(self.store.stats()["duplicates"], 1)
+
+    def test_store_is_bounded(self):
+        self.store.max_rows = 2
+        self._add({"id": 1}, {"id": 2}, {"id": 3})
+        self.assertEqual(self._states(), [(2, STATE_PENDING), (3, STATE_PENDING)])
+        self.assertEqual(self.store.stats()["dropped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# Run from scoring_orchestrator/:  python -m unittest discover -s tests
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import idempotency  # noqa: E402
+from idempotency import CachedResponse, IdempotencyStore  # noqa: E402
+
+OK = CachedResponse(200, b"Accepted", None)
+FAILED = CachedResponse(502, b"ADX ingest error", None)
+
+
+class IdempotencyStoreTest(unittest.TestCase):
+    def _begin_in_thread(self, store, key):
+        """Run begin(key) on another thread; returns (thread, result holder) once it is waiting."""
+        out = {}
+        t = threading.Thread(target=lambda: out.setdefault("resp", store.begin(key)), daemon=True)
+        waited = store.stats()["waited"]
+        t.start()
+        deadline = time.monotonic() + 5
+        while store.stats()["waited"] == waited and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return t, out
+
+    def test_completed_key_returns_the_cached_response_until_it_expires(self):
+        store = IdempotencyStore(ttl_s=60)
+        self.assertIsNone(store.begin("aix:s1"))
+        store.finish("aix:s1", OK)
+        self.assertEqual(store.begin("aix:s1"), OK)
+        with mock.patch("idempotency.time.time", return_value=time.time() + 61):
+            self.assertFalse(store.seen("aix:s1"))
+            self.assertIsNone(store.begin("aix:s1"))   # expired: the caller owns it again
+        self.assertEqual(store.stats()["cached_keys"], 0)
+
+    def test_concurrent_retry_waits_for_and_shares_the_first_response(self):
+        store = IdempotencyStore()
+        self.assertIsNone(store.begin("k"))
+        t, out = self._begin_in_thread(store, "k")
+        self.assertTrue(store.seen("k"))
+        store.finish("k", OK)
+        t.join(5)
+        self.assertEqual(out["resp"], OK)
+        self.assertEqual(store.stats()["in_flight"], 0)
+
+    def test_failed_attempt_hands_the_key_to_the_waiting_retry(self):
+        store = IdempotencyStore()
+        self.assertIsNone(store.begin("k"))
+        t, out = self._begin_in_thread(store, "k")
+        store.finish("k", FAILED)
+        t.join(5)
+        self.assertIsNone(out["resp"])                # the retry now owns the key
+        self.assertEqual(store.stats()["in_flight"], 1)
+        store.finish("k", OK)
+        self.assertEqual(store.begin("k"), OK)
+
+    def test_waiting_gives_up_after_the_wait_limit(self):
+        store = IdempotencyStore()
+        self.assertIsNone(store.begin("k"))
+        with mock.patch.object(idempotency, "IDEMPOTENCY_WAIT_S", 0.01):
+            self.assertIsNone(store.begin("k"))
+        self.assertTrue(store.seen("k"))              # the first attempt still owns it
+
+    def test_least_recently_used_key_is_evicted(self):
+        store = IdempotencyStore(max_keys=2)
+        for key in ("a", "b"):
+            store.remember(key, OK)
+        store.begin("a")                              # a hit makes "a" most recent
+        store.remember("c", OK)
+        self.assertEqual([store.seen(k) for k in "abc"], [True, False, True])
+        self.assertEqual(store.stats()["evictions"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# Run from scoring_orchestrator/:  python -m unittest discover -s tests
+import os
+import sys
+import threading
+import unittest
+from concurrent.futures import CancelledError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest_batcher import IngestBatcher  # noqa: E402
+
+
+class _RecordingSend:
+    """send() stand-in: records every body; optionally blocks until released."""
+
+    def __init__(self, status: int = 200, block: bool = False):
+        self.status = status
+        self.bodies = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self, table, mapping, body):
+        self.bodies.append((table, mapping, body))
+        self.started.set()
+        self.release.wait(5)
+        return self.status, "done"
+
+
+class IngestBatcherTest(unittest.TestCase):
+    def test_rows_are_coalesced_and_flushed_after_the_delay(self):
+        send = _RecordingSend()
+        b = IngestBatcher(send, max_rows=100, max_bytes=1 << 20, max_delay_ms=20)
+        futures = [b.submit("t", "m", b'{"i":%d}\n' % i) for i in range(3)]
+        results = [f.result(timeout=5) for f in futures]
+        b.close()
+        self.assertEqual(len(send.bodies), 1)
+        self.assertEqual(send.bodies[0][2], b'{"i":0}\n{"i":1}\n{"i":2}\n')
+        self.assertTrue(all(r.ok and r.batch_rows == 3 for r in results))
+
+    def _batch_sizes(self, b, rows):
+        futures = [b.submit(table, "m", line) for table, line in rows]
+        b.flush(timeout=5)
+        b.close()
+        self.assertTrue(all(f.result(timeout=1).ok for f in futures))
+        return sorted((table, body.count(b"\n")) for table, _, body in b._send.bodies)
+
+    def test_batches_split_on_row_count_and_key(self):
+        b = IngestBatcher(_RecordingSend(), max_rows=2, max_delay_ms=60_000)
+        rows = [("t", b'{"a":1}\n')] * 3 + [("u", b'{"b":1}\n')]
+        self.assertEqual(self._batch_sizes(b, rows), [("t", 1), ("t", 2), ("u", 1)])
+
+    def test_batches_split_before_exceeding_max_bytes(self):
+        b = IngestBatcher(_RecordingSend(), max_rows=100, max_bytes=20, max_delay_ms=60_000)
+        rows = [("t", b'{"a":1}\n')] * 3   # 8 bytes each: two fit in 20 bytes, the third starts a batch
+        self.assertEqual(self._batch_sizes(b, rows), [("t", 1), ("t", 2)])
+
+    def test_failed_send_resolves_every_future_with_the_failure(self):
+        def boom(table, mapping, body):
+            raise OSError("connection reset")
+
+        b = IngestBatcher(boom, max_delay_ms=60_000)
+        f1, f2 = b.submit("t", "m", b"{}\n"), b.submit("t", "m", b"{}\n")
+        with self.assertLogs(level="ERROR"):
+            b.flush(timeout=5)
+        r1, r2 = f1.result(timeout=1), f2.result(timeout=1)
+        b.close()
+        self.assertFalse(r1.ok)
+        self.assertIsNone(r1.status_code)
+        self.assertEqual(r1, r2)
+        self.assertEqual(b.stats()["failed_flushes"], 1)
+
+    def test_close_flushes_what_is_buffered(self):
+        send = _RecordingSend()
+        b = IngestBatcher(send, max_delay_ms=60_000)
+        f = b.submit("t", "m", b"{}\n")
+        b.close()
+        self.assertTrue(f.result(timeout=1).ok)
+        self.assertEqual(b.stats()["flush_reasons"], {"shutdown": 1})
+
+    def test_withdraw_before_send_drops_the_row(self):
+        send = _RecordingSend(block=True)
+        b = IngestBatcher(send, max_rows=1, max_delay_ms=0)
+        first = b.submit("t", "m", b'{"first":1}\n')
+        self.assertTrue(send.started.wait(5))          # the flusher is stuck sending `first`
+        queued = b.submit("t", "m", b'{"queued":1}\n')
+        kept = b.submit("t", "m", b'{"kept":1}\n')
+        self.assertTrue(b.withdraw(queued))
+        self.assertFalse(b.withdraw(first))            # already being sent
+        send.release.set()
+        self.assertTrue(first.result(timeout=5).ok)
+        self.assertTrue(kept.result(timeout=5).ok)
+        with self.assertRaises(CancelledError):
+            queued.result(timeout=1)
+        b.close()
+        self.assertEqual([body for _, _, body in send.bodies], [b'{"first":1}\n', b'{"kept":1}\n'])
+
+
+if __name__ == "__main__":
+    unittest.main()
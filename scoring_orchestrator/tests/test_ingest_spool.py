@@ -0,0 +1,131 @@
+# Run from scoring_orchestrator/:  python -m unittest discover -s tests
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ingest_spool  # noqa: E402
+from ingest_spool import STATE_DEAD_LETTERED, STATE_SENT, STATE_SPOOLED, IngestSpool  # noqa: E402
+
+
+class _Send:
+    """send() stand-in: records every body and answers with `status`."""
+
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.bodies = []
+        self.sent = threading.Event()
+
+    def __call__(self, table, mapping, body):
+        self.bodies.append((table, mapping, body))
+        self.sent.set()
+        return self.status, "done"
+
+
+def _record(rid: str, row: dict) -> bytes:
+    header = json.dumps({"id": rid, "t": "t", "m": "m", "at": 0}).encode()
+    return header + b"\t" + json.dumps(row).encode() + b"\n"
+
+
+class IngestSpoolTest(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.WARNING)  # drain failures are expected here
+        self.dir = tempfile.mkdtemp()
+        self.spools = []
+
+    def tearDown(self):
+        for spool in self.spools:
+            spool.close()
+        logging.disable(logging.NOTSET)
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _spool(self, send, on_failed=None):
+        spool = IngestSpool(self.dir, send, on_failed)
+        self.spools.append(spool)
+        return spool
+
+    def _wait_for(self, spool, rid, state):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            status = spool.status(rid)
+            if status and status["state"] == state:
+                return status
+            time.sleep(0.01)
+        self.fail(f"{rid} never reached {state}: {spool.status(rid)}")
+
+    def _write(self, name, data):
+        with open(os.path.join(self.dir, name), "wb") as f:
+            f.write(data)
+
+    def test_recovery_requeues_only_unacknowledged_complete_rows(self):
+        # What a crash leaves behind: one row acked as sent, one spooled but never acked,
+        # a line with a broken header, and a torn tail from an append cut short.
+        self._write("seg-000000000003.log", (
+            _record("acked", {"i": 1})
+            + _record("unsent", {"i": 2})
+            + b'{"id": \t{"i": 3}\n'
+            + _record("torn", {"i": 4})[:-5]
+        ))
+        self._write("acks.log", b"acked sent\ngone sent\n")
+        send = _Send()
+        spool = self._spool(send)
+        spool.start()
+
+        self._wait_for(spool, "unsent", STATE_SENT)
+        self.assertEqual(send.bodies, [("t", "m", b'{"i": 2}\n')])
+        self.assertEqual(spool.status("acked")["state"], STATE_SENT)
+        self.assertIsNone(spool.status("torn"))
+        self.assertEqual(spool.stats()["recovered"], 1)
+        # New rows go to a segment after the highest one found on disk.
+        self.assertTrue(os.path.exists(os.path.join(self.dir, "seg-000000000004.log")))
+
+    def test_fully_acknowledged_segments_are_removed_and_acks_compacted(self):
+        self._write("seg-000000000001.log", _record("a", {"i": 1}))
+        self._write("acks.log", b"a sent\nstale failed\n")
+        spool = self._spool(_Send())
+        spool.start()
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "seg-000000000001.log")))
+        self.assertEqual(spool.stats()["recovered"], 0)
+        with open(os.path.join(self.dir, "acks.log"), "rb") as f:
+            self.assertEqual(f.read(), b"")  # neither receipt lives in a segment any more
+
+    def test_rows_appended_before_a_crash_are_sent_after_restart(self):
+        never = threading.Event()
+
+        def stuck(table, mapping, body):
+            never.wait(5)  # the "crashed" instance never gets an answer back
+            return 500, "gone"
+
+        first = self._spool(stuck)
+        rid = first.append("t", "m", b'{"i":1}\n')
+        self.assertEqual(first.status(rid)["state"], STATE_SPOOLED)
+
+        send = _Send()
+        second = self._spool(send)
+        second.start()
+        self._wait_for(second, rid, STATE_SENT)
+        self.assertEqual(send.bodies, [("t", "m", b'{"i":1}\n')])
+        never.set()
+
+    def test_rows_out_of_attempts_go_to_the_failure_hook(self):
+        failed = []
+        send = _Send(status=500)
+        spool = self._spool(send, lambda table, mapping, lines, error: failed.append((table, lines)))
+        with mock.patch.object(ingest_spool, "SPOOL_MAX_ATTEMPTS", 1):
+            rid = spool.append("t", "m", b'{"i":1}\n')
+            status = self._wait_for(spool, rid, STATE_DEAD_LETTERED)
+        self.assertEqual(failed, [("t", [b'{"i":1}\n'])])
+        self.assertEqual(status["attempts"], 1)
+        self.assertIn("500", status["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+# Run from scoring_orchestrator/:  python -m unittest discover -s tests
+import os
+import sys
+import unittest
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kusto_pool import KustoClientPool  # noqa: E402
+
+
+class _Properties:
+    """Stand-in for ClientRequestProperties."""
+
+
+class _FakeClient:
+    """Same signatures as azure-kusto-data 4.x KustoClient (timeout is positional 3 on streaming)."""
+
+    def execute_query(self, database, query, properties=None):
+        return ("query", properties)
+
+    def execute_mgmt(self, database, query, properties=None):
+        return ("mgmt", properties)
+
+    def execute_streaming_query(self, database, query, timeout=timedelta(minutes=4), properties=None):
+        timeout + timedelta(seconds=1)  # what the SDK does with it; fails if properties lands here
+        return ("streaming", properties)
+
+
+class KustoClientPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = KustoClientPool(lambda uri: _FakeClient())
+        self.props = _Properties()
+
+    def test_execute_passes_properties(self):
+        self.assertEqual(self.pool.execute("https://c", "db", "T", self.props), ("query", self.props))
+
+    def test_execute_mgmt_passes_properties(self):
+        self.assertEqual(self.pool.execute_mgmt("https://c", "db", ".show", self.props), ("mgmt", self.props))
+
+    def test_execute_streaming_passes_properties_by_keyword(self):
+        self.assertEqual(
+            self.pool.execute_streaming("https://c", "db", "T", self.props), ("streaming", self.props)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+# Run from scoring_orchestrator/:  python -m unittest discover -s tests
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from latest_index import ANY, LatestIndex  # noqa: E402
+
+
+class LatestIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = LatestIndex(max_age_s=0)
+
+    def test_row_answers_every_filter_combination(self):
+        self.index.record("aix", "contoso", "ann", "2025-01-01T10:00:00Z", b"r1")
+        for c, p in (("contoso", "ann"), ("contoso", ANY), (ANY, "ann"), (ANY, ANY)):
+            self.assertEqual(self.index.get("aix", c, p), b"r1")
+        self.assertIsNone(self.index.get("aix", "fabrikam", ANY))
+        self.assertIsNone(self.index.get("ai_readiness", ANY, ANY))
+
+    def test_older_row_arriving_later_does_not_roll_back(self):
+        self.index.record("aix", "contoso", "ann", "2025-01-01T10:00:00Z", b"new")
+        self.index.record("aix", "contoso", "bob", "2025-01-01T09:00:00+00:00", b"old")
+        self.assertEqual(self.index.get("aix", "contoso", ANY), b"new")
+        self.assertEqual(self.index.get("aix", ANY, ANY), b"new")
+        self.assertEqual(self.index.get("aix", "contoso", "bob"), b"old")   # its own key is still new
+
+    def test_newer_row_replaces_and_offsets_are_compared_as_instants(self):
+        self.index.record("aix", "contoso", "ann", "2025-01-01T10:00:00Z", b"first")
+        self.index.record("aix", "contoso", "ann", "2025-01-01T11:30:00+01:00", b"later")  # 10:30Z
+        self.assertEqual(self.index.get("aix", ANY, ANY), b"later")
+
+    def test_stale_seed_does_not_overwrite_a_newer_record(self):
+        self.index.record("aix", "contoso", "ann", "2025-01-01T10:00:00Z", b"live")
+        self.index.seed("aix", "contoso", "ann", "2024-12-31T00:00:00Z", b"from adx")
+        self.assertEqual(self.index.get("aix", "contoso", "ann"), b"live")
+        self.index.seed("aix", "fabrikam", ANY, "2024-12-31T00:00:00Z", b"from adx")
+        self.assertEqual(self.index.get("aix", "fabrikam", ANY), b"from adx")
+        self.assertIsNone(self.index.get("aix", "fabrikam", "ann"))     # seeded only where asked
+
+    def test_entries_expire_after_max_age(self):
+        index = LatestIndex(max_age_s=60)
+        index.record("aix", "contoso", "ann", "2025-01-01T10:00:00Z", b"r1")
+        with mock.patch("latest_index.time.monotonic", return_value=time.monotonic() + 61):
+            self.assertIsNone(index.get("aix", "contoso", "ann"))
+        self.assertEqual(index.stats()["expired"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+# Run from scoring_orchestrator/:  python -m unittest discover -s tests
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from live_cache import COALESCED, HIT, MISS, STALE, LiveCache  # noqa: E402
+
+
+class _Fetch:
+    """fetch() stand-in: counts calls, returns successive values or raises; can block."""
+
+    def __init__(self, *results, block: bool = False):
+        self.results = list(results)
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        result = self.results.pop(0)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+class LiveCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = LiveCache(ttl_s=60, swr_s=60, wait_s=5)
+
+    def _age(self, key, seconds):
+        fetched_at, value = self.cache._entries[key]
+        self.cache._entries[key] = (fetched_at - seconds, value)
+
+    def _wait_idle(self):
+        deadline = time.monotonic() + 5
+        while self.cache.stats()["in_flight"] and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def test_miss_then_hit(self):
+        fetch = _Fetch("v1")
+        self.assertEqual(self.cache.get("k", fetch), ("v1", MISS))
+        self.assertEqual(self.cache.get("k", fetch), ("v1", HIT))
+        self.assertEqual(fetch.calls, 1)
+
+    def test_concurrent_misses_share_one_fetch(self):
+        fetch = _Fetch("v1", block=True)
+        out = {}
+        leader = threading.Thread(target=lambda: out.setdefault("leader", self.cache.get("k", fetch)))
+        leader.start()
+        self.assertTrue(fetch.started.wait(5))
+        follower = threading.Thread(target=lambda: out.setdefault("follower", self.cache.get("k", fetch)))
+        follower.start()
+        while self.cache.stats()["coalesced"] == 0:
+            time.sleep(0.005)
+        fetch.release.set()
+        leader.join(5)
+        follower.join(5)
+        self.assertEqual(out, {"leader": ("v1", MISS), "follower": ("v1", COALESCED)})
+        self.assertEqual(fetch.calls, 1)
+
+    def test_failed_fetch_reaches_the_waiters_and_is_not_cached(self):
+        fetch = _Fetch(RuntimeError("adx down"), "v2", block=True)
+        errors = []
+
+        def call():
+            try:
+                self.cache.get("k", fetch)
+            except RuntimeError as e:
+                errors.append(str(e))
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        self.assertTrue(fetch.started.wait(5))
+        follower = threading.Thread(target=call)
+        follower.start()
+        while self.cache.stats()["coalesced"] == 0:
+            time.sleep(0.005)
+        fetch.release.set()
+        leader.join(5)
+        follower.join(5)
+        self.assertEqual(errors, ["adx down", "adx down"])
+        self.assertEqual(self.cache.get("k", fetch), ("v2", MISS))
+        self.assertEqual(self.cache.stats()["fetch_errors"], 1)
+
+    def test_stale_entry_is_served_while_one_refresh_runs(self):
+        self.cache.get("k", _Fetch("v1"))
+        self._age("k", 90)                            # past the TTL, inside the SWR window
+        refresh = _Fetch("v2", block=True)
+        self.assertEqual(self.cache.get("k", refresh), ("v1", STALE))
+        self.assertEqual(self.cache.get("k", refresh), ("v1", STALE))
+        refresh.release.set()
+        self._wait_idle()
+        self.assertEqual(refresh.calls, 1)
+        self.assertEqual(self.cache.get("k", refresh), ("v2", HIT))
+
+    def test_failed_refresh_keeps_the_stale_entry(self):
+        self.cache.get("k", _Fetch("v1"))
+        self._age("k", 90)
+        refresh = _Fetch(RuntimeError("adx down"), "v2")
+        logging.disable(logging.WARNING)
+        try:
+            self.assertEqual(self.cache.get("k", refresh), ("v1", STALE))
+            self._wait_idle()
+        finally:
+            logging.disable(logging.NOTSET)
+        self.assertEqual(self.cache.stats()["refresh_errors"], 1)
+        self.assertEqual(self.cache.get("k", refresh), ("v1", STALE))   # and the next call retries
+        self._wait_idle()
+        self.assertEqual(self.cache.get("k", refresh), ("v2", HIT))
+
+    def test_entry_past_the_stale_window_is_a_miss(self):
+        self.cache.get("k", _Fetch("v1"))
+        self._age("k", 121)
+        self.assertEqual(self.cache.get("k", _Fetch("v2")), ("v2", MISS))
+
+    def test_async_callers_join_a_sync_flight(self):
+        fetch = _Fetch("v1", block=True)
+        leader = threading.Thread(target=self.cache.get, args=("k", fetch))
+        leader.start()
+        self.assertTrue(fetch.started.wait(5))
+
+        async def never():
+            raise AssertionError("the async twin must not fetch again")
+
+        async def follow():
+            task = asyncio.ensure_future(self.cache.get_async("k", never))
+            await asyncio.sleep(0.01)
+            fetch.release.set()
+            return await task
+
+        self.assertEqual(asyncio.run(follow()), ("v1", COALESCED))
+        leader.join(5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# Run from scoring_orchestrator/:  python -m unittest discover -s tests
+import asyncio
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from live_events import EventHub, TooManySubscribers  # noqa: E402
+
+
+class EventHubTest(unittest.TestCase):
+    def setUp(self):
+        self.hub = EventHub(buffer=2)
+
+    def _wait(self, last_event_id, customer="", hold_s=0.05):
+        return asyncio.run(self.hub.wait("aix", customer, "", last_event_id, hold_s=hold_s))
+
+    def _publish(self, n, customer="contoso"):
+        for i in range(n):
+            self.hub.publish("aix", customer, "ann", b'{"n":%d}' % i)
+
+    def test_events_after_the_last_id_are_delivered_at_once(self):
+        self._publish(2)
+        events, resume, reset = self._wait(self.hub.event_id(1))
+        self.assertEqual([e.seq for e in events], [2])
+        self.assertEqual((resume, reset), (2, False))
+
+    def test_filters_apply(self):
+        self._publish(1, customer="contoso")
+        self._publish(1, customer="fabrikam")
+        events, resume, _ = self._wait(self.hub.event_id(0), customer="fabrikam")
+        self.assertEqual([e.customer for e in events], ["fabrikam"])
+        self.assertEqual(resume, 2)
+
+    def test_id_from_another_process_resets_to_the_head(self):
+        self._publish(2)
+        self.assertEqual(self._wait("0-1"), ([], 2, True))
+        self.assertEqual(self._wait("garbage"), ([], 2, True))
+
+    def test_id_older_than_the_buffer_resets(self):
+        self._publish(3)                              # buffer=2: seq 1 was pushed out
+        self.assertEqual(self._wait(self.hub.event_id(0)), ([], 3, True))
+        events, _, reset = self._wait(self.hub.event_id(1))
+        self.assertEqual(([e.seq for e in events], reset), ([2, 3], False))
+
+    def test_id_from_the_future_resets(self):
+        self._publish(1)
+        self.assertEqual(self._wait(self.hub.event_id(5)), ([], 1, True))
+        self.assertEqual(self.hub.stats()["resets"], 1)
+
+    def test_subscriber_is_woken_by_a_publish_from_another_thread(self):
+        async def run():
+            task = asyncio.ensure_future(self.hub.wait("aix", "", "", None, hold_s=5))
+            while self.hub.stats()["subscribers"] == 0:
+                await asyncio.sleep(0.001)
+            t = threading.Thread(target=self._publish, args=(1,))
+            t.start()
+            t.join()
+            return await task
+
+        events, resume, reset = asyncio.run(run())
+        self.assertEqual(([e.seq for e in events], resume, reset), ([1], 1, False))
+
+    def test_timeout_rechecks_for_an_event_that_never_woke_it(self):
+        # A publish between the first look and subscribing finds no subscriber to wake;
+        # the check at the end of the hold must still deliver it.
+        since = self.hub._since
+
+        def since_then_publish(*args):
+            out = since(*args)
+            if not self.hub.head():
+                self._publish(1)
+            return out
+
+        self.hub._since = since_then_publish
+        events, resume, reset = self._wait(None)
+        self.assertEqual(([e.seq for e in events], resume, reset), ([1], 1, False))
+
+    def test_quiet_hold_times_out_at_the_head(self):
+        self._publish(1)
+        self.assertEqual(self._wait(self.hub.event_id(1)), ([], 1, False))
+        self.assertEqual(self.hub.stats()["timeouts"], 1)
+
+    def test_subscriber_cap(self):
+        hub = EventHub(max_subscribers=0)
+        with self.assertRaises(TooManySubscribers):
+            asyncio.run(hub.wait("aix", "", "", None, hold_s=0.01))
+
+
+if __name__ == "__main__":
+    unittest.main()
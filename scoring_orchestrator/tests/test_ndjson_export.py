@@ -0,0 +1,60 @@
+# Run from scoring_orchestrator/:  python -m unittest discover -s tests
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ndjson_export  # noqa: E402
+from ndjson_export import Cursor, CursorError  # noqa: E402
+
+COLUMNS = ["session_id", "ts", "score", "_export_ing", "_export_hash"]
+FILTERS = {"assessment": "aix", "customer": "contoso", "industry": "", "from": "", "to": ""}
+UNTIL = "2026-01-01T00:00:00Z"
+
+
+def _page(rows, limit, after=None):
+    page = ndjson_export.write_page(COLUMNS, rows, limit, "ts", UNTIL, FILTERS, after=after)
+    cursor = ndjson_export.decode_cursor(page.next_cursor, FILTERS) if page.next_cursor else None
+    return [json.loads(line) for line in page.body.splitlines()], cursor
+
+
+class NdjsonExportTest(unittest.TestCase):
+    def test_cursor_round_trips_and_is_bound_to_its_filters(self):
+        cursor = Cursor("2025-01-01T00:00:00Z", "s1", 123, -42, 2, UNTIL)
+        token = ndjson_export.encode_cursor(cursor, FILTERS)
+        self.assertEqual(ndjson_export.decode_cursor(token, FILTERS), cursor)
+        with self.assertRaises(CursorError):
+            ndjson_export.decode_cursor(token, {**FILTERS, "industry": "retail"})
+        with self.assertRaises(CursorError):
+            ndjson_export.decode_cursor("not-a-cursor", FILTERS)
+
+    def test_key_columns_are_hidden_and_the_cursor_holds_the_full_key(self):
+        rows = [["s1", "t1", 10, 100, 7], ["s1", "t1", 11, 200, 8], ["s2", "t1", 12, 100, 9]]
+        docs, cursor = _page(rows, limit=2)
+        self.assertEqual(docs, [{"session_id": "s1", "ts": "t1", "score": 10},
+                                {"session_id": "s1", "ts": "t1", "score": 11}])
+        # Same time and session_id as the first row: only ingestion ticks tell them apart.
+        self.assertEqual(cursor, Cursor("t1", "s1", 200, 8, 1, UNTIL))
+        params = ndjson_export.query_parameters(FILTERS, cursor, 3, "ignored")
+        self.assertEqual((params["p_after_ing"], params["p_after_hash"], params["p_skip"]), (200, 8, 1))
+        self.assertEqual(params["p_until"], UNTIL)
+
+    def test_identical_rows_are_counted_across_pages(self):
+        same = ["s1", "t1", 10, 100, 7]
+        _, cursor = _page([same, same, same], limit=2)
+        self.assertEqual(cursor.skip, 2)
+        # The next page starts with the third copy (after skipping 2) and still runs on.
+        _, cursor = _page([same, ["s2", "t2", 5, 1, 1]], limit=1, after=cursor)
+        self.assertEqual(cursor.key, ("t1", "s1", 100, 7))
+        self.assertEqual(cursor.skip, 3)
+
+    def test_last_page_has_no_cursor(self):
+        docs, cursor = _page([["s1", "t1", 10, 100, 7]], limit=2)
+        self.assertEqual(len(docs), 1)
+        self.assertIsNone(cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
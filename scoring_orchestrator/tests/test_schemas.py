@@ -0,0 +1,43 @@
+# Run from scoring_orchestrator/:  python -m unittest discover -s tests
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schemas import compile_schema  # noqa: E402
+
+ANSWERS = {
+    "type": "object",
+    "required": ["answers"],
+    "properties": {
+        "answers": {
+            "type": "array",
+            "minItems": 3,
+            "maxItems": 3,
+            "items": {"type": "integer", "minimum": 0, "maximum": 5},
+        }
+    },
+}
+
+
+class IntegerArrayFastPathTest(unittest.TestCase):
+    def setUp(self):
+        self.validate = compile_schema(ANSWERS)
+
+    def test_valid(self):
+        self.assertEqual(self.validate({"answers": [0, 3, 5]}), [])
+
+    def test_out_of_range(self):
+        self.assertEqual(len(self.validate({"answers": [0, 3, 6]})), 1)
+
+    def test_unhashable_items_are_reported_not_raised(self):
+        errors = self.validate({"answers": [[1], {"a": 1}, 2]})
+        self.assertEqual(len(errors), 2)
+
+    def test_bool_is_not_an_integer(self):
+        self.assertEqual(len(self.validate({"answers": [True, 1, 2]})), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+# Run from scoring_orchestrator/:  python -m unittest discover -s tests
+# Each function app deploys its own folder, so shared modules are copied into every app that
+# needs them. The copies must stay byte-identical; this fails as soon as one is edited alone.
+import os
+import unittest
+
+REPO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SHARED = {
+    "scoring_orchestrator/token_cache.py": [
+        "AIreadiness/ai_readiness_api/token_cache.py",
+        "AIreadiness/api_ai_latest/token_cache.py",
+    ],
+    "scoring_orchestrator/kusto_pool.py": [
+        "AIreadiness/ai_readiness_api/kusto_pool.py",
+    ],
+}
+
+
+def _read(path: str) -> bytes:
+    with open(os.path.join(REPO, path), "rb") as f:
+        return f.read()
+
+
+class SharedCopiesTest(unittest.TestCase):
+    def test_copies_match_the_original(self):
+        for original, copies in SHARED.items():
+            expected = _read(original)
+            for copy in copies:
+                with self.subTest(copy=copy):
+                    self.assertEqual(_read(copy), expected, f"{copy} differs from {original}; copy it over")
+
+
+if __name__ == "__main__":
+    unittest.main()